@@ -1,6 +1,8 @@
 import glob
 import os
 import re
+import threading
+import time
 
 from langchain_text_splitters import CharacterTextSplitter  # 각 행 단위 분할용
 
@@ -10,9 +12,71 @@ DATA_DIR = os.path.join(
     "ground_docs",
 )
 
+# 파일 목록/mtime 검사(glob + stat) 최소 간격(초). 그 사이의 질의는 현재 색인을 그대로 쓴다.
+SIGNATURE_CHECK_INTERVAL_S = float(os.getenv("KB_INDEX_CHECK_INTERVAL_S", "2"))
 
-def keyword_retrieve(query: str, top_k: int = 5):
-    hits = []
+
+class _InvertedIndex:
+    """문자 n-gram 역색인.
+
+    각 posting 은 청크 id 이며, 청크 id 로 (파일, 줄 번호, 본문)을 찾는다.
+    질의는 가장 희소한 n-gram 의 posting 부터 교집합을 구해 후보 청크만 검사하므로
+    비용이 코퍼스 크기가 아니라 일치하는 posting 수에 비례한다.
+    """
+
+    def __init__(self, signature: tuple):
+        self.signature = signature
+        self.chunks: list[tuple[str, int, str]] = []  # (file, line, chunk)
+        self.unigrams: dict[str, list[int]] = {}
+        self.bigrams: dict[str, list[int]] = {}
+
+    def add(self, file: str, line: int, chunk: str) -> None:
+        cid = len(self.chunks)
+        self.chunks.append((file, line, chunk))
+        low = chunk.lower()
+        for ch in set(low):
+            self.unigrams.setdefault(ch, []).append(cid)
+        for bg in {low[i : i + 2] for i in range(len(low) - 1)}:
+            self.bigrams.setdefault(bg, []).append(cid)
+
+    def candidates(self, query: str) -> list[int]:
+        q = query.lower()
+        if not q:
+            return list(range(len(self.chunks)))
+        if len(q) == 1:
+            return self.unigrams.get(q, [])
+        grams = {q[i : i + 2] for i in range(len(q) - 1)}
+        postings = sorted((self.bigrams.get(g, []) for g in grams), key=len)
+        if not postings or not postings[0]:
+            return []
+        result = set(postings[0])
+        for p in postings[1:]:
+            result.intersection_update(p)
+            if not result:
+                return []
+        # 청크 id 순서 = 색인 순서 → 기존 전수 스캔과 동일한 동점 순서를 유지한다.
+        return sorted(result)
+
+
+_index: _InvertedIndex | None = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _corpus_signature() -> tuple:
+    """파일 목록과 mtime/size. 바뀌면 색인을 다시 만든다."""
+    sig = []
+    for p in glob.glob(os.path.join(DATA_DIR, "*.*")):
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        sig.append((p, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _build_index(signature: tuple) -> _InvertedIndex:
+    index = _InvertedIndex(signature)
     # 각 줄(리스트 항목)을 한 건으로 취급하도록 분할기 설정
     splitter = CharacterTextSplitter(
         separator="\n",  # 줄바꿈 기준
@@ -20,17 +84,45 @@ def keyword_retrieve(query: str, top_k: int = 5):
         chunk_overlap=0,
         is_separator_regex=False,
     )
-    for p in glob.glob(os.path.join(DATA_DIR, "*.*")):
+    for p, _mtime, _size in signature:
         try:
-            txt = open(p, "r", encoding="utf-8").read()
+            with open(p, "r", encoding="utf-8") as fp:
+                txt = fp.read()
         except Exception:
             continue
         chunks = splitter.split_text(txt)
         # 공백·헤더 제거
         chunks = [c.strip() for c in chunks if c.strip() and not c.strip().startswith("#")]
         for i, chunk in enumerate(chunks):
-            score = len(re.findall(re.escape(query), chunk, flags=re.IGNORECASE))
-            if score > 0:
-                hits.append((score, os.path.basename(p), i + 1, chunk))
+            index.add(os.path.basename(p), i + 1, chunk)
+    return index
+
+
+def get_index() -> _InvertedIndex:
+    """프로세스 공용 역색인을 반환한다. 파일이 추가/삭제/수정되면 지연 재생성한다.
+
+    코퍼스 검사는 ``SIGNATURE_CHECK_INTERVAL_S`` 에 한 번만 하므로, 파일 변경은 최대 그만큼 늦게 반영된다.
+    """
+    global _index, _index_checked_at
+    with _index_lock:
+        now = time.monotonic()
+        if _index is not None and now - _index_checked_at < SIGNATURE_CHECK_INTERVAL_S:
+            return _index
+        signature = _corpus_signature()
+        _index_checked_at = now
+        if _index is None or _index.signature != signature:
+            _index = _build_index(signature)
+        return _index
+
+
+def keyword_retrieve(query: str, top_k: int = 5):
+    index = get_index()
+    pat = re.compile(re.escape(query), flags=re.IGNORECASE)
+    hits = []
+    for cid in index.candidates(query):
+        file, line, chunk = index.chunks[cid]
+        score = len(pat.findall(chunk))
+        if score > 0:
+            hits.append((score, file, line, chunk))
     hits.sort(key=lambda x: x[0], reverse=True)
     return [{"source": f"KB:{h[1]}:{h[2]}", "content": h[3]} for h in hits[:top_k]]
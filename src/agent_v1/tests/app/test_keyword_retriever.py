@@ -0,0 +1,74 @@
+"""역색인 기반 `agent_v1.app.retriever.keyword_retrieve` 테스트."""
+from __future__ import annotations
+
+import glob
+import os
+import re
+
+import pytest
+from langchain_text_splitters import CharacterTextSplitter
+
+from agent_v1.app import retriever as rt_mod
+
+
+def _full_scan(query: str, top_k: int = 5):
+    """색인 도입 전의 전수 스캔 구현 (기준 결과)."""
+    hits = []
+    splitter = CharacterTextSplitter(separator="\n", chunk_size=1, chunk_overlap=0, is_separator_regex=False)
+    for p in glob.glob(os.path.join(rt_mod.DATA_DIR, "*.*")):
+        with open(p, "r", encoding="utf-8") as fp:
+            txt = fp.read()
+        chunks = [c.strip() for c in splitter.split_text(txt) if c.strip() and not c.strip().startswith("#")]
+        for i, chunk in enumerate(chunks):
+            score = len(re.findall(re.escape(query), chunk, flags=re.IGNORECASE))
+            if score > 0:
+                hits.append((score, os.path.basename(p), i + 1, chunk))
+    hits.sort(key=lambda x: x[0], reverse=True)
+    return [{"source": f"KB:{h[1]}:{h[2]}", "content": h[3]} for h in hits[:top_k]]
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    (tmp_path / "a.md").write_text("# 헤더\n파이썬 Python 언어\n자바 JAVA\npython python 반복\n", encoding="utf-8")
+    (tmp_path / "b.md").write_text("고양이와 개\n파이썬은 뱀이기도 하다\n\nJava와 python\n", encoding="utf-8")
+    monkeypatch.setattr(rt_mod, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(rt_mod, "SIGNATURE_CHECK_INTERVAL_S", 0.0)
+    monkeypatch.setattr(rt_mod, "_index", None)
+    return tmp_path
+
+
+@pytest.mark.parametrize("query", ["python", "PYTHON", "파이썬", "java", "j", "개", "on py", "없는말", "이기"])
+def test_index_matches_full_scan(corpus, query):
+    for top_k in (1, 5, 20):
+        assert rt_mod.keyword_retrieve(query, top_k) == _full_scan(query, top_k)
+
+
+def test_index_matches_full_scan_on_ground_docs(monkeypatch):
+    monkeypatch.setattr(rt_mod, "_index", None)
+    for query in ["수도", "the", "피타고라스", "e", "2"]:
+        assert rt_mod.keyword_retrieve(query, 10) == _full_scan(query, 10)
+
+
+def test_mtime_change_rebuilds_index(corpus):
+    first = rt_mod.get_index()
+    assert rt_mod.keyword_retrieve("코끼리") == []
+
+    path = corpus / "b.md"
+    path.write_text("코끼리는 크다\n", encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert rt_mod.keyword_retrieve("코끼리") == [{"source": "KB:b.md:1", "content": "코끼리는 크다"}]
+    assert rt_mod.get_index() is not first
+
+
+def test_signature_check_is_rate_limited(corpus, monkeypatch):
+    monkeypatch.setattr(rt_mod, "SIGNATURE_CHECK_INTERVAL_S", 3600.0)
+    rt_mod.get_index()
+    calls = []
+    monkeypatch.setattr(rt_mod, "_corpus_signature", lambda: calls.append(1) or ())
+
+    rt_mod.keyword_retrieve("python")
+    rt_mod.keyword_retrieve("java")
+
+    assert calls == []
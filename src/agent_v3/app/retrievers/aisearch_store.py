@@ -1,6 +1,9 @@
 import glob
+import itertools
 import os
-from typing import Any, Dict, List
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple
 
 from langchain_community.vectorstores.azuresearch import AzureSearch
 from langchain_core.documents import Document
@@ -39,15 +42,67 @@ def load_vectorstore() -> AzureSearch:
 # ---------------------------------------------------------------------------- #
 # Utility: ingest local markdown files into the vector store
 # ---------------------------------------------------------------------------- #
-
-
-def make_docs_from_folder(
+# agent_vN 패키지는 서로 import 하지 않는 독립 스냅샷이라 agent_v6 에도 같은 폴더 스트리밍 구현이 있다.
+# 한쪽을 고치면 다른 쪽도 같이 고친다 (tests/test_agent_copies.py 가 두 사본이 같은지 확인한다).
+
+
+def _read_file(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            return fp.read()
+    except Exception:
+        return None
+
+
+def _iter_file_texts(paths: List[str], workers: int) -> Iterator[Tuple[str, str]]:
+    """Yield ``(path, text)`` in *paths* order, reading up to *workers* files ahead in parallel."""
+    if workers <= 1:
+        for p in paths:
+            txt = _read_file(p)
+            if txt is not None:
+                yield p, txt
+        return
+
+    # 선행 읽기 창을 workers*2 로 제한해 메모리에 올라오는 파일 수를 고정한다.
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="doc-reader") as pool:
+        pending: Deque[Tuple[str, Future]] = deque()
+        it = iter(paths)
+        for p in itertools.islice(it, window):
+            pending.append((p, pool.submit(_read_file, p)))
+        while pending:
+            p, fut = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(_read_file, nxt)))
+            txt = fut.result()
+            if txt is not None:
+                yield p, txt
+
+
+def iter_docs_from_folder(
     folder: str = "ground_docs",
     mask: str = "*.md",
     *,
     chunk_size: int = 512,
     chunk_overlap: int = 50,
-) -> List[Document]:
+    workers: int = 1,
+) -> Iterator[Document]:
+    """Stream chunks file by file instead of materialising the whole corpus.
+
+    ``make_docs_from_folder`` 와 같은 청크를 같은 순서로 내보내지만, 한 번에 메모리에
+    올라오는 것은 선행 읽기 중인 파일들뿐이다.
+
+    Args:
+        folder: 저장소 루트 기준 문서 폴더.
+        mask: glob 패턴.
+        chunk_size: 청크 최대 길이.
+        chunk_overlap: 청크 간 겹침 길이.
+        workers: 병렬로 미리 읽을 파일 수. 1 이면 순차 읽기.
+
+    Yields:
+        ``metadata={"source": <파일명>}`` 을 가진 ``Document``.
+    """
     repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
     data_dir = os.path.join(repo_root, folder)
 
@@ -59,19 +114,28 @@ def make_docs_from_folder(
         is_separator_regex=False,
     )
 
-    docs: List[Document] = []
-    for p in paths:
-        try:
-            with open(p, "r", encoding="utf-8") as fp:
-                txt = fp.read()
-        except Exception:
-            continue
-
+    for p, txt in _iter_file_texts(paths, workers):
         # Split into single-line chunks and filter noise.
         chunks = [c.strip() for c in splitter.split_text(txt) if c.strip() and not c.strip().startswith("#")]
-        docs.extend(Document(page_content=chunk, metadata={"source": os.path.basename(p)}) for chunk in chunks)
+        for chunk in chunks:
+            yield Document(page_content=chunk, metadata={"source": os.path.basename(p)})
+
+
+def iter_doc_batches(docs: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+    """Group a document stream into lists of at most *batch_size*."""
+    it = iter(docs)
+    while batch := list(itertools.islice(it, batch_size)):
+        yield batch
 
-    return docs
+
+def make_docs_from_folder(
+    folder: str = "ground_docs",
+    mask: str = "*.md",
+    *,
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+) -> List[Document]:
+    return list(iter_docs_from_folder(folder, mask, chunk_size=chunk_size, chunk_overlap=chunk_overlap))
 
 
 # ---------------------------------------------------------------------------- #
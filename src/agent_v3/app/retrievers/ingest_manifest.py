@@ -0,0 +1,146 @@
+"""Deterministic chunk IDs and a local manifest for incremental ingestion.
+
+각 청크의 ID 는 ``(파일, 파일 내 위치, 내용 해시)`` 로부터 결정적으로 만들어지므로,
+같은 내용을 다시 적재하면 같은 키로 upsert 되어 인덱스에 중복이 생기지 않는다.
+매니페스트는 마지막으로 적재된 ID 목록을 로컬에 기록해, 다음 실행에서 새로 추가되거나
+바뀐 청크만 임베딩하고 사라진 청크는 인덱스에서 삭제할 수 있게 한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from langchain_core.documents import Document
+
+DEFAULT_MANIFEST_DIR = ".cache"
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of *text*."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(source: str, position: int, text: str) -> str:
+    """Return a deterministic Azure AI Search key for a chunk.
+
+    키에는 영문/숫자/``_``/``-``/``=`` 만 허용되므로 hex digest 를 쓴다.
+    """
+    return hashlib.sha256(f"{source}\x00{position}\x00{content_hash(text)}".encode("utf-8")).hexdigest()
+
+
+def iter_ids(docs: Iterable[Document]) -> Iterator[Tuple[str, Document]]:
+    """Attach deterministic IDs to *docs* (position = index of the chunk within its source file)."""
+    positions: Dict[str, int] = {}
+    for doc in docs:
+        source = str(doc.metadata.get("source", ""))
+        pos = positions.get(source, 0)
+        positions[source] = pos + 1
+        yield chunk_id(source, pos, doc.page_content), doc
+
+
+def assign_ids(docs: Iterable[Document]) -> List[Tuple[str, Document]]:
+    """List version of :func:`iter_ids`."""
+    return list(iter_ids(docs))
+
+
+def manifest_path(index_name: str, directory: str = DEFAULT_MANIFEST_DIR) -> str:
+    """Return the manifest path for *index_name* (one manifest per index)."""
+    return os.path.join(directory, f"ingest_manifest.{index_name}.json")
+
+
+@dataclass
+class IngestManifest:
+    """Chunk IDs currently stored in the index, grouped by source file."""
+
+    index: str
+    files: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str, index: str) -> "IngestManifest":
+        """Load a manifest, returning an empty one if the file is missing or belongs to another index."""
+        try:
+            with open(path, "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return cls(index=index)
+        if data.get("index") != index:
+            return cls(index=index)
+        return cls(index=index, files={k: list(v) for k, v in (data.get("files") or {}).items()})
+
+    def save(self, path: str) -> None:
+        """Write the manifest atomically."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump({"index": self.index, "files": self.files}, fp, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+
+    def all_ids(self) -> set[str]:
+        return {cid for ids in self.files.values() for cid in ids}
+
+
+@dataclass
+class IngestPlan:
+    """Result of diffing the current chunks against the manifest."""
+
+    upserts: List[Tuple[str, Document]]
+    deletes: List[str]
+    unchanged: int
+    files: Dict[str, List[str]]
+
+
+class IngestPlanner:
+    """Streaming diff of a document stream against a manifest.
+
+    :meth:`upserts` 는 문서를 하나씩 소비하면서 업로드가 필요한 청크만 내보내므로,
+    코퍼스 전체를 메모리에 올리지 않고 임베딩 파이프라인에 바로 연결할 수 있다.
+    ``deletes`` / ``files`` / ``unchanged`` 는 스트림을 끝까지 소비한 뒤에 유효하다.
+    """
+
+    def __init__(self, manifest: IngestManifest, *, full: bool = False) -> None:
+        self._known = manifest.all_ids()
+        self._full = full
+        self.files: Dict[str, List[str]] = {}
+        self.unchanged = 0
+        self.total = 0
+        self._done = False
+
+    def upserts(self, docs: Iterable[Document]) -> Iterator[Tuple[str, Document]]:
+        """Yield ``(key, Document)`` for chunks that are new or changed."""
+        for cid, doc in iter_ids(docs):
+            self.total += 1
+            self.files.setdefault(str(doc.metadata.get("source", "")), []).append(cid)
+            if cid in self._known and not self._full:
+                self.unchanged += 1
+            else:
+                yield cid, doc
+        self._done = True
+
+    @property
+    def deletes(self) -> List[str]:
+        """Keys in the manifest that the consumed stream no longer contains."""
+        if not self._done:
+            raise RuntimeError("IngestPlanner.deletes is only valid after the upserts stream is exhausted")
+        current = {cid for ids in self.files.values() for cid in ids}
+        return sorted(self._known - current)
+
+
+def plan_ingest(docs: Iterable[Document], manifest: IngestManifest, *, full: bool = False) -> IngestPlan:
+    """Compute which chunks must be embedded/uploaded and which keys must be deleted.
+
+    Args:
+        docs: ``make_docs_from_folder`` / ``iter_docs_from_folder`` 결과.
+        manifest: 이전 실행의 매니페스트.
+        full: *True* 이면 변경 여부와 관계없이 모든 청크를 다시 업로드한다.
+
+    Returns:
+        새로 추가/변경된 청크(``upserts``), 삭제할 키(``deletes``), 변경 없는 청크 수,
+        그리고 적재 성공 후 저장할 새 매니페스트 내용(``files``).
+    """
+    planner = IngestPlanner(manifest, full=full)
+    upserts = list(planner.upserts(docs))
+    return IngestPlan(upserts=upserts, deletes=planner.deletes, unchanged=planner.unchanged, files=planner.files)
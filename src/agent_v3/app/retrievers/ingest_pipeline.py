@@ -0,0 +1,280 @@
+"""Staged, parallel ingest pipeline: source → embed (N workers) → upload.
+
+각 단계는 크기 제한이 있는 큐로 연결되어, 업로드가 느리면 임베딩이, 임베딩이 느리면
+청크 생산이 자연스럽게 대기한다(backpressure). 429/503 응답은 지수 백오프로 재시도한다.
+
+    ┌────────┐  batches  ┌──────────────┐  vectors  ┌──────────┐
+    │ source │ ────────▶ │ embed × N    │ ────────▶ │ upload   │
+    └────────┘  (queue)  └──────────────┘  (queue)  └──────────┘
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple, TypeVar
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_STOP = object()  # queue sentinel
+
+
+class _VectorSink(Protocol):
+    def add_embeddings(
+        self,
+        text_embeddings: Iterable[Tuple[str, List[float]]],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        keys: Optional[List[str]] = None,
+    ) -> List[str]: ...
+
+
+# ---------------------------------------------------------------------------- #
+# Config / stats
+# ---------------------------------------------------------------------------- #
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Tuning knobs for :func:`run_pipeline`."""
+
+    embed_batch_size: int = 64
+    embed_workers: int = 4
+    upload_batch_size: int = 500
+    queue_size: int = 8  # 단계 사이 큐에 쌓일 수 있는 최대 배치 수
+    max_retries: int = 6
+    backoff_base: float = 1.0  # 초
+    backoff_max: float = 60.0
+
+
+@dataclass
+class PipelineStats:
+    """Throughput and per-stage busy time collected by :func:`run_pipeline`."""
+
+    chunks: int = 0
+    tokens: int = 0
+    embed_calls: int = 0
+    upload_calls: int = 0
+    retries: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {"source": 0.0, "embed": 0.0, "upload": 0.0})
+    wall_seconds: float = 0.0
+
+    def report(self) -> str:
+        """Return a one-block human readable summary."""
+        wall = self.wall_seconds or 1e-9
+        stages = ", ".join(f"{name}={sec:.2f}s" for name, sec in self.stage_seconds.items())
+        return (
+            f"chunks={self.chunks} tokens={self.tokens} wall={self.wall_seconds:.2f}s\n"
+            f"throughput: {self.chunks / wall:.1f} chunks/s, {self.tokens / wall:.1f} tokens/s\n"
+            f"stage busy time: {stages}\n"
+            f"calls: embed={self.embed_calls} upload={self.upload_calls} retries={self.retries}"
+        )
+
+
+# ---------------------------------------------------------------------------- #
+# Helpers
+# ---------------------------------------------------------------------------- #
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """Return *True* for rate-limit / temporarily-unavailable errors worth retrying."""
+    return _status_code(exc) in (429, 503) or type(exc).__name__ == "RateLimitError"
+
+
+def with_backoff(fn: Callable[[], T], cfg: PipelineConfig, on_retry: Callable[[], None]) -> T:
+    """Call *fn*, retrying throttled failures with exponential backoff and jitter."""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as exc:
+            if not is_throttled(exc) or attempt >= cfg.max_retries:
+                raise
+            delay = min(cfg.backoff_max, cfg.backoff_base * (2**attempt)) * (0.5 + random.random() / 2)
+            attempt += 1
+            on_retry()
+            logger.warning("Throttled (%s); retry %d/%d in %.1fs", _status_code(exc), attempt, cfg.max_retries, delay)
+            time.sleep(delay)
+
+
+def _make_token_counter() -> Callable[[str], int]:
+    """Return a tokenizer-based counter (cl100k_base), or a rough estimate if unavailable."""
+    try:
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(enc.encode(text))
+    except Exception:  # tiktoken 미설치 또는 오프라인에서 BPE 파일을 받을 수 없는 경우
+        return lambda text: max(1, len(text) // 4)
+
+
+# ---------------------------------------------------------------------------- #
+# Pipeline
+# ---------------------------------------------------------------------------- #
+
+
+def run_pipeline(
+    items: Iterable[Tuple[str, Document]],
+    embeddings: Embeddings,
+    sink: _VectorSink,
+    cfg: PipelineConfig = PipelineConfig(),
+) -> PipelineStats:
+    """Embed and upload ``(key, Document)`` items through bounded, parallel stages.
+
+    Args:
+        items: 업로드할 ``(키, 문서)`` 쌍. 제너레이터도 되며 필요한 만큼만 소비된다.
+        embeddings: ``embed_documents`` 를 제공하는 임베딩 클라이언트.
+        sink: ``add_embeddings`` 를 제공하는 벡터 스토어(예: ``AzureSearch``).
+        cfg: 배치 크기, 워커 수, 재시도 설정.
+
+    Returns:
+        처리량과 단계별 소요 시간이 담긴 :class:`PipelineStats`.
+
+    Raises:
+        Exception: 재시도 후에도 실패한 단계의 첫 번째 예외.
+    """
+    stats = PipelineStats()
+    lock = threading.Lock()
+    errors: List[BaseException] = []
+    abort = threading.Event()
+    count_tokens = _make_token_counter()
+
+    embed_q: "queue.Queue[Any]" = queue.Queue(maxsize=cfg.queue_size)
+    upload_q: "queue.Queue[Any]" = queue.Queue(maxsize=cfg.queue_size)
+
+    def _add_time(stage: str, seconds: float) -> None:
+        with lock:
+            stats.stage_seconds[stage] += seconds
+
+    def _retry() -> None:
+        with lock:
+            stats.retries += 1
+
+    def _fail(exc: BaseException) -> None:
+        with lock:
+            errors.append(exc)
+        abort.set()
+
+    def _put(q: "queue.Queue[Any]", obj: Any) -> bool:
+        """Blocking put that gives up once another stage has failed."""
+        while not abort.is_set():
+            try:
+                q.put(obj, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _source() -> None:
+        batch: List[Tuple[str, Document]] = []
+        try:
+            started = time.perf_counter()
+            for item in items:
+                batch.append(item)
+                if len(batch) >= cfg.embed_batch_size:
+                    _add_time("source", time.perf_counter() - started)
+                    if not _put(embed_q, batch):
+                        return
+                    batch = []
+                    started = time.perf_counter()
+            _add_time("source", time.perf_counter() - started)
+            if batch:
+                _put(embed_q, batch)
+        except Exception as exc:
+            _fail(exc)
+        finally:
+            for _ in range(cfg.embed_workers):
+                _put(embed_q, _STOP)
+
+    def _embed() -> None:
+        while not abort.is_set():
+            try:
+                batch = embed_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if batch is _STOP:
+                break
+            try:
+                texts = [doc.page_content for _, doc in batch]
+                started = time.perf_counter()
+                vectors = with_backoff(lambda: embeddings.embed_documents(texts), cfg, _retry)
+                _add_time("embed", time.perf_counter() - started)
+                tokens = sum(count_tokens(t) for t in texts)
+                with lock:
+                    stats.embed_calls += 1
+                    stats.tokens += tokens
+                if not _put(upload_q, [(key, doc, vec) for (key, doc), vec in zip(batch, vectors)]):
+                    break
+            except Exception as exc:
+                _fail(exc)
+                break
+
+    def _upload() -> None:
+        pending: List[Tuple[str, Document, List[float]]] = []
+
+        def _flush(rows: List[Tuple[str, Document, List[float]]]) -> None:
+            started = time.perf_counter()
+            with_backoff(
+                lambda: sink.add_embeddings(
+                    [(doc.page_content, vec) for _, doc, vec in rows],
+                    [doc.metadata for _, doc, _ in rows],
+                    keys=[key for key, _, _ in rows],
+                ),
+                cfg,
+                _retry,
+            )
+            _add_time("upload", time.perf_counter() - started)
+            with lock:
+                stats.upload_calls += 1
+                stats.chunks += len(rows)
+
+        try:
+            while not abort.is_set():
+                try:
+                    rows = upload_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if rows is _STOP:
+                    if pending:
+                        _flush(pending)
+                    return
+                pending.extend(rows)
+                while len(pending) >= cfg.upload_batch_size:
+                    _flush(pending[: cfg.upload_batch_size])
+                    del pending[: cfg.upload_batch_size]
+        except Exception as exc:
+            _fail(exc)
+
+    wall_started = time.perf_counter()
+    source = threading.Thread(target=_source, name="ingest-source", daemon=True)
+    embedders = [threading.Thread(target=_embed, name=f"ingest-embed-{i}", daemon=True) for i in range(cfg.embed_workers)]
+    uploader = threading.Thread(target=_upload, name="ingest-upload", daemon=True)
+    for t in (source, *embedders, uploader):
+        t.start()
+
+    source.join()
+    for t in embedders:
+        t.join()
+    _put(upload_q, _STOP)
+    uploader.join()
+    stats.wall_seconds = time.perf_counter() - wall_started
+
+    if errors:
+        raise errors[0]
+    return stats
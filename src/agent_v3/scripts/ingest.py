@@ -1,27 +1,99 @@
-"""Azure AI Search 벡터 스토어에 문서를 적재하는 스크립트."""
+"""Azure AI Search 벡터 스토어에 문서를 적재하는 스크립트.
 
-from typing import List
+청크마다 ``(파일, 위치, 내용 해시)`` 기반의 결정적 ID 를 부여하고 로컬 매니페스트와
+비교해, 새로 추가되거나 바뀐 청크만 임베딩/업로드하고 사라진 청크는 삭제한다.
+
+문서는 파일 단위로 읽어 스트리밍으로 분할/비교하고, 업로드가 필요한 청크만 곧바로
+배치 단위 병렬 파이프라인(``ingest_pipeline``)에 흘려보낸다. 따라서 전체 코퍼스를
+메모리에 올리지 않으며, 첫 배치의 임베딩이 마지막 파일을 읽기 전에 시작된다.
+종료 시 chunks/sec, tokens/sec, 단계별 소요 시간을 출력한다.
+
+Usage:
+  uv run python -m agent_v3.scripts.ingest [--full] [--dry-run] [--read-workers N]
+      [--embed-workers N] [--embed-batch N] [--upload-batch N]
+
+Note:
+  이전 버전(무작위 키)으로 적재된 인덱스에는 중복 벡터가 남아 있으므로, 처음 한 번은
+  빈 인덱스에 ``--full`` 로 적재하는 것을 권장한다.
+"""
+
+import argparse
+import itertools
+import sys
+import time
 
 from langchain_community.vectorstores.azuresearch import AzureSearch
-from langchain_core.documents import Document
 
+from agent_v3.app.config import azure_search_cfg
+from agent_v3.app.models import get_embeddings
 from agent_v3.app.retrievers.aisearch_store import (
+    iter_docs_from_folder,
     load_vectorstore,
-    make_docs_from_folder,
 )
+from agent_v3.app.retrievers.ingest_manifest import (
+    IngestManifest,
+    IngestPlanner,
+    manifest_path,
+)
+from agent_v3.app.retrievers.ingest_pipeline import PipelineConfig, run_pipeline
+
 
+def main(argv: list[str] | None = None) -> None:
+    """폴더의 문서를 분할 후 변경분만 AzureSearch 벡터 스토어에 반영한다."""
+    p = argparse.ArgumentParser(description="Incrementally ingest ground_docs into Azure AI Search")
+    p.add_argument("--full", action="store_true", help="변경 여부와 관계없이 모든 청크를 다시 업로드")
+    p.add_argument("--dry-run", action="store_true", help="변경 계획만 출력")
+    p.add_argument("--read-workers", type=int, default=4, help="동시에 읽는 파일 수")
+    p.add_argument("--embed-workers", type=int, default=4, help="동시 임베딩 요청 수")
+    p.add_argument("--embed-batch", type=int, default=64, help="임베딩 요청당 청크 수")
+    p.add_argument("--upload-batch", type=int, default=500, help="업로드 요청당 문서 수")
+    args = p.parse_args(argv)
 
-def main() -> None:
-    """폴더의 문서를 분할 후 AzureSearch 벡터 스토어에 적재한다."""
-    vector_store: AzureSearch = load_vectorstore()
-    docs: List[Document] = make_docs_from_folder(chunk_size=1, chunk_overlap=0)
+    started = time.perf_counter()
+    docs = iter_docs_from_folder(chunk_size=1, chunk_overlap=0, workers=args.read_workers)
+    path = manifest_path(azure_search_cfg.index)
+    manifest = IngestManifest.load(path, azure_search_cfg.index)
 
-    if not docs:  # 엣지 케이스: 적재할 문서가 없는 경우
+    planner = IngestPlanner(manifest, full=args.full)
+    upserts = planner.upserts(docs)
+
+    if args.dry_run:
+        n_upserts = sum(1 for _ in upserts)
+        print(f"chunks={planner.total} upsert={n_upserts} delete={len(planner.deletes)} unchanged={planner.unchanged}")
+        print(f"read+chunk+plan: {time.perf_counter() - started:.2f}s")
+        return
+
+    # 첫 업로드 대상이 나올 때까지만 읽어, 변경이 없으면 벡터 스토어를 만들지 않는다.
+    first = next(upserts, None)
+    vector_store: AzureSearch | None = None
+    n_upserts = 0
+    if first is not None:
+        vector_store = load_vectorstore()
+        # 결정적 키로 upload → 같은 키는 덮어쓰기(upsert)되어 중복이 생기지 않는다.
+        cfg = PipelineConfig(
+            embed_batch_size=args.embed_batch,
+            embed_workers=args.embed_workers,
+            upload_batch_size=args.upload_batch,
+        )
+        stats = run_pipeline(itertools.chain([first], upserts), get_embeddings(), vector_store, cfg)
+        n_upserts = stats.chunks
+        print(stats.report())
+
+    deletes = planner.deletes
+    print(f"chunks={planner.total} upsert={n_upserts} delete={len(deletes)} unchanged={planner.unchanged}")
+    if not planner.total and not deletes:  # 엣지 케이스: 적재할 문서가 없는 경우
         print("Ingest 대상 문서가 없습니다.")
         return
 
-    vector_store.add_documents(docs)
-    print(f"Ingested {len(docs)} chunks.")
+    if deletes:
+        if vector_store is None:
+            vector_store = load_vectorstore()
+        vector_store.delete(ids=deletes)
+
+    # 업로드/삭제가 모두 성공한 뒤에만 매니페스트를 갱신한다.
+    IngestManifest(index=azure_search_cfg.index, files=planner.files).save(path)
+    print(f"Ingested {n_upserts} chunks, deleted {len(deletes)}, skipped {planner.unchanged} unchanged.")
+    print(f"total: {time.perf_counter() - started:.2f}s")
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,95 @@
+"""증분 적재 매니페스트(`agent_v3.app.retrievers.ingest_manifest`) 테스트."""
+from __future__ import annotations
+
+import pytest
+from langchain_core.documents import Document
+
+from agent_v3.app.retrievers import ingest_manifest as im
+
+
+def _doc(source: str, text: str) -> Document:
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_chunk_id_is_deterministic_and_key_safe():
+    cid = im.chunk_id("a.md", 0, "본문")
+
+    assert cid == im.chunk_id("a.md", 0, "본문")
+    assert cid.isalnum() and len(cid) == 64
+    assert len({cid, im.chunk_id("b.md", 0, "본문"), im.chunk_id("a.md", 1, "본문"), im.chunk_id("a.md", 0, "본문!")}) == 4
+
+
+def test_positions_are_counted_per_source():
+    docs = [_doc("a.md", "x"), _doc("b.md", "y"), _doc("a.md", "z")]
+
+    ids = [cid for cid, _ in im.assign_ids(docs)]
+
+    assert ids == [im.chunk_id("a.md", 0, "x"), im.chunk_id("b.md", 0, "y"), im.chunk_id("a.md", 1, "z")]
+
+
+def test_manifest_round_trip_and_index_mismatch(tmp_path):
+    path = im.manifest_path("kb", str(tmp_path / "cache"))
+    im.IngestManifest(index="kb", files={"a.md": ["1", "2"]}).save(path)
+
+    assert im.IngestManifest.load(path, "kb").files == {"a.md": ["1", "2"]}
+    assert im.IngestManifest.load(path, "other").files == {}
+    assert im.IngestManifest.load(str(tmp_path / "missing.json"), "kb").files == {}
+
+
+def test_corrupt_manifest_loads_empty(tmp_path):
+    path = tmp_path / "m.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert im.IngestManifest.load(str(path), "kb").files == {}
+
+
+def _previous_run() -> im.IngestManifest:
+    docs = [_doc("a.md", "유지"), _doc("a.md", "수정 전"), _doc("gone.md", "삭제될 파일")]
+    return im.IngestManifest(index="kb", files=im.plan_ingest(docs, im.IngestManifest(index="kb")).files)
+
+
+def test_plan_classifies_new_changed_unchanged_and_deleted():
+    manifest = _previous_run()
+    docs = [_doc("a.md", "유지"), _doc("a.md", "수정 후"), _doc("new.md", "새 파일")]
+
+    plan = im.plan_ingest(docs, manifest)
+
+    changed, new = im.chunk_id("a.md", 1, "수정 후"), im.chunk_id("new.md", 0, "새 파일")
+    assert [cid for cid, _ in plan.upserts] == [changed, new]
+    assert plan.unchanged == 1
+    assert plan.deletes == sorted([im.chunk_id("a.md", 1, "수정 전"), im.chunk_id("gone.md", 0, "삭제될 파일")])
+    assert plan.files == {"a.md": [im.chunk_id("a.md", 0, "유지"), changed], "new.md": [new]}
+
+
+def test_unchanged_corpus_plans_nothing():
+    manifest = _previous_run()
+    docs = [_doc("a.md", "유지"), _doc("a.md", "수정 전"), _doc("gone.md", "삭제될 파일")]
+
+    plan = im.plan_ingest(docs, manifest)
+
+    assert (plan.upserts, plan.deletes, plan.unchanged) == ([], [], 3)
+
+
+def test_full_mode_reuploads_everything():
+    manifest = _previous_run()
+
+    plan = im.plan_ingest([_doc("a.md", "유지")], manifest, full=True)
+
+    assert [cid for cid, _ in plan.upserts] == [im.chunk_id("a.md", 0, "유지")]
+    assert plan.unchanged == 0
+    assert len(plan.deletes) == 2
+
+
+def test_deletes_requires_exhausted_stream():
+    planner = im.IngestPlanner(_previous_run())
+    stream = planner.upserts(iter([_doc("a.md", "수정 후"), _doc("a.md", "또 다른 청크")]))
+
+    with pytest.raises(RuntimeError):
+        planner.deletes
+    next(stream)
+    # 일부만 소비한 상태에서 삭제 목록을 계산하면 아직 보지 못한 청크까지 지우게 된다.
+    with pytest.raises(RuntimeError):
+        planner.deletes
+
+    list(stream)
+    assert im.chunk_id("a.md", 0, "유지") in planner.deletes
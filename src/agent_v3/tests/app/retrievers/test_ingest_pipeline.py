@@ -0,0 +1,172 @@
+"""병렬 임베딩/업로드 파이프라인(`agent_v3.app.retrievers.ingest_pipeline`) 테스트."""
+from __future__ import annotations
+
+import threading
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.documents import Document
+
+from agent_v3.app.retrievers import ingest_pipeline as ip
+
+_FAST = ip.PipelineConfig(embed_batch_size=3, embed_workers=2, upload_batch_size=4, queue_size=2, max_retries=3, backoff_base=0.001)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class _FakeEmbeddings:
+    """``embed_documents`` 가 처음 *fail_times* 번은 *error* 를 던지는 임베딩."""
+
+    def __init__(self, error: Optional[Exception] = None, fail_times: int = 0) -> None:
+        self.error = error
+        self.fail_times = fail_times
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.calls += 1
+            if self.error is not None and self.calls <= self.fail_times:
+                raise self.error
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class _FakeSink:
+    def __init__(self, error: Optional[Exception] = None, fail_times: int = 0) -> None:
+        self.error = error
+        self.fail_times = fail_times
+        self.calls = 0
+        self.keys: List[str] = []
+
+    def add_embeddings(self, text_embeddings: Any, metadatas: Any = None, *, keys: Optional[List[str]] = None) -> List[str]:
+        self.calls += 1
+        if self.error is not None and self.calls <= self.fail_times:
+            raise self.error
+        rows = list(text_embeddings)
+        assert keys is not None and len(keys) == len(rows) == len(metadatas)
+        self.keys.extend(keys)
+        return keys
+
+
+@pytest.fixture(autouse=True)
+def _one_token_per_chunk(monkeypatch):
+    monkeypatch.setattr(ip, "_make_token_counter", lambda: lambda text: 1)
+
+
+def _items(n: int):
+    return [(f"k{i}", Document(page_content=f"청크 {i}", metadata={"source": "a.md"})) for i in range(n)]
+
+
+def _run_bounded(*args: Any, timeout: float = 10.0, **kwargs: Any) -> Any:
+    """Run :func:`run_pipeline` in a thread and fail the test if it hangs."""
+    out: dict = {}
+
+    def _target() -> None:
+        try:
+            out["stats"] = ip.run_pipeline(*args, **kwargs)
+        except BaseException as exc:
+            out["error"] = exc
+
+    t = threading.Thread(target=_target, daemon=True)
+    t.start()
+    t.join(timeout)
+    assert not t.is_alive(), "run_pipeline did not return"
+    if "error" in out:
+        raise out["error"]
+    return out["stats"]
+
+
+def test_uploads_every_item_once_and_collects_stats():
+    sink = _FakeSink()
+
+    stats = _run_bounded(iter(_items(10)), _FakeEmbeddings(), sink, _FAST)
+
+    assert sorted(sink.keys) == sorted(f"k{i}" for i in range(10))
+    assert (stats.chunks, stats.tokens, stats.embed_calls, stats.upload_calls, stats.retries) == (10, 10, 4, 3, 0)
+    assert set(stats.stage_seconds) == {"source", "embed", "upload"}
+    assert stats.wall_seconds > 0
+    assert stats.report().startswith("chunks=10 tokens=10")
+
+
+def test_empty_input_stops_every_worker():
+    stats = _run_bounded(iter([]), _FakeEmbeddings(), _FakeSink(), ip.PipelineConfig(embed_workers=5))
+
+    assert (stats.chunks, stats.embed_calls, stats.upload_calls) == (0, 0, 0)
+
+
+def test_throttled_embed_and_upload_then_succeed():
+    emb = _FakeEmbeddings(_HTTPError(429), fail_times=2)
+    sink = _FakeSink(_HTTPError(503), fail_times=1)
+
+    stats = _run_bounded(iter(_items(5)), emb, sink, _FAST)
+
+    assert sorted(sink.keys) == [f"k{i}" for i in range(5)]
+    assert stats.retries == 3
+
+
+@pytest.mark.parametrize(
+    "emb, sink",
+    [
+        (_FakeEmbeddings(ValueError("bad batch"), fail_times=1), _FakeSink()),
+        (_FakeEmbeddings(), _FakeSink(ValueError("bad batch"), fail_times=1)),
+        (_FakeEmbeddings(_HTTPError(429), fail_times=100), _FakeSink()),
+    ],
+    ids=["embed", "upload", "retries-exhausted"],
+)
+def test_failing_stage_aborts_without_hanging(emb, sink):
+    # 큐가 작고 입력이 많아 다른 단계가 put 에서 막혀 있어도 중단되어야 한다.
+    cfg = ip.PipelineConfig(embed_batch_size=2, embed_workers=2, upload_batch_size=2, queue_size=1, max_retries=2, backoff_base=0.001)
+
+    with pytest.raises(Exception) as info:
+        _run_bounded(iter(_items(500)), emb, sink, cfg)
+
+    assert isinstance(info.value, (ValueError, _HTTPError))
+
+
+def test_failing_source_aborts():
+    def _items_then_fail():
+        yield from _items(4)
+        raise OSError("disk gone")
+
+    with pytest.raises(OSError):
+        _run_bounded(_items_then_fail(), _FakeEmbeddings(), _FakeSink(), _FAST)
+
+
+def test_with_backoff_only_retries_throttling():
+    calls: List[int] = []
+
+    def _fail_with(exc: Exception):
+        def _fn():
+            calls.append(1)
+            raise exc
+
+        return _fn
+
+    with pytest.raises(ValueError):
+        ip.with_backoff(_fail_with(ValueError("x")), _FAST, lambda: None)
+    assert len(calls) == 1
+
+    calls.clear()
+    retries: List[int] = []
+    with pytest.raises(_HTTPError):
+        ip.with_backoff(_fail_with(_HTTPError(503)), _FAST, lambda: retries.append(1))
+    assert (len(calls), len(retries)) == (_FAST.max_retries + 1, _FAST.max_retries)
+
+
+def test_is_throttled():
+    class RateLimitError(Exception):
+        pass
+
+    class _Resp:
+        status_code = 429
+
+    wrapped = Exception("wrapped")
+    wrapped.response = _Resp()  # type: ignore[attr-defined]
+
+    assert ip.is_throttled(_HTTPError(429)) and ip.is_throttled(_HTTPError(503))
+    assert ip.is_throttled(RateLimitError()) and ip.is_throttled(wrapped)
+    assert not ip.is_throttled(_HTTPError(400)) and not ip.is_throttled(ValueError())
@@ -38,6 +38,118 @@ class Flags:
     use_llm_grader: bool = os.getenv("USE_LLM_GRADER", "true").lower() == "true"
 
 
+@dataclass(frozen=True)
+class RouterConfig:
+    """라우터(``planner_router``) 설정.
+
+    로컬 규칙 라우터(:mod:`agent_v6.app.graph.nodes.local_router`)가 먼저 판정하고,
+    신뢰도가 ``local_min_confidence`` 미만일 때만 LLM 라우터를 호출한다.
+    1 보다 크게 두면 매 턴 LLM 을 호출한다(기존 동작).
+    """
+
+    local_min_confidence: float = float(os.getenv("ROUTER_LOCAL_MIN_CONFIDENCE", "0.7"))
+    # True 이면 router + rewrite 대신 한 번의 구조화 호출로 intent/need_web/queries 를 함께 만드는
+    # ``planner`` 노드를 쓴다 (:func:`agent_v6.app.graph.build_graph.build_graph`).
+    fused_planner: bool = os.getenv("ROUTER_FUSED_PLANNER", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class GraderConfig:
+    """LLM 관련성 채점(``evidence_grader``) 설정.
+
+    mode:
+        ``listwise``  – 모든 후보를 한 번의 LLM 호출로 채점하고, 응답에서 빠진 ID 만 개별 채점 (기본값)
+        ``pointwise`` – 후보마다 LLM 을 한 번씩 호출
+    """
+
+    mode: str = os.getenv("GRADER_MODE", "listwise").lower()
+    # listwise 프롬프트에 넣을 후보당 최대 글자 수
+    listwise_max_chars: int = int(os.getenv("GRADER_LISTWISE_MAX_CHARS", "800"))
+    # 개별 채점 시 동시에 보낼 최대 LLM 요청 수
+    max_concurrency: int = int(os.getenv("GRADER_MAX_CONCURRENCY", "8"))
+    # 노드 전체 제한 시간(초). 시간 안에 판정되지 않은 후보는 유지(fail-open). 0 이면 제한 없음.
+    timeout_s: float = float(os.getenv("GRADER_TIMEOUT_S", "20"))
+    # 검색 relevance score 구간 판정 (opt-in): accept 이상은 LLM 없이 채택, reject 미만은 LLM 없이 제외.
+    # 점수가 없는 후보(웹 검색, BM25 전용)와 그 사이 구간만 LLM 이 채점한다.
+    # 검색 단계가 이미 0.7 미만을 버리므로 reject 를 그보다 높이면 LLM 확인 없이 recall 이 줄어든다.
+    score_gate: bool = os.getenv("GRADER_SCORE_GATE", "false").lower() == "true"
+    accept_score: float = float(os.getenv("GRADER_ACCEPT_SCORE", "0.9"))
+    reject_score: float = float(os.getenv("GRADER_REJECT_SCORE", "0.7"))
+
+
+@dataclass(frozen=True)
+class NearDupConfig:
+    """채점 전 근사 중복(near-duplicate) evidence 제거 설정 (MinHash, 글자 shingle)."""
+
+    enabled: bool = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+    # 추정 Jaccard 유사도가 이 값 이상이면 같은 군집으로 본다.
+    threshold: float = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+    num_perm: int = int(os.getenv("NEAR_DUP_NUM_PERM", "64"))
+    shingle: int = int(os.getenv("NEAR_DUP_SHINGLE", "3"))
+
+
+@dataclass(frozen=True)
+class RetryConfig:
+    """Faithfulness 재시도 루프 설정.
+
+    incremental:
+        *True* 이면 재시도 때 이전에 검색하지 않은 쿼리만 검색하고, 이미 채점한 문서는
+        이전 판정을 그대로 써서 새 후보만 채점한다. *False* 이면 매 재시도가 전체 파이프라인을 다시 돈다.
+    """
+
+    incremental: bool = os.getenv("RETRY_INCREMENTAL", "true").lower() == "true"
+
+
+@dataclass(frozen=True)
+class GenerateConfig:
+    """답변 생성(``generate``) 프롬프트의 evidence 토큰 예산 설정.
+
+    evidence 는 관련도(``grade_score`` → 검색 ``relevance_score`` → ``unscored_score``) 순으로
+    정렬된 뒤, 배포 토크나이저로 센 토큰이 ``evidence_token_budget`` 을 채울 때까지 담긴다.
+    """
+
+    evidence_token_budget: int = int(os.getenv("GENERATE_EVIDENCE_TOKEN_BUDGET", "3000"))
+    # 항목 하나가 차지할 수 있는 최대 토큰 (넘으면 잘라 넣는다)
+    max_item_tokens: int = int(os.getenv("GENERATE_MAX_ITEM_TOKENS", "400"))
+    # 같은 출처(KB 파일 / 웹 URL)에서 담을 최대 항목 수
+    max_items_per_source: int = int(os.getenv("GENERATE_MAX_ITEMS_PER_SOURCE", "3"))
+    # 남은 예산이 이보다 작으면 항목을 잘라 넣지 않고 건너뛴다
+    min_item_tokens: int = int(os.getenv("GENERATE_MIN_ITEM_TOKENS", "40"))
+    # 점수가 없는 항목(웹 검색, BM25 전용)의 정렬용 점수. 채점을 통과했으므로 중간값을 준다.
+    unscored_score: float = float(os.getenv("GENERATE_UNSCORED_SCORE", "0.8"))
+    # 토크나이저를 찾을 모델 이름. 비우면 언어 모델 배포 이름을 쓴다.
+    tokenizer_model: str = os.getenv("GENERATE_TOKENIZER_MODEL", "")
+
+
+@dataclass(frozen=True)
+class RerankConfig:
+    """grade 와 generate 사이의 MMR(maximal marginal relevance) 재정렬 설정.
+
+    문서 벡터는 검색 시점에 백엔드가 돌려준 것(:mod:`agent_v6.app.retrievers.doc_vectors`)만 쓰므로
+    재정렬 때문에 임베딩을 새로 호출하지 않는다. 벡터가 없는 문서(웹 검색, ``fetch_vectors`` 가 꺼진 Azure 결과 등)는
+    중복 패널티 없이 관련도로만 정렬된다.
+    """
+
+    enabled: bool = os.getenv("RERANK_MMR_ENABLED", "true").lower() == "true"
+    # 1 이면 관련도만, 0 이면 다양성만 본다.
+    mmr_lambda: float = float(os.getenv("RERANK_MMR_LAMBDA", "0.7"))
+    # generate 에 넘길 최대 evidence 수
+    top_n: int = int(os.getenv("RERANK_TOP_N", "6"))
+    # 검색 시점 문서 벡터 캐시 크기
+    cache_items: int = int(os.getenv("RERANK_VECTOR_CACHE_ITEMS", "4096"))
+    # Azure AI Search 응답에 content_vector 를 함께 받을지 여부. 결과마다 수 KB 가 늘어나므로 기본은 끈다.
+    # 끄면 Azure 백엔드 결과는 MMR 에서 관련도로만 정렬된다 (로컬 백엔드는 인덱스 행을 그대로 쓴다).
+    fetch_vectors: bool = os.getenv("RERANK_FETCH_VECTORS", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class GraphStateConfig:
+    """``GraphState`` 문서 목록(kb_docs, web_docs, evidence) 설정."""
+
+    # 출처+본문 키로 병합한 뒤 유지할 최대 항목 수. 넘치면 관련도가 낮은 항목부터 버린다. 0 이면 제한 없음.
+    max_docs: int = int(os.getenv("GRAPH_STATE_MAX_DOCS", "64"))
+
+
 @dataclass(frozen=True)
 class AzureSearchConfig:
     """Configuration for Azure AI Search service."""
@@ -45,6 +157,80 @@ class AzureSearchConfig:
     endpoint: str = os.getenv("AZURE_SEARCH_ENDPOINT", "")
     key: str = os.getenv("AZURE_SEARCH_KEY", "")
     index: str = os.getenv("AZURE_SEARCH_INDEX", "common-sense-index")
+    # 0이면 AzureSearch 생성 시 임베딩 1회 호출로 차원을 추정한다.
+    vector_dimensions: int = int(os.getenv("AZURE_SEARCH_VECTOR_DIMENSIONS", "0"))
+    # 멀티 쿼리 검색 시 동시에 보낼 최대 벡터 검색 요청 수
+    max_concurrency: int = int(os.getenv("AZURE_SEARCH_MAX_CONCURRENCY", "4"))
+
+
+@dataclass(frozen=True)
+class EmbeddingCacheConfig:
+    """쿼리 임베딩 캐시 설정 (메모리 LRU + SQLite)."""
+
+    enabled: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    memory_items: int = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "2048"))
+    # 빈 문자열이면 디스크 계층을 사용하지 않는다.
+    path: str = os.getenv("EMBEDDING_CACHE_PATH", ".cache/query_embeddings.sqlite3")
+    max_disk_mb: int = int(os.getenv("EMBEDDING_CACHE_MAX_DISK_MB", "256"))
+
+
+@dataclass(frozen=True)
+class RetrieverConfig:
+    """KB 검색 백엔드 선택 설정.
+
+    backend:
+        ``aisearch`` – Azure AI Search (기본값)
+        ``local``    – 로컬 memory-mapped 벡터 인덱스 (``scripts/build_local_index.py`` 로 생성)
+    hybrid:
+        *True* 이면 위 벡터 백엔드 결과와 로컬 BM25 결과를 RRF 로 합친다.
+    """
+
+    backend: str = os.getenv("KB_BACKEND", "aisearch").lower()
+    local_index_dir: str = os.getenv("KB_LOCAL_INDEX_DIR", ".cache/kb_index")
+    # Hybrid: 로컬 BM25 + 벡터 검색을 병렬 실행 후 Reciprocal Rank Fusion 으로 결합
+    hybrid: bool = os.getenv("KB_HYBRID", "false").lower() == "true"
+    hybrid_dense_k: int = int(os.getenv("KB_HYBRID_DENSE_K", "3"))
+    hybrid_lexical_k: int = int(os.getenv("KB_HYBRID_LEXICAL_K", "5"))
+    rrf_k: int = int(os.getenv("KB_RRF_K", "60"))
+    # 재적재(ingest) 후 값을 바꾸면 KB 버전에 묶인 캐시(의미 기반 답변 캐시 등)가 무효화된다.
+    index_version: str = os.getenv("KB_INDEX_VERSION", "")
+    # 그래프 진입과 동시에 사용자 원문으로 KB 를 미리 검색(router/rewrite 와 병렬)해 grade 단계에서 합친다.
+    speculative: bool = os.getenv("KB_SPECULATIVE", "true").lower() == "true"
+    speculative_k: int = int(os.getenv("KB_SPECULATIVE_K", "5"))
+    # grade 가 아직 끝나지 않은 추측 검색을 기다리는 최대 시간(초). 넘으면 추측 결과 없이 진행한다.
+    speculative_wait_s: float = float(os.getenv("KB_SPECULATIVE_WAIT_S", "2"))
+
+
+@dataclass(frozen=True)
+class LLMCacheConfig:
+    """결정적 LLM 호출 응답 캐시 설정 (opt-in, SQLite).
+
+    nodes:
+        캐시할 노드 목록. ``router,rewrite:600`` 처럼 ``노드[:TTL초]`` 를 쉼표로 나열한다.
+        TTL 을 생략하면 ``ttl_s`` 를 쓴다. 노드 이름: router, rewrite, planner, grader, generate, faithfulness.
+    """
+
+    enabled: bool = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+    path: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3")
+    nodes: str = os.getenv("LLM_CACHE_NODES", "router,rewrite,planner")
+    ttl_s: float = float(os.getenv("LLM_CACHE_TTL_S", "86400"))
+    max_disk_mb: int = int(os.getenv("LLM_CACHE_MAX_DISK_MB", "64"))
+
+
+@dataclass(frozen=True)
+class AnswerCacheConfig:
+    """의미 기반 답변 캐시 설정 (질문 임베딩 유사도 + need_web·intent·이전 대화 키).
+
+    캐시는 프로세스 전체(모든 Chainlit 세션)가 공유하므로 기본값은 꺼짐이다.
+    """
+
+    enabled: bool = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() == "true"
+    # 질문 임베딩 코사인 유사도가 이 값 이상이면 같은 질문으로 본다.
+    similarity: float = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+    max_entries: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "512"))
+    ttl_s: float = float(os.getenv("ANSWER_CACHE_TTL_S", "3600"))
+    # 이 intent 의 턴은 조회도 저장도 하지 않는다 (앞선 대화나 작업 지시에 따라 답이 달라진다).
+    skip_intents: str = os.getenv("ANSWER_CACHE_SKIP_INTENTS", "followup,ambiguous,task")
 
 
 # ----------------------------------------
@@ -55,4 +241,15 @@ llm_cfg = AzureOpenAILanguageModelConfig()
 embedding_cfg = AzureOpenAIEmbeddingModelConfig()
 
 flags = Flags()
+router_cfg = RouterConfig()
+grader_cfg = GraderConfig()
+retry_cfg = RetryConfig()
+near_dup_cfg = NearDupConfig()
+graph_state_cfg = GraphStateConfig()
+generate_cfg = GenerateConfig()
+rerank_cfg = RerankConfig()
 azure_search_cfg = AzureSearchConfig()
+retriever_cfg = RetrieverConfig()
+embedding_cache_cfg = EmbeddingCacheConfig()
+answer_cache_cfg = AnswerCacheConfig()
+llm_cache_cfg = LLMCacheConfig()
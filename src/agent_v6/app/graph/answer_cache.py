@@ -0,0 +1,375 @@
+"""Semantic answer cache in front of the compiled agent_v6 graph.
+
+비슷한 질문이 반복되면 router → rewrite → kb/ddg → grade → generate → faithfulness
+전체를 다시 실행하는 대신, 질문 임베딩의 코사인 유사도가 기준 이상이고 ``need_web``·intent·
+이전 대화(마지막 사용자 메시지 앞의 메시지 해시)가 모두 같은 이전 답변을 근거(evidence)와 함께 그대로 돌려준다.
+
+- Faithfulness 검사를 통과한 답변만 저장한다.
+- 후속 질문·모호한 질문·작업 지시(``skip_intents``)는 앞선 대화에 따라 답이 달라지므로 조회도 저장도 하지 않는다.
+  조회 시점에는 그래프의 라우터가 아직 돌지 않았으므로 로컬 규칙 라우터로 intent 를 정한다.
+- 항목은 TTL 이 지나면 만료되고, 용량을 넘으면 가장 오래 쓰이지 않은 항목부터 제거된다(LRU).
+- KB 버전(:func:`agent_v6.app.retrievers.kb.kb_version`)이 바뀌면 전체 캐시를 비운다.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from agent_v6.app.config import answer_cache_cfg
+from agent_v6.app.graph.nodes.local_router import local_route
+from agent_v6.app.graph.state import GraphState
+from agent_v6.app.utils.messages import content_to_text, last_user_text
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["AnswerCacheStats", "CachedGraph", "SemanticAnswerCache", "conversation_key", "default_answer_cache"]
+
+# 캐시 적중 시 돌려주는 state 키 (원래 실행 결과에서 복사해 둔다)
+_CACHED_KEYS = ("answer", "evidence", "faithfulness", "intent", "queries")
+
+
+@dataclass
+class AnswerCacheStats:
+    """Counters exposed by :meth:`SemanticAnswerCache.stats`."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    skipped_unfaithful: int = 0
+    skipped_intent: int = 0
+    expired: int = 0
+    evicted: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    vector: np.ndarray  # L2-normalised float32
+    need_web: bool
+    intent: str
+    context: str
+    question: str
+    payload: Dict[str, Any]
+    created: float
+
+
+class SemanticAnswerCache:
+    """In-memory TTL + LRU cache keyed by question-embedding similarity and ``need_web``.
+
+    Args:
+        embed: 질문 문자열을 벡터로 바꾸는 함수 (예: ``embeddings.embed_query``).
+        version: 현재 KB 버전을 돌려주는 함수. 값이 바뀌면 캐시 전체를 비운다.
+        similarity: 적중으로 볼 최소 코사인 유사도.
+        max_entries: 최대 항목 수. 넘으면 LRU 로 제거한다.
+        ttl_s: 항목 수명(초). 0 이하이면 만료하지 않는다.
+        clock: 테스트용 시간 함수.
+        aembed: *embed* 의 비동기 버전. 없으면 :meth:`alookup`/:meth:`astore` 가 스레드에서 *embed* 를 호출한다.
+        skip_intents: 조회/저장하지 않을 intent.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], List[float]],
+        version: Callable[[], str],
+        *,
+        similarity: float = 0.95,
+        max_entries: int = 512,
+        ttl_s: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+        aembed: Optional[Callable[[str], Awaitable[List[float]]]] = None,
+        skip_intents: Iterable[str] = ("followup", "ambiguous", "task"),
+    ) -> None:
+        self._skip_intents = frozenset(skip_intents)
+        self._embed = embed
+        self._aembed = aembed
+        self._version_fn = version
+        self._similarity = similarity
+        self._max_entries = max(1, max_entries)
+        self._ttl_s = ttl_s
+        self._clock = clock
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._next_id = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stats = AnswerCacheStats()
+
+    # ------------------------------------------------------------------ #
+    # Internals (call with the lock held)
+    # ------------------------------------------------------------------ #
+
+    def _check_version(self) -> None:
+        version = self._version_fn()
+        if version != self._version:
+            if self._entries:
+                logger.info("KB version changed (%s -> %s); clearing %d cached answers", self._version, version, len(self._entries))
+                self._stats.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def _expire(self) -> None:
+        if self._ttl_s <= 0:
+            return
+        cutoff = self._clock() - self._ttl_s
+        for key in [k for k, e in self._entries.items() if e.created < cutoff]:
+            del self._entries[key]
+            self._stats.expired += 1
+
+    def _best_match(self, vector: np.ndarray, need_web: bool, intent: str, context: str) -> Tuple[Optional[int], float]:
+        keys = [k for k, e in self._entries.items() if (e.need_web, e.intent, e.context) == (need_web, intent, context)]
+        if not keys:
+            return None, 0.0
+        sims = np.stack([self._entries[k].vector for k in keys]) @ vector
+        best = int(np.argmax(sims))
+        return keys[best], float(sims[best])
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def lookup(self, question: str, need_web: bool, *, intent: str = "new_topic", context: str = "") -> Optional[Dict[str, Any]]:
+        """Return a deep copy of the cached payload for *question*, or *None* on miss.
+
+        Args:
+            question: 마지막 사용자 메시지.
+            need_web: 웹 검색 여부.
+            intent: 이 턴의 intent. ``skip_intents`` 이면 임베딩 없이 바로 *None*.
+            context: 이전 대화 식별자 (:func:`conversation_key`). 정확히 같아야 적중한다.
+
+        적중 시 payload 에 ``answer_cache`` 키로 유사도와 원래 질문이 함께 담긴다.
+        """
+        if self._skipped(intent):
+            return None
+        return self._lookup_vector(self._normalize(self._embed(question)), need_web, intent, context)
+
+    async def alookup(self, question: str, need_web: bool, *, intent: str = "new_topic", context: str = "") -> Optional[Dict[str, Any]]:
+        """Async :meth:`lookup`."""
+        if self._skipped(intent):
+            return None
+        return self._lookup_vector(self._normalize(await self._aembed_question(question)), need_web, intent, context)
+
+    def _skipped(self, intent: str) -> bool:
+        if intent not in self._skip_intents:
+            return False
+        with self._lock:
+            self._stats.skipped_intent += 1
+        return True
+
+    async def _aembed_question(self, question: str) -> List[float]:
+        if self._aembed is not None:
+            return await self._aembed(question)
+        return await asyncio.to_thread(self._embed, question)
+
+    def _lookup_vector(self, vector: np.ndarray, need_web: bool, intent: str, context: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._check_version()
+            self._expire()
+            key, sim = self._best_match(vector, need_web, intent, context)
+            if key is None or sim < self._similarity:
+                self._stats.misses += 1
+                return None
+            entry = self._entries[key]
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            payload = copy.deepcopy(entry.payload)
+        payload["answer_cache"] = {"hit": True, "similarity": sim, "cached_question": entry.question}
+        return payload
+
+    def store(self, question: str, need_web: bool, result: Dict[str, Any], *, intent: str = "new_topic", context: str = "") -> bool:
+        """Store *result* if its faithfulness check passed. Returns *True* when stored.
+
+        항목은 조회와 같은 키(*intent*, 즉 :func:`_turn_key` 의 로컬 판정)로 저장한다. 그래프 라우터가 정한
+        ``result["intent"]`` 는 키에 쓰지 않고, *intent* 와 둘 중 하나라도 ``skip_intents`` 이면 저장만 건너뛴다.
+        """
+        if not self._storable(result, intent):
+            return False
+        self._store_vector(self._normalize(self._embed(question)), question, need_web, intent, context, result)
+        return True
+
+    async def astore(
+        self, question: str, need_web: bool, result: Dict[str, Any], *, intent: str = "new_topic", context: str = ""
+    ) -> bool:
+        """Async :meth:`store`."""
+        if not self._storable(result, intent):
+            return False
+        self._store_vector(self._normalize(await self._aembed_question(question)), question, need_web, intent, context, result)
+        return True
+
+    def _storable(self, result: Dict[str, Any], intent: str) -> bool:
+        if self._skipped(intent) or self._skipped(_result_intent(result)):
+            return False
+        if (result.get("faithfulness") or {}).get("faithful") and result.get("answer"):
+            return True
+        with self._lock:
+            self._stats.skipped_unfaithful += 1
+        return False
+
+    def _store_vector(
+        self, vector: np.ndarray, question: str, need_web: bool, intent: str, context: str, result: Dict[str, Any]
+    ) -> None:
+        # lookup 과 같은 키(호출자가 넘긴 intent)로 저장한다. 그래프 결과의 intent(LLM 라우터 판정)로 저장하면
+        # 두 판정이 다른 턴은 조회되지 않는 항목만 쌓인다.
+        payload = copy.deepcopy({k: result[k] for k in _CACHED_KEYS if k in result})
+        with self._lock:
+            self._check_version()
+            # 같은 키(거의 같은 질문)가 이미 있으면 교체한다.
+            key, sim = self._best_match(vector, need_web, intent, context)
+            if key is not None and sim >= self._similarity:
+                del self._entries[key]
+            self._entries[self._next_id] = _Entry(vector, need_web, intent, context, question, payload, self._clock())
+            self._next_id += 1
+            self._stats.stores += 1
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**asdict(self._stats), "entries": len(self._entries), "kb_version": self._version}
+
+
+def _result_intent(result: Dict[str, Any]) -> str:
+    return str(result.get("intent") or "new_topic")
+
+
+def _message_role(message: Any) -> str:
+    if isinstance(message, dict):
+        return str(message.get("role", ""))
+    m_type = getattr(message, "type", "")
+    return {"human": "user", "ai": "assistant"}.get(m_type, m_type)
+
+
+def _message_text(message: Any) -> str:
+    content = message.get("content", "") if isinstance(message, dict) else getattr(message, "content", "")
+    return content_to_text(content)
+
+
+def conversation_key(state: GraphState) -> str:
+    """Return a digest of the conversation before the last user message (``""`` for a first turn)."""
+    messages = list(state.get("messages", []) or [])
+    for i in range(len(messages) - 1, -1, -1):
+        if _message_role(messages[i]) == "user":
+            messages = messages[:i]
+            break
+    if not messages:
+        return ""
+    body = json.dumps([[_message_role(m), _message_text(m)] for m in messages], ensure_ascii=False)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class _TurnKey:
+    question: str
+    need_web: bool
+    intent: str
+    context: str
+
+
+def _turn_key(state: GraphState) -> Optional[_TurnKey]:
+    question = last_user_text(state)
+    if not question:
+        return None
+    return _TurnKey(question, bool(state.get("need_web", False)), local_route(question).intent, conversation_key(state))
+
+
+class CachedGraph:
+    """Wrap a compiled graph so ``invoke`` consults a :class:`SemanticAnswerCache` first.
+
+    그 밖의 속성(``stream``, ``get_graph`` 등)은 원래 그래프로 위임한다.
+    캐시 조회/저장 중 오류가 나면 캐시 없이 그래프를 실행한다(fail-open).
+    """
+
+    def __init__(self, graph: Any, cache: SemanticAnswerCache) -> None:
+        self.graph = graph
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.graph, name)
+
+    async def alookup(self, state: GraphState) -> Optional[Dict[str, Any]]:
+        """Return the cached final state for *state*, or *None* on miss/error."""
+        key = _turn_key(state)
+        if key is None:
+            return None
+        try:
+            hit = await self.cache.alookup(key.question, key.need_web, intent=key.intent, context=key.context)
+        except Exception:
+            logger.exception("Answer cache lookup failed")
+            return None
+        return None if hit is None else {**state, **hit}
+
+    async def astore(self, state: GraphState, result: Dict[str, Any]) -> None:
+        """Offer a finished graph *result* for *state* to the cache (fail-open)."""
+        key = _turn_key(state)
+        if key is None:
+            return
+        try:
+            await self.cache.astore(key.question, key.need_web, result, intent=key.intent, context=key.context)
+        except Exception:
+            logger.exception("Answer cache store failed")
+
+    async def ainvoke(self, state: GraphState, config: Any = None, **kwargs: Any) -> Dict[str, Any]:
+        hit = await self.alookup(state)
+        if hit is not None:
+            return hit
+        result = await self.graph.ainvoke(state, config, **kwargs)
+        await self.astore(state, result)
+        return result
+
+    def invoke(self, state: GraphState, config: Any = None, **kwargs: Any) -> Dict[str, Any]:
+        key = _turn_key(state)
+        if key is not None:
+            try:
+                hit = self.cache.lookup(key.question, key.need_web, intent=key.intent, context=key.context)
+            except Exception:
+                logger.exception("Answer cache lookup failed")
+                hit = None
+            if hit is not None:
+                return {**state, **hit}
+
+        result = self.graph.invoke(state, config, **kwargs)
+        if key is not None:
+            try:
+                self.cache.store(key.question, key.need_web, result, intent=key.intent, context=key.context)
+            except Exception:
+                logger.exception("Answer cache store failed")
+        return result
+
+
+def default_answer_cache() -> SemanticAnswerCache:
+    """Build a cache from ``answer_cache_cfg`` using the shared (cached) query embeddings."""
+    from agent_v6.app.retrievers.aisearch_store import store_manager
+    from agent_v6.app.retrievers.kb import kb_version
+
+    return SemanticAnswerCache(
+        embed=lambda text: store_manager.get_embeddings().embed_query(text),
+        aembed=lambda text: store_manager.get_embeddings().aembed_query(text),
+        version=kb_version,
+        similarity=answer_cache_cfg.similarity,
+        max_entries=answer_cache_cfg.max_entries,
+        ttl_s=answer_cache_cfg.ttl_s,
+        skip_intents=[i.strip() for i in answer_cache_cfg.skip_intents.split(",") if i.strip()],
+    )
@@ -1,54 +1,163 @@
-from langgraph.graph import END, StateGraph
-
-from agent_v6.app.graph.nodes.faithfulness import faithfulness_check
-from agent_v6.app.graph.nodes.generate import generate
-from agent_v6.app.graph.nodes.grader import evidence_grader
-from agent_v6.app.graph.nodes.retrieve_kb import retrieve_kb
-from agent_v6.app.graph.nodes.rewrite import query_rewrite
-from agent_v6.app.graph.nodes.router import planner_router
-from agent_v6.app.graph.nodes.tool_ddg import retrieve_ddg
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from langgraph.graph import END, START, StateGraph
+
+from agent_v6.app.config import answer_cache_cfg, rerank_cfg, retriever_cfg, router_cfg
+from agent_v6.app.graph.answer_cache import CachedGraph, default_answer_cache
+from agent_v6.app.graph.nodes.faithfulness import afaithfulness_check, faithfulness_check
+from agent_v6.app.graph.nodes.generate import agenerate, generate
+from agent_v6.app.graph.nodes.grader import aevidence_grader, evidence_grader
+from agent_v6.app.graph.nodes.planner import aplanner, planner
+from agent_v6.app.graph.nodes.rerank import ammr_rerank, mmr_rerank
+from agent_v6.app.graph.nodes.retrieve_kb import aretrieve_kb, aspeculative_kb, retrieve_kb, speculative_kb
+from agent_v6.app.graph.nodes.rewrite import aquery_rewrite, query_rewrite
+from agent_v6.app.graph.nodes.router import aplanner_router, planner_router
+from agent_v6.app.graph.nodes.tool_ddg import aretrieve_ddg, retrieve_ddg
 from agent_v6.app.graph.state import GraphState
 
+_SYNC_NODES: Dict[str, Callable[..., Any]] = {
+    "router": planner_router,
+    "rewrite": query_rewrite,
+    "kb": retrieve_kb,
+    "kb_spec": speculative_kb,
+    "ddg": retrieve_ddg,
+    "grade": evidence_grader,
+    "rerank": mmr_rerank,
+    "generate": generate,
+    "faithfulness": faithfulness_check,
+}
+
+_ASYNC_NODES: Dict[str, Callable[..., Any]] = {
+    "router": aplanner_router,
+    "rewrite": aquery_rewrite,
+    "kb": aretrieve_kb,
+    "kb_spec": aspeculative_kb,
+    "ddg": aretrieve_ddg,
+    "grade": aevidence_grader,
+    "rerank": ammr_rerank,
+    "generate": agenerate,
+    "faithfulness": afaithfulness_check,
+}
+
+
+def _route_after_faithfulness(state: GraphState) -> str:
+    """Return 'retry' to loop, or 'end' to finish.
+
+    - If faithful: end
+    - If unfaithful and step < max_steps: retry
+    - If unfaithful and no max or exceeded: end (safety)
+    """
+    faith = (state.get("faithfulness") or {}).get("faithful", True)
+    if faith:
+        return "end"
+    step = int(state.get("step", 0) or 0)
+    max_steps = state.get("max_steps")
+    if max_steps is not None and step >= int(max_steps):
+        return "end"
+    # Otherwise retry
+    return "retry"
+
+
+def _route_after_queries(state: GraphState) -> Union[str, List[str]]:
+    """Fan out to kb/ddg, or end when a retry proposed no new query.
+
+    증분 재시도(``retry_cfg.incremental``)는 이미 검색한 쿼리를 빼므로, 재작성 결과가 모두 중복이면
+    ``queries`` 가 비게 된다. 그때는 같은 근거로 다시 생성해 봐야 달라질 것이 없으므로,
+    직전 답변과 faithfulness 판정을 그대로 두고 루프를 끝낸다.
+    """
+    if not (state.get("queries") or []):
+        return END
+    return ["kb", "ddg"]
 
-def build_graph():
-    def _route_after_faithfulness(state: GraphState) -> str:
-        """Return 'retry' to loop, or 'end' to finish.
-
-        - If faithful: end
-        - If unfaithful and step < max_steps: retry
-        - If unfaithful and no max or exceeded: end (safety)
-        """
-        faith = (state.get("faithfulness") or {}).get("faithful", True)
-        if faith:
-            return "end"
-        step = int(state.get("step", 0) or 0)
-        max_steps = state.get("max_steps")
-        if max_steps is not None and step >= int(max_steps):
-            return "end"
-        # Otherwise retry
-        return "retry"
+
+def _compile(
+    nodes: Dict[str, Callable[..., Any]],
+    plan_node: Callable[..., Any],
+    answer_cache: Optional[bool],
+    fused_planner: Optional[bool],
+    speculative_kb: Optional[bool],
+    mmr_rerank: Optional[bool],
+) -> Any:
+    fused = fused_planner if fused_planner is not None else router_cfg.fused_planner
+    speculative = speculative_kb if speculative_kb is not None else retriever_cfg.speculative
+    if not speculative:
+        nodes = {k: v for k, v in nodes.items() if k != "kb_spec"}
+    rerank = mmr_rerank if mmr_rerank is not None else rerank_cfg.enabled
+    if not rerank:
+        nodes = {k: v for k, v in nodes.items() if k != "rerank"}
+    if fused:
+        # router + rewrite 를 한 번의 구조화 호출(plan)로 대체
+        nodes = {"plan": plan_node, **{k: v for k, v in nodes.items() if k not in ("router", "rewrite")}}
+    # 재시도 루프가 돌아갈 쿼리 생성 노드
+    query_node = "plan" if fused else "rewrite"
 
     g = StateGraph(GraphState)
-    g.add_node("router", planner_router)
-    g.add_node("rewrite", query_rewrite)
-    g.add_node("kb", retrieve_kb)
-    g.add_node("ddg", retrieve_ddg)
-    g.add_node("grade", evidence_grader)
-    g.add_node("generate", generate)
-    g.add_node("faithfulness", faithfulness_check)
-
-    g.set_entry_point("router")
-    g.add_edge("router", "rewrite")
-    g.add_edge("rewrite", "kb")
-    g.add_edge("rewrite", "ddg")
+    for name, fn in nodes.items():
+        g.add_node(name, fn)
+
+    if fused:
+        g.set_entry_point("plan")
+    else:
+        g.set_entry_point("router")
+        g.add_edge("router", "rewrite")
+    if speculative:
+        # 원 질문 KB 검색을 진입 즉시 백그라운드로 시작한다. kb_spec 노드는 티켓만 남기고 바로 끝나므로
+        # router 단계를 붙잡지 않으며, 검색은 router → rewrite → kb/ddg 와 겹쳐 실행된다.
+        # 합류는 grade 가 티켓으로 결과를 받아(collect_speculative) 재작성 쿼리 결과와 합치는 것으로 이뤄진다.
+        g.add_edge(START, "kb_spec")
+    g.add_conditional_edges(query_node, _route_after_queries, ["kb", "ddg", END])
     g.add_edge("kb", "grade")
     g.add_edge("ddg", "grade")
-    g.add_edge("grade", "generate")
+    if rerank:
+        # 관련도 + 다양성(MMR)으로 evidence 를 골라 generate 에 넘긴다.
+        g.add_edge("grade", "rerank")
+        g.add_edge("rerank", "generate")
+    else:
+        g.add_edge("grade", "generate")
     g.add_edge("generate", "faithfulness")
     # Faithfulness 결과에 따라 종료 또는 재질의 루프
     g.add_conditional_edges(
         "faithfulness",
         _route_after_faithfulness,
-        {"retry": "rewrite", "end": END},
+        {"retry": query_node, "end": END},
     )
-    return g.compile()
+    graph = g.compile()
+    if answer_cache if answer_cache is not None else answer_cache_cfg.enabled:
+        return CachedGraph(graph, default_answer_cache())
+    return graph
+
+
+def build_graph(
+    *,
+    answer_cache: Optional[bool] = None,
+    fused_planner: Optional[bool] = None,
+    speculative_kb: Optional[bool] = None,
+    mmr_rerank: Optional[bool] = None,
+) -> Any:
+    """Compile the v6 graph.
+
+    Args:
+        answer_cache: 의미 기반 답변 캐시로 감쌀지 여부. ``None`` 이면 ``answer_cache_cfg.enabled``.
+        fused_planner: router + rewrite 대신 한 번의 호출로 계획하는 ``plan`` 노드를 쓸지 여부.
+            ``None`` 이면 ``router_cfg.fused_planner``.
+        speculative_kb: 사용자 원문 KB 추측 검색(``kb_spec``)을 병렬로 돌릴지 여부.
+            ``None`` 이면 ``retriever_cfg.speculative``.
+        mmr_rerank: grade 와 generate 사이에 MMR 재정렬(``rerank``)을 넣을지 여부.
+            ``None`` 이면 ``rerank_cfg.enabled``.
+    """
+    return _compile(_SYNC_NODES, planner, answer_cache, fused_planner, speculative_kb, mmr_rerank)
+
+
+def build_async_graph(
+    *,
+    answer_cache: Optional[bool] = None,
+    fused_planner: Optional[bool] = None,
+    speculative_kb: Optional[bool] = None,
+    mmr_rerank: Optional[bool] = None,
+) -> Any:
+    """Compile the v6 graph with async nodes; run it with ``await graph.ainvoke(state)``.
+
+    모든 노드가 ``ainvoke``/비동기 검색/비동기 임베딩을 쓰므로, 한 요청이 이벤트 루프를
+    막지 않아 Chainlit 의 다른 세션이 동시에 진행된다.
+    """
+    return _compile(_ASYNC_NODES, aplanner, answer_cache, fused_planner, speculative_kb, mmr_rerank)
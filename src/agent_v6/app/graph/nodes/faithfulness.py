@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 
 from agent_v6.app.config import flags
 from agent_v6.app.graph.state import GraphState
-from agent_v6.app.models import get_llm
+from agent_v6.app.models import astructured_call, get_llm, structured_call
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -34,6 +34,19 @@ def _evidence_sources(evidence: List[Dict[str, Any]]) -> List[str]:
     return sources
 
 
+def _judged_evidence(state: GraphState) -> Tuple[List[Dict[str, Any]], bool]:
+    """Return the evidence ``generate`` answered from, and whether it is the packed prompt set.
+
+    generate 가 남긴 ``packed_evidence``(토큰 예산으로 담은 항목과 본문)가 있으면 그대로 쓰고,
+    없으면 generate 와 같은 규칙으로 ``ranked_evidence`` → ``evidence`` 순으로 고른다.
+    """
+    packed = state.get("packed_evidence")
+    if packed is not None:
+        return packed, True
+    ranked = state.get("ranked_evidence")
+    return (ranked if ranked is not None else (state.get("evidence", []) or [])), False
+
+
 # ---------------------------------------------------------------------------
 # LLM schema
 # ---------------------------------------------------------------------------
@@ -57,11 +70,8 @@ SYS = (
 # Node
 # ---------------------------------------------------------------------------
 
-def faithfulness_check(state: GraphState) -> Dict[str, Any]:
-    answer: str = (state.get("answer") or "").strip()
-    evidence: List[Dict[str, Any]] = state.get("evidence", []) or []
-
-    # Heuristic signals -----------------------------------------------------
+def _heuristics(answer: str, evidence: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+    """Return citation heuristics and the heuristic faithfulness verdict."""
     citations = _extract_citations(answer)
     sources = _evidence_sources(evidence)
 
@@ -81,64 +91,94 @@ def faithfulness_check(state: GraphState) -> Dict[str, Any]:
         "evidence_sources": sources[:20],
         "supported_citations": cited_ok,
     }
+    faithful = bool(evidence) and bool(citations) and cited_ok >= max(1, len(citations) // 2)
+    return heuristics, faithful
+
+
+def _judge_messages(answer: str, evidence: List[Dict[str, Any]], packed: bool = False) -> List[Dict[str, str]]:
+    # Prepare compact evidence list. 패킹된 집합은 이미 토큰 예산 안이므로 더 자르지 않는다.
+    ev_lines: List[str] = []
+    for e in evidence if packed else evidence[:12]:
+        src = e.get("source") or (e.get("metadata") or {}).get("source") or "SRC"
+        content = (e.get("content") or e.get("text") or "").strip()
+        if not packed:
+            content = content[:600]
+        ev_lines.append(f"- {src}: {content}")
+    ev_block = "\n".join(ev_lines) if ev_lines else "(none)"
+
+    payload = {
+        "answer": answer,
+        "evidence": ev_block,
+    }
+    return [
+        {"role": "system", "content": SYS},
+        {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+    ]
+
+
+def _heuristic_updates(heuristics: Dict[str, Any], faithful: bool, issue: str) -> Dict[str, Any]:
+    return {
+        "faithfulness": {
+            "faithful": faithful,
+            "issues": [] if faithful else [issue],
+            "heuristics": heuristics,
+        }
+    }
+
+
+def _llm_updates(result: FaithfulnessResult, heuristics: Dict[str, Any]) -> Dict[str, Any]:
+    faithful = result.faithful
+    issues = list(result.issues or [])
+    fixed = (result.fixed_answer or "").strip() or None
+
+    updates: Dict[str, Any] = {
+        "faithfulness": {
+            "faithful": faithful,
+            "issues": issues,
+            "heuristics": heuristics,
+        }
+    }
+    # If unfaithful and we have a corrected answer, update it
+    if not faithful and fixed:
+        updates["answer"] = fixed
+    return updates
+
+
+def faithfulness_check(state: GraphState) -> Dict[str, Any]:
+    answer: str = (state.get("answer") or "").strip()
+    evidence, packed = _judged_evidence(state)
+
+    # Heuristic signals -----------------------------------------------------
+    heuristics, heuristic_faithful = _heuristics(answer, evidence)
 
     # If no LLM grading desired/available, provide heuristic verdict
     if not flags.use_llm_grader:
-        faithful = bool(evidence) and bool(citations) and cited_ok >= max(1, len(citations) // 2)
-        return {
-            "faithfulness": {
-                "faithful": faithful,
-                "issues": [] if faithful else ["Insufficient or mismatched citations against evidence"],
-                "heuristics": heuristics,
-            }
-        }
+        return _heuristic_updates(heuristics, heuristic_faithful, "Insufficient or mismatched citations against evidence")
 
     # LLM-based evaluation --------------------------------------------------
     try:
         llm = get_llm().with_structured_output(FaithfulnessResult)
-        # Prepare compact evidence list
-        ev_lines: List[str] = []
-        for e in evidence[:12]:
-            src = e.get("source") or (e.get("metadata") or {}).get("source") or "SRC"
-            content = (e.get("content") or e.get("text") or "").strip()
-            content = content[:600]
-            ev_lines.append(f"- {src}: {content}")
-        ev_block = "\n".join(ev_lines) if ev_lines else "(none)"
-
-        payload = {
-            "answer": answer,
-            "evidence": ev_block,
-        }
-        result = FaithfulnessResult.model_validate(
-            llm.invoke(
-                [
-                    {"role": "system", "content": SYS},
-                    {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
-                ]
-            )
-        )
-        faithful = result.faithful
-        issues = list(result.issues or [])
-        fixed = (result.fixed_answer or "").strip() or None
-
-        updates: Dict[str, Any] = {
-            "faithfulness": {
-                "faithful": faithful,
-                "issues": issues,
-                "heuristics": heuristics,
-            }
-        }
-        # If unfaithful and we have a corrected answer, update it
-        if not faithful and fixed:
-            updates["answer"] = fixed
-        return updates
+        messages = _judge_messages(answer, evidence, packed)
+        result = structured_call("faithfulness", FaithfulnessResult, messages, lambda: llm.invoke(messages))
+        return _llm_updates(result, heuristics)
     except Exception:
         # Fallback to heuristic if LLM validation fails
-        faithful = bool(evidence) and bool(citations) and cited_ok >= max(1, len(citations) // 2)
-        return {
-            "faithfulness": {
-                "faithful": faithful,
-                "issues": [] if faithful else ["LLM validation failed; heuristic used"],
-                "heuristics": heuristics,
-            }
-        }
+        return _heuristic_updates(heuristics, heuristic_faithful, "LLM validation failed; heuristic used")
+
+
+async def afaithfulness_check(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`faithfulness_check` (``ainvoke``)."""
+    answer: str = (state.get("answer") or "").strip()
+    evidence, packed = _judged_evidence(state)
+    heuristics, heuristic_faithful = _heuristics(answer, evidence)
+
+    if not flags.use_llm_grader:
+        return _heuristic_updates(heuristics, heuristic_faithful, "Insufficient or mismatched citations against evidence")
+
+    try:
+        llm = get_llm().with_structured_output(FaithfulnessResult)
+        messages = _judge_messages(answer, evidence, packed)
+        result = await astructured_call("faithfulness", FaithfulnessResult, messages, lambda: llm.ainvoke(messages))
+        return _llm_updates(result, heuristics)
+    except Exception:
+        return _heuristic_updates(heuristics, heuristic_faithful, "LLM validation failed; heuristic used")
@@ -1,9 +1,17 @@
+import logging
 import re
-from typing import Any, Dict, List, Tuple
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
+from agent_v6.app.config import generate_cfg, llm_cfg
 from agent_v6.app.graph.state import GraphState
-from agent_v6.app.models import chat
+from agent_v6.app.models import achat, chat
+from agent_v6.app.utils.docs import dedup_evidence, evidence_relevance
 from agent_v6.app.utils.messages import last_user_text as _last_user_text
+from agent_v6.app.utils.tokens import Tokenizer, get_tokenizer
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Config
@@ -16,9 +24,6 @@ SYS = (
     "If there is no evidence at all, say you lack evidence and avoid unverifiable facts."
 )
 
-MAX_SNIPPET = 500
-MAX_ITEMS = 8
-
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -26,11 +31,6 @@ MAX_ITEMS = 8
 # _content_to_text and _last_user_text are now sourced from shared utils
 
 
-def _clip(s: str, n: int) -> str:
-    s = (s or "").strip()
-    return s if len(s) <= n else (s[: n - 1] + "…")
-
-
 def _split_source(src: str) -> Tuple[str, str]:
     """'KB:foo' 또는 'WEB:https://…' -> ('KB','foo') 형태로 분리."""
     if not src or ":" not in src:
@@ -39,33 +39,115 @@ def _split_source(src: str) -> Tuple[str, str]:
     return (kind.strip().upper(), rest.strip())
 
 
-def _dedup_evidence(ev: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """source 기준 중복 제거(후행 항목으로 갱신)."""
-    seen = {}
-    for e in ev or []:
-        src = e.get("source") or (e.get("metadata") or {}).get("source") or ""
-        seen[src] = {**e, "source": src}
-    return list(seen.values())
+def _relevance(e: Dict[str, Any]) -> float:
+    return evidence_relevance(e, generate_cfg.unscored_score)
+
+
+def _line_parts(e: Dict[str, Any]) -> Tuple[str, str]:
+    """Return ``('- <TAG>:<display> :: <head> :: ', <snippet>)`` for one evidence item."""
+    src = e.get("source") or ""
+    kind, disp = _split_source(src)
+    kind = "KB" if kind == "KB" else ("WEB" if kind == "WEB" else (kind or "SRC"))
+    title = e.get("title") or (e.get("metadata") or {}).get("title") or ""
+    content = e.get("content") or e.get("text") or ""
+    # 제목이 있으면 표시, 없으면 display만
+    head = (title or "").strip() or disp
+    # 과도한 공백 제거
+    snippet = re.sub(r"\s+", " ", content).strip()
+    return f"- {kind}:{disp} :: {head} :: ", snippet
+
+
+@dataclass
+class PackStats:
+    """What :func:`pack_evidence` put into the prompt and what it cut."""
+
+    budget: int
+    tokens: int = 0  # evidence 블록에 쓴 토큰
+    items: int = 0  # 담은 항목 수
+    candidates: int = 0  # 중복 제거 후 후보 수
+    dropped: int = 0  # 예산/출처 제한으로 통째로 빠진 항목
+    truncated: int = 0  # 잘려서 들어간 항목
+    cut_tokens: int = 0  # 빠지거나 잘려서 버려진 토큰
+    exact: bool = True  # False 이면 토큰 수가 근사치
+
+
+def pack_evidence(
+    ev: List[Dict[str, Any]],
+    *,
+    tokenizer: Optional[Tokenizer] = None,
+    budget: Optional[int] = None,
+    presorted: bool = False,
+) -> Tuple[List[str], PackStats]:
+    """Select evidence lines by relevance until the token *budget* is filled.
+
+    관련도 내림차순(동점이면 입력 순서)으로 항목을 담되, 항목당 ``max_item_tokens`` 와
+    출처당 ``max_items_per_source`` 를 넘지 않는다. 예산이 모자라면 항목을 잘라 넣고,
+    ``min_item_tokens`` 보다 적게 남으면 건너뛴다. *presorted* 이면 (MMR 등으로 이미 정한) 입력 순서를 따른다.
+
+    Returns:
+        (evidence 줄 목록, :class:`PackStats`)
+    """
+    lines, stats, _ = _pack(ev, tokenizer=tokenizer, budget=budget, presorted=presorted)
+    return lines, stats
+
+
+def _pack(
+    ev: List[Dict[str, Any]],
+    *,
+    tokenizer: Optional[Tokenizer] = None,
+    budget: Optional[int] = None,
+    presorted: bool = False,
+) -> Tuple[List[str], PackStats, List[Dict[str, Any]]]:
+    """:func:`pack_evidence` that also returns the packed items (``content`` = 프롬프트에 담긴 본문)."""
+    tok = tokenizer or get_tokenizer(generate_cfg.tokenizer_model or llm_cfg.deployment)
+    stats = PackStats(budget=generate_cfg.evidence_token_budget if budget is None else budget, exact=tok.exact)
+    items = dedup_evidence(ev)
+    stats.candidates = len(items)
+    ordered = list(enumerate(items))
+    if not presorted:
+        ordered.sort(key=lambda pair: (-_relevance(pair[1]), pair[0]))
+
+    lines: List[str] = []
+    packed: List[Dict[str, Any]] = []
+    per_source: Counter = Counter()
+    remaining = stats.budget
+    for _, e in ordered:
+        prefix, snippet = _line_parts(e)
+        line = prefix + snippet
+        full = tok.count(line)
+        allowed = min(remaining, generate_cfg.max_item_tokens)
+        if per_source[e["source"]] >= generate_cfg.max_items_per_source or allowed < generate_cfg.min_item_tokens:
+            stats.dropped += 1
+            stats.cut_tokens += full
+            continue
+        if full > allowed:
+            # 말줄임표 한 토큰을 남기고 본문을 자른다.
+            room = allowed - tok.count(prefix) - 1
+            if room < generate_cfg.min_item_tokens:
+                stats.dropped += 1
+                stats.cut_tokens += full
+                continue
+            snippet = tok.truncate(snippet, room).rstrip() + "…"
+            line = prefix + snippet
+            stats.truncated += 1
+        used = tok.count(line)
+        stats.cut_tokens += max(0, full - used)
+        stats.tokens += used
+        stats.items += 1
+        remaining -= used
+        per_source[e["source"]] += 1
+        lines.append(line)
+        packed.append({**e, "content": snippet})
+    return lines, stats, packed
 
 
 def _format_evidence(ev: List[Dict[str, Any]]) -> str:
     """
-    모델이 읽기 쉬운 단문 목록으로 구성.
-    각 항목: '- <TAG> <display>: <snippet>'
+    모델이 읽기 쉬운 단문 목록으로 구성 (:func:`pack_evidence` 토큰 예산 적용).
+    각 항목: '- <TAG>:<display> :: <head> :: <snippet>'
     TAG는 'KB' 또는 'WEB'
     """
-    lines: List[str] = []
-    for e in _dedup_evidence(ev)[:MAX_ITEMS]:
-        src = e.get("source") or (e.get("metadata") or {}).get("source") or ""
-        kind, disp = _split_source(src)
-        kind = "KB" if kind == "KB" else ("WEB" if kind == "WEB" else (kind or "SRC"))
-        title = e.get("title") or (e.get("metadata") or {}).get("title") or ""
-        content = e.get("content") or e.get("text") or ""
-        # 제목이 있으면 표시, 없으면 display만
-        head = (title or "").strip() or disp
-        # 과도한 공백 제거
-        snippet = re.sub(r"\s+", " ", _clip(content, MAX_SNIPPET))
-        lines.append(f"- {kind}:{disp} :: {head} :: {snippet}")
+    lines, _ = pack_evidence(ev)
     return "\n".join(lines) if lines else "(none)"
 
 
@@ -73,34 +155,67 @@ def _format_evidence(ev: List[Dict[str, Any]]) -> str:
 # Node
 # ---------------------------------------------------------------------------
 
+def _generate_messages(state: GraphState) -> Tuple[List[Dict[str, str]], PackStats, List[Dict[str, Any]]]:
+    user_text = _last_user_text(state)
+    # MMR 재정렬 결과가 있으면 그 순서/부분집합을 쓴다 (None 이면 재정렬을 안 했거나 실패).
+    ranked = state.get("ranked_evidence")
+    evidence = ranked if ranked is not None else (state.get("evidence", []) or [])
+
+    lines, stats, packed = _pack(evidence, presorted=ranked is not None)
+    evidence_block = "\n".join(lines) if lines else "(none)"
+    if stats.dropped or stats.truncated:
+        logger.info(
+            "Evidence packing: %d/%d items, %d/%d tokens, dropped=%d truncated=%d cut_tokens=%d",
+            stats.items, stats.candidates, stats.tokens, stats.budget, stats.dropped, stats.truncated, stats.cut_tokens,
+        )
+
+    user_prompt = f"[QUESTION]\n{user_text}\n\n[EVIDENCE]\n{evidence_block}"
+    messages = [
+        {"role": "system", "content": SYS},
+        {"role": "user", "content": user_prompt},
+    ]
+    return messages, stats, packed
+
+
+def _fallback_answer(evidence: List[Dict[str, Any]]) -> str:
+    # 모델 호출 실패 시 최소한의 폴백 제공
+    if evidence:
+        # 증거 요약만 간단히 노출
+        return "죄송해요, 답변 생성 중 오류가 발생했습니다. 아래는 수집된 근거입니다:\n" + _format_evidence(evidence)
+    return "죄송해요, 현재는 근거 자료가 없어 확답을 드리기 어려워요."
+
+
 def generate(state: GraphState) -> Dict[str, Any]:
     """
     사용자 질문 + 증거 리스트를 기반으로 최종 답변 생성.
-    반환: {'answer': <str>, 'step': <int>}
+    증거는 토큰 예산 안에서 관련도 순으로 담는다(:func:`pack_evidence`).
+    반환: {'answer': <str>, 'evidence_packing': <PackStats dict>, 'packed_evidence': <프롬프트에 담은 항목>}
     """
-    user_text = _last_user_text(state)
-    evidence = state.get("evidence", []) or []
+    messages, stats, packed = _generate_messages(state)
+    try:
+        out = chat(messages, node="generate")
+        answer = out if isinstance(out, str) else str(out)
+    except Exception:
+        answer = _fallback_answer(state.get("evidence", []) or [])
 
-    evidence_block = _format_evidence(evidence)
+    return {
+        "answer": answer.strip(),
+        "evidence_packing": asdict(stats),
+        "packed_evidence": packed,
+    }
 
-    user_prompt = f"[QUESTION]\n{user_text}\n\n[EVIDENCE]\n{evidence_block}"
 
+async def agenerate(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`generate` (``ainvoke``)."""
+    messages, stats, packed = _generate_messages(state)
     try:
-        out = chat(
-            [
-                {"role": "system", "content": SYS},
-                {"role": "user", "content": user_prompt},
-            ]
-        )
+        out = await achat(messages, node="generate")
         answer = out if isinstance(out, str) else str(out)
     except Exception:
-        # 모델 호출 실패 시 최소한의 폴백 제공
-        if evidence:
-            # 증거 요약만 간단히 노출
-            answer = "죄송해요, 답변 생성 중 오류가 발생했습니다. 아래는 수집된 근거입니다:\n" + _format_evidence(evidence)
-        else:
-            answer = "죄송해요, 현재는 근거 자료가 없어 확답을 드리기 어려워요."
+        answer = _fallback_answer(state.get("evidence", []) or [])
 
     return {
         "answer": answer.strip(),
+        "evidence_packing": asdict(stats),
+        "packed_evidence": packed,
     }
@@ -1,13 +1,22 @@
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Union, cast
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 from langchain_core.documents import Document
 from pydantic import BaseModel, Field
 
-from agent_v6.app.config import flags
+from agent_v6.app.config import flags, grader_cfg, near_dup_cfg, retry_cfg
+from agent_v6.app.graph.nodes.retrieve_kb import SPECULATIVE_KEY, SpeculativeResult, acollect_speculative, collect_speculative
 from agent_v6.app.graph.state import GraphState
-from agent_v6.app.models import get_llm
+from agent_v6.app.models import astructured_call, get_llm, structured_call
+from agent_v6.app.retrievers.aisearch_store import RELEVANCE_SCORE_KEY
+from agent_v6.app.retrievers.near_dup import near_dup_filter
+from agent_v6.app.utils.docs import doc_key
 from agent_v6.app.utils.messages import last_user_text as _last_user_text
 
 # ---------------------------------------------------------------------------
@@ -18,6 +27,12 @@ logger = logging.getLogger(__name__)
 
 REL_SYS = "You judge if candidate passage is relevant. Return STRICT JSON with key 'relevant'(true/false)."
 
+LISTWISE_SYS = (
+    "You judge which candidate passages are relevant to the question. Each candidate has an integer 'id'. "
+    "Return STRICT JSON with key 'verdicts': an array with one object per candidate id, each having "
+    "'id' (int), 'relevant' (true/false) and optionally 'score' (0.0-1.0 relevance confidence)."
+)
+
 
 # ---------------------------------------------------------------------------
 # Pydantic structured output schema ----------------------------------------
@@ -30,63 +45,545 @@ class _RelResult(BaseModel):
     relevant: bool = Field(default=True, description="whether evidence is relevant")
 
 
+class _ListwiseVerdict(BaseModel):
+    """Relevance verdict for one candidate in a listwise request."""
+
+    id: int = Field(description="candidate id as given in the prompt")
+    relevant: bool = Field(default=True, description="whether evidence is relevant")
+    score: Optional[float] = Field(default=None, description="optional relevance confidence in [0, 1]")
+
+
+class _ListwiseResult(BaseModel):
+    """Validated schema for listwise relevance classification."""
+
+    verdicts: List[_ListwiseVerdict] = Field(default_factory=list)
+
+
 def _doc_to_dict(doc: Document) -> Dict[str, Any]:
     """Convert a langchain Document to a plain dict for downstream processing."""
     return {"content": getattr(doc, "page_content", ""), "metadata": getattr(doc, "metadata", {})}
 
 
+def _rel_messages(question: str, evidence: Dict[str, Any]) -> List[Dict[str, str]]:
+    payload: Dict[str, str] = {
+        "question": question,
+        "candidate": evidence.get("content", ""),
+    }
+    return [
+        {"role": "system", "content": REL_SYS},
+        {"role": "user", "content": json.dumps(payload, ensure_ascii=True)},
+    ]
+
+
+def _grade_one(llm: Any, question: str, evidence: Dict[str, Any]) -> bool:
+    """Return the pointwise relevance verdict for *evidence* (fail-open)."""
+    messages = _rel_messages(question, evidence)
+    try:
+        return structured_call("grader", _RelResult, messages, lambda: llm.invoke(messages)).relevant
+    except Exception as exc:
+        # Gracefully degrade if anything goes wrong – network, validation etc.
+        logger.exception("LLM filtering failed: %s", exc)
+        return True
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _pointwise_verdicts(question: str, evidences: List[Dict[str, Any]], deadline: Optional[float]) -> List[bool]:
+    """Grade *evidences* concurrently, one LLM call each, in input order.
+
+    최대 ``grader_cfg.max_concurrency`` 개의 요청을 동시에 보내므로 소요 시간은 호출 합계가
+    아니라 가장 느린 호출에 가까워진다. *deadline* 까지 끝나지 않은 후보는 *True* (fail-open).
+    """
+    verdicts = [True] * len(evidences)
+    if not evidences:
+        return verdicts
+
+    # Prepare LLM with structured output once per batch for efficiency.
+    llm = get_llm().with_structured_output(_RelResult)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(grader_cfg.max_concurrency, len(evidences))), thread_name_prefix="grader")
+    try:
+        futures = {pool.submit(_grade_one, llm, question, evidence): i for i, evidence in enumerate(evidences)}
+        done, not_done = wait(futures, timeout=_remaining(deadline))
+        for fut in done:
+            verdicts[futures[fut]] = fut.result()
+        if not_done:
+            logger.warning("Grader timed out; keeping %d/%d ungraded candidates", len(not_done), len(evidences))
+    finally:
+        # 늦은 응답을 기다리지 않는다. 이미 시작된 호출은 백그라운드에서 끝나고 버려진다.
+        pool.shutdown(wait=False, cancel_futures=True)
+    return verdicts
+
+
+def _pointwise_filter(question: str, evidences: List[Dict[str, Any]], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """One structured-output LLM call per candidate, run concurrently."""
+    verdicts = _pointwise_verdicts(question, evidences, deadline)
+    return [evidence for evidence, relevant in zip(evidences, verdicts) if relevant]
+
+
+def _listwise_messages(question: str, evidences: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    payload = {
+        "question": question,
+        "candidates": [
+            {"id": i, "content": (evidence.get("content") or "")[: grader_cfg.listwise_max_chars]}
+            for i, evidence in enumerate(evidences)
+        ],
+    }
+    return [
+        {"role": "system", "content": LISTWISE_SYS},
+        {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+    ]
+
+
+def _invoke_listwise(question: str, evidences: List[Dict[str, Any]]) -> _ListwiseResult:
+    llm = get_llm().with_structured_output(_ListwiseResult)
+    messages = _listwise_messages(question, evidences)
+    return structured_call("grader", _ListwiseResult, messages, lambda: llm.invoke(messages))
+
+
+def _listwise_verdicts(
+    question: str, evidences: List[Dict[str, Any]], deadline: Optional[float] = None
+) -> Dict[int, _ListwiseVerdict]:
+    """Grade all *evidences* in a single LLM call and return verdicts keyed by candidate id.
+
+    후보 ID 는 입력 순서의 인덱스이며, 모델이 돌려준 ID 중 범위를 벗어난 것은 무시한다.
+    호출이 실패하거나 *deadline* 을 넘기면 빈 dict 를 돌려주어 호출자가 개별 채점으로 대체하게 한다.
+    """
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grader-listwise")
+    try:
+        result = pool.submit(_invoke_listwise, question, evidences).result(timeout=_remaining(deadline))
+    except Exception as exc:
+        logger.exception("Listwise LLM filtering failed: %s", exc)
+        return {}
+    finally:
+        # 시간 초과된 호출은 기다리지 않는다 (스레드는 응답을 받으면 끝나고 결과는 버려진다).
+        pool.shutdown(wait=False)
+    return _index_verdicts(result, len(evidences))
+
+
+def _index_verdicts(result: _ListwiseResult, n: int) -> Dict[int, _ListwiseVerdict]:
+    return {v.id: v for v in result.verdicts if 0 <= v.id < n}
+
+
+def _apply_verdicts(evidences: List[Dict[str, Any]], verdicts: Dict[int, _ListwiseVerdict]) -> List[Dict[str, Any]]:
+    filtered: List[Dict[str, Any]] = []
+    for i, evidence in enumerate(evidences):
+        verdict = verdicts[i]
+        if not verdict.relevant:
+            continue
+        filtered.append(evidence if verdict.score is None else {**evidence, "grade_score": verdict.score})
+    return filtered
+
+
+def _deadline_passed(deadline: Optional[float], missing: List[int], total: int) -> bool:
+    """Return *True* (and log) when no time is left for the pointwise fallback.
+
+    listwise 호출이 시간 초과로 끝났다면 남은 시간이 0 이므로, 개별 호출을 N 번 더 보내지 않고
+    판정 못 한 후보를 그대로 유지한다(fail-open). 그래야 ``grader_cfg.timeout_s`` 상한이 지켜진다.
+    """
+    if deadline is None or _remaining(deadline):
+        return False
+    logger.warning("Grader deadline passed; keeping %d/%d ungraded candidates", len(missing), total)
+    return True
+
+
+def _listwise_filter(question: str, evidences: List[Dict[str, Any]], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """One LLM call for all candidates; per-item calls only for IDs the model left out."""
+    verdicts = _listwise_verdicts(question, evidences, deadline)
+    missing = [i for i in range(len(evidences)) if i not in verdicts]
+    if missing:
+        if _deadline_passed(deadline, missing, len(evidences)):
+            relevant = [True] * len(missing)
+        else:
+            logger.info("Listwise grader omitted %d/%d candidates; grading them individually", len(missing), len(evidences))
+            relevant = _pointwise_verdicts(question, [evidences[i] for i in missing], deadline)
+        for i, ok in zip(missing, relevant):
+            verdicts[i] = _ListwiseVerdict(id=i, relevant=ok)
+    return _apply_verdicts(evidences, verdicts)
+
+
+def _deadline() -> Optional[float]:
+    return time.monotonic() + grader_cfg.timeout_s if grader_cfg.timeout_s > 0 else None
+
+
 def _llm_filter(question: str, evidences: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Filter evidences using an LLM-based relevance classifier.
 
+    ``grader_cfg.mode`` 가 ``listwise`` 이면 후보 전체를 한 번에, ``pointwise`` 이면
+    후보마다 따로(동시에) 채점한다. ``grader_cfg.timeout_s`` 안에 판정되지 않은 후보는 유지된다.
+
     Args:
         question: 사용자 질문 문자열.
         evidences: 검색된 후보 문서 리스트.
 
     Returns:
-        relevance 판정 결과가 *True* 인 evidence 목록.
+        relevance 판정 결과가 *True* 인 evidence 목록 (입력 순서 유지).
     """
-    filtered: List[Dict[str, Any]] = []
-    # Prepare LLM with structured output once per batch for efficiency.
-    llm = get_llm().with_structured_output(_RelResult)
+    if not evidences:
+        return []
+    deadline = _deadline()
+    if grader_cfg.mode == "pointwise":
+        return _pointwise_filter(question, evidences, deadline)
+    return _listwise_filter(question, evidences, deadline)
+
+
+# ---------------------------------------------------------------------------
+# Score-band gate ------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class GateStats:
+    """Cumulative counters for the score-band gate in front of :func:`_llm_filter`."""
+
+    accepted: int = 0  # 점수 ≥ accept_score → LLM 없이 채택
+    rejected: int = 0  # 점수 < reject_score → LLM 없이 제외
+    graded: int = 0  # LLM 채점으로 넘어간 후보
+    llm_calls_saved: int = 0
+
+
+_gate_stats = GateStats()
+_gate_lock = threading.Lock()
+
+
+def gate_stats() -> GateStats:
+    """Return a snapshot of the gate counters."""
+    with _gate_lock:
+        return GateStats(**asdict(_gate_stats))
 
+
+def _relevance_score(evidence: Dict[str, Any]) -> Optional[float]:
+    score = (evidence.get("metadata") or {}).get(RELEVANCE_SCORE_KEY)
+    return float(score) if isinstance(score, (int, float)) else None
+
+
+def _split_by_score(evidences: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    """Split *evidences* into ``(accepted, ambiguous, rejected_count)`` by retrieval score."""
+    accepted: List[Dict[str, Any]] = []
+    ambiguous: List[Dict[str, Any]] = []
+    rejected = 0
     for evidence in evidences:
-        payload: Dict[str, str] = {
-            "question": question,
-            "candidate": evidence.get("content", ""),
-        }
-
-        try:
-            result = _RelResult.model_validate(
-                llm.invoke(
-                    [
-                        {"role": "system", "content": REL_SYS},
-                        {"role": "user", "content": json.dumps(payload, ensure_ascii=True)},
-                    ]
-                )
-            )
-            relevant: bool = result.relevant
-        except Exception as exc:
-            # Gracefully degrade if anything goes wrong – network, validation etc.
-            logger.exception("LLM filtering failed: %s", exc)
-            relevant = True
-
-        if relevant:
-            filtered.append(evidence)
-    return filtered
+        score = _relevance_score(evidence)
+        if score is None:
+            ambiguous.append(evidence)
+        elif score >= grader_cfg.accept_score:
+            accepted.append(evidence)
+        elif score < grader_cfg.reject_score:
+            rejected += 1
+        else:
+            ambiguous.append(evidence)
+    return accepted, ambiguous, rejected
 
 
-def evidence_grader(state: GraphState) -> Dict[str, Any]:
+def _gate(evidences: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return ``(accepted, to_grade)``; everything goes to the LLM unless ``grader_cfg.score_gate`` is on."""
+    if not grader_cfg.score_gate:
+        return [], evidences
+    accepted, ambiguous, rejected = _split_by_score(evidences)
+    _record_gate(len(evidences), len(accepted), len(ambiguous), rejected)
+    return accepted, ambiguous
+
+
+def _in_input_order(
+    evidences: List[Dict[str, Any]], accepted: List[Dict[str, Any]], graded: List[Dict[str, Any]], kept: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Interleave score-accepted and LLM-kept evidence back into the original order.
+
+    *kept* 는 *graded* 의 부분열이며, listwise 채점은 ``grade_score`` 를 붙인 사본을 돌려주므로
+    객체가 아니라 본문으로 대응시킨다.
+    """
+    accepted_ids = {id(e) for e in accepted}
+    graded_ids = {id(e) for e in graded}
+    out: List[Dict[str, Any]] = []
+    j = 0
+    for evidence in evidences:
+        if id(evidence) in accepted_ids:
+            out.append(evidence)
+        elif id(evidence) in graded_ids and j < len(kept) and _content_key(kept[j]) == _content_key(evidence):
+            out.append(kept[j])
+            j += 1
+    return out
+
+
+def _gated_filter(question: str, evidences: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep/drop clear-cut candidates by score and send only the middle band to :func:`_llm_filter`.
+
+    Returns:
+        점수로 채택되었거나 LLM 이 채택한 evidence (입력 순서 유지).
+    """
+    accepted, to_grade = _gate(evidences)
+    return _in_input_order(evidences, accepted, to_grade, _llm_filter(question, to_grade))
+
+
+def _record_gate(total: int, accepted: int, ambiguous: int, rejected: int) -> None:
+    skipped = accepted + rejected
+    if grader_cfg.mode == "pointwise":
+        saved = skipped
+    else:
+        # listwise 는 후보 수와 무관하게 1회 호출이므로, 모두 판정된 경우에만 호출이 절약된다.
+        saved = 1 if total and not ambiguous else 0
+    with _gate_lock:
+        _gate_stats.accepted += accepted
+        _gate_stats.rejected += rejected
+        _gate_stats.graded += ambiguous
+        _gate_stats.llm_calls_saved += saved
+    if skipped:
+        logger.info("Score gate: accepted=%d rejected=%d sent_to_llm=%d llm_calls_saved=%d", accepted, rejected, ambiguous, saved)
+
+
+@dataclass
+class SpeculationStats:
+    """Cumulative counters for speculative KB hits (raw-question search) at the grade step."""
+
+    runs: int = 0  # 추측 검색 결과를 합친 grade 실행 수
+    hits: int = 0  # 추측 검색 결과 문서 수
+    duplicates: int = 0  # 재작성 쿼리 검색에도 나와 버린 문서
+    added: int = 0  # 추측 검색으로만 찾은 문서 (채점 후보로 추가)
+    survived: int = 0  # 그중 채점을 통과해 evidence 에 남은 문서
+    overlap_s: float = 0.0  # 검색이 router → rewrite → kb/ddg 와 겹쳐 실행된 시간 합계
+    waited_s: float = 0.0  # grade 가 추측 검색 결과를 기다린 시간 합계
+
+
+_spec_stats = SpeculationStats()
+
+
+def speculation_stats() -> SpeculationStats:
+    """Return a snapshot of the speculative-retrieval counters."""
+    with _gate_lock:
+        return SpeculationStats(**asdict(_spec_stats))
+
+
+def _content_key(doc: Union[Document, Dict[str, Any]]) -> str:
+    if isinstance(doc, Document):
+        return doc.page_content
+    return str(doc.get("content") or doc.get("text") or "")
+
+
+def _merge_speculative(kb_docs: List[Any], spec_docs: List[Any]) -> Tuple[List[Any], int]:
+    """Append speculative hits not already in *kb_docs*. Returns ``(merged, duplicates)``."""
+    seen = {_content_key(d) for d in kb_docs}
+    added = [d for d in spec_docs if _content_key(d) not in seen]
+    return kb_docs + added, len(spec_docs) - len(added)
+
+
+def _is_speculative(evidence: Dict[str, Any]) -> bool:
+    return bool((evidence.get("metadata") or {}).get(SPECULATIVE_KEY))
+
+
+def _record_speculation(spec: SpeculativeResult, duplicates: int, kept: List[Dict[str, Any]]) -> None:
+    survived = sum(1 for e in kept if _is_speculative(e))
+    with _gate_lock:
+        _spec_stats.runs += 1
+        _spec_stats.hits += len(spec.docs)
+        _spec_stats.duplicates += duplicates
+        _spec_stats.added += len(spec.docs) - duplicates
+        _spec_stats.survived += survived
+        _spec_stats.overlap_s += spec.overlap_s
+        _spec_stats.waited_s += spec.waited_s
+    logger.info(
+        "Speculative KB: hits=%d duplicates=%d survived=%d overlap=%.3fs waited=%.3fs",
+        len(spec.docs),
+        duplicates,
+        survived,
+        spec.overlap_s,
+        spec.waited_s,
+    )
+
+
+@dataclass
+class NearDupStats:
+    """Cumulative counters for the near-duplicate filter in front of the grader."""
+
+    runs: int = 0
+    candidates: int = 0
+    removed: int = 0  # 군집 대표가 아니어서 채점 전에 제거된 후보
+
+
+_near_dup_stats = NearDupStats()
+
+
+def near_dup_stats() -> NearDupStats:
+    """Return a snapshot of the near-duplicate counters."""
+    with _gate_lock:
+        return NearDupStats(**asdict(_near_dup_stats))
+
+
+def _drop_near_duplicates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep the best retrieval-scored candidate of each near-duplicate cluster (KB + web)."""
+    if not near_dup_cfg.enabled or len(candidates) < 2:
+        return candidates
+    kept, removed = near_dup_filter(
+        candidates,
+        _content_key,
+        lambda e: _relevance_score(e) or 0.0,
+        threshold=near_dup_cfg.threshold,
+        num_perm=near_dup_cfg.num_perm,
+        shingle=near_dup_cfg.shingle,
+    )
+    with _gate_lock:
+        _near_dup_stats.runs += 1
+        _near_dup_stats.candidates += len(candidates)
+        _near_dup_stats.removed += removed
+    if removed:
+        logger.info("Near-duplicate filter removed %d/%d candidates", removed, len(candidates))
+    return kept
+
+
+def _candidates(state: GraphState, spec: Optional[SpeculativeResult] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Return ``(candidates, speculative_duplicates)``.
+
+    *spec* (사용자 원문 추측 검색 결과)는 재작성 쿼리 KB 결과 뒤에, 내용이 겹치지 않는 것만 붙는다.
+    KB·웹 후보를 합친 뒤 근사 중복은 군집마다 검색 점수가 가장 높은 하나만 남긴다.
+    """
     kb_raw = state.get("kb_docs", []) or []
     kb_docs: List[Union[Document, Dict[str, Any]]] = cast(List[Union[Document, Dict[str, Any]]], kb_raw)
+    kb_docs, duplicates = _merge_speculative(kb_docs, spec.docs if spec is not None else [])
 
     web_raw = state.get("web_docs", []) or []
     web_docs: List[Union[Document, Dict[str, Any]]] = cast(List[Union[Document, Dict[str, Any]]], web_raw)
 
     docs = kb_docs + web_docs
     # Convert any Document objects to dicts for uniformity.
-    ev: List[Dict[str, Any]] = [_doc_to_dict(d) if isinstance(d, Document) else d for d in docs]
+    candidates = [_doc_to_dict(d) if isinstance(d, Document) else d for d in docs]
+    return _drop_near_duplicates(candidates), duplicates
+
+
+def _ungraded(state: GraphState, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop candidates graded on an earlier pass (``retry_cfg.incremental``).
+
+    이전 판정에서 채택된 문서는 이미 ``evidence`` 에 있으므로, 새 후보만 돌려준다.
+    """
+    if not retry_cfg.incremental:
+        return candidates
+    graded = state.get("graded") or {}
+    fresh: List[Dict[str, Any]] = []
+    seen = set()
+    for evidence in candidates:
+        key = doc_key(evidence)
+        if key in graded or key in seen:
+            continue
+        seen.add(key)
+        fresh.append(evidence)
+    if graded:
+        logger.info("Incremental grade: reusing %d verdicts, grading %d new candidates", len(candidates) - len(fresh), len(fresh))
+    return fresh
+
+
+def _grade_updates(
+    state: GraphState,
+    candidates: List[Dict[str, Any]],
+    kept: List[Dict[str, Any]],
+    duplicates: int,
+    spec: Optional[SpeculativeResult] = None,
+) -> Dict[str, Any]:
+    updates: Dict[str, Any] = {"evidence": kept}
+    if retry_cfg.incremental:
+        kept_keys = {doc_key(e) for e in kept}
+        updates["graded"] = {**(state.get("graded") or {}), **{doc_key(e): doc_key(e) in kept_keys for e in candidates}}
+    if spec is not None:
+        _record_speculation(spec, duplicates, kept)
+        # 재시도 루프에서 다시 합치지 않도록 소비한다.
+        updates["spec_kb_ticket"] = None
+    return updates
+
+
+def evidence_grader(state: GraphState) -> Dict[str, Any]:
+    spec = collect_speculative(state)
+    candidates, duplicates = _candidates(state, spec)
+    ev = _ungraded(state, candidates)
+    user_text = _last_user_text(state)
+    kept = _gated_filter(user_text, ev) if flags.use_llm_grader else ev
+
+    return _grade_updates(state, ev, kept, duplicates, spec)
+
+
+# ---------------------------------------------------------------------------
+# Async path -----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+
+async def _agrade_one(llm: Any, question: str, evidence: Dict[str, Any]) -> bool:
+    """Async :func:`_grade_one` (fail-open)."""
+    messages = _rel_messages(question, evidence)
+    try:
+        return (await astructured_call("grader", _RelResult, messages, lambda: llm.ainvoke(messages))).relevant
+    except Exception as exc:
+        logger.exception("LLM filtering failed: %s", exc)
+        return True
+
+
+async def _apointwise_verdicts(question: str, evidences: List[Dict[str, Any]], deadline: Optional[float]) -> List[bool]:
+    """Async :func:`_pointwise_verdicts`: a semaphore bounds in-flight calls, late ones are cancelled."""
+    verdicts = [True] * len(evidences)
+    if not evidences:
+        return verdicts
+
+    llm = get_llm().with_structured_output(_RelResult)
+    sem = asyncio.Semaphore(max(1, grader_cfg.max_concurrency))
+
+    async def _bounded(evidence: Dict[str, Any]) -> bool:
+        async with sem:
+            return await _agrade_one(llm, question, evidence)
+
+    tasks = {asyncio.ensure_future(_bounded(evidence)): i for i, evidence in enumerate(evidences)}
+    done, pending = await asyncio.wait(tasks, timeout=_remaining(deadline))
+    for task in done:
+        verdicts[tasks[task]] = task.result()
+    if pending:
+        logger.warning("Grader timed out; keeping %d/%d ungraded candidates", len(pending), len(evidences))
+        for task in pending:
+            task.cancel()
+    return verdicts
+
+
+async def _alistwise_verdicts(
+    question: str, evidences: List[Dict[str, Any]], deadline: Optional[float] = None
+) -> Dict[int, _ListwiseVerdict]:
+    """Async :func:`_listwise_verdicts`."""
+    llm = get_llm().with_structured_output(_ListwiseResult)
+    messages = _listwise_messages(question, evidences)
+    try:
+        result = await asyncio.wait_for(
+            astructured_call("grader", _ListwiseResult, messages, lambda: llm.ainvoke(messages)), timeout=_remaining(deadline)
+        )
+    except Exception as exc:
+        logger.exception("Listwise LLM filtering failed: %s", exc)
+        return {}
+    return _index_verdicts(result, len(evidences))
+
+
+async def _allm_filter(question: str, evidences: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Async :func:`_llm_filter` with the same modes, ordering and timeout semantics."""
+    if not evidences:
+        return []
+    deadline = _deadline()
+    if grader_cfg.mode == "pointwise":
+        relevant = await _apointwise_verdicts(question, evidences, deadline)
+        return [evidence for evidence, ok in zip(evidences, relevant) if ok]
+
+    verdicts = await _alistwise_verdicts(question, evidences, deadline)
+    missing = [i for i in range(len(evidences)) if i not in verdicts]
+    if missing:
+        if _deadline_passed(deadline, missing, len(evidences)):
+            relevant = [True] * len(missing)
+        else:
+            logger.info("Listwise grader omitted %d/%d candidates; grading them individually", len(missing), len(evidences))
+            relevant = await _apointwise_verdicts(question, [evidences[i] for i in missing], deadline)
+        for i, ok in zip(missing, relevant):
+            verdicts[i] = _ListwiseVerdict(id=i, relevant=ok)
+    return _apply_verdicts(evidences, verdicts)
+
+
+async def aevidence_grader(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`evidence_grader`."""
+    spec = await acollect_speculative(state)
+    candidates, duplicates = _candidates(state, spec)
+    ev = _ungraded(state, candidates)
     user_text = _last_user_text(state)
+    kept = ev
     if flags.use_llm_grader:
-        ev = _llm_filter(user_text, ev)
+        accepted, to_grade = _gate(ev)
+        kept = _in_input_order(ev, accepted, to_grade, await _allm_filter(user_text, to_grade))
 
-    return {"evidence": ev}
+    return _grade_updates(state, ev, kept, duplicates, spec)
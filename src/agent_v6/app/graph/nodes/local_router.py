@@ -0,0 +1,126 @@
+"""Rule-based intent / ``need_web`` classifier used in front of the LLM router.
+
+키워드·날짜 패턴만으로 대부분의 턴을 네트워크 호출 없이 분류한다.
+규칙마다 고정 신뢰도를 주고, :func:`agent_v6.app.graph.nodes.router.planner_router` 는 최종 신뢰도가
+``router_cfg.local_min_confidence`` 미만일 때만 LLM 을 호출한다.
+
+- 웹 단서(명시적 요청, 최신성 표현, 최근 연도)가 있으면 최종 신뢰도는 intent 와 need_web 판정 중 낮은 값이다.
+- 단서가 없으면 need_web=False 로 두고 intent 신뢰도만 본다. Chainlit 의 웹 검색 스위치는 기본으로 켜져 있으므로,
+  단서 없는 턴까지 LLM 에 넘기면 대부분의 턴이 네트워크 호출을 하게 된다. 이 판정 자체의 약한 신뢰도는
+  ``web_confidence`` 에 그대로 남긴다.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, Pattern, Tuple
+
+__all__ = ["LocalRoute", "local_route"]
+
+# 명시적인 웹 검색 요청
+_WEB_REQUEST = re.compile(r"검색해|웹에서|인터넷에서|구글|네이버|search the web|google|look up online", re.I)
+# 최신성이 필요한 질문 (시세, 뉴스, 상대 날짜 등)
+_RECENCY = re.compile(
+    r"오늘|어제|내일|이번\s?(주|달|년)|올해|최신|최근|요즘|현재|지금|실시간|뉴스|속보|주가|환율|날씨|시세"
+    r"|\b(today|yesterday|tomorrow|latest|recent(ly)?|current(ly)?|right now|news|breaking|this (week|month|year)"
+    r"|stock price|exchange rate|weather)\b",
+    re.I,
+)
+_YEAR = re.compile(r"(?<!\d)(20\d{2})(?!\d)")
+
+# 작업 지시 (요약·번역·작성 등)
+_TASK = re.compile(
+    r"(요약|번역|작성|정리|변환|수정|생성)\s?해|만들어|짜\s?줘|써\s?줘|고쳐"
+    r"|^\s*(please\s+)?(write|summari[sz]e|translate|draft|create|generate|convert|fix|rewrite)\b",
+    re.I,
+)
+# 이전 답변을 가리키는 후속 질문
+_FOLLOWUP = re.compile(
+    r"^\s*(그럼|그러면|그래서|그건|그거|그것|그게|이건|이거|위\s?(의|에서)|방금|아까|또\b)"
+    r"|더\s?자세히|다시\s?설명|예를\s?들어"
+    r"|^\s*(and|also|then|what about|how about)\b|\bmore detail",
+    re.I,
+)
+# 일반 질문 형태
+_QUESTION = re.compile(
+    r"\?|무엇|뭐|뭔가요|어떻게|어떤|왜|언제|어디|누구|얼마|인가요|일까|나요|습니까|알려\s?줘|설명해"
+    r"|^\s*(what|how|why|when|where|who|which|is|are|can|does|do|explain)\b",
+    re.I,
+)
+
+# 규칙별 신뢰도
+_CONF_WEB_REQUEST = 0.95
+_CONF_RECENCY = 0.9
+_CONF_NO_WEB_CUE = 0.6
+_CONF_STRONG = 0.85
+_CONF_CUE = 0.8
+_CONF_CONFLICT = 0.5
+_CONF_UNKNOWN = 0.5
+
+
+@dataclass(frozen=True)
+class LocalRoute:
+    """Local routing decision with a confidence in ``[0, 1]``."""
+
+    intent: str
+    need_web: bool
+    confidence: float  # 웹 단서가 있으면 min(intent_confidence, web_confidence), 없으면 intent_confidence
+    reason: str
+    intent_confidence: float = 0.0
+    web_confidence: float = 0.0
+
+
+def _recent_year(text: str, today: date) -> Optional[str]:
+    for match in _YEAR.finditer(text):
+        if int(match.group(1)) >= today.year - 1:
+            return match.group(1)
+    return None
+
+
+def _need_web(text: str, today: date) -> Tuple[bool, float, str]:
+    if _WEB_REQUEST.search(text):
+        return True, _CONF_WEB_REQUEST, "web-request"
+    if _RECENCY.search(text):
+        return True, _CONF_RECENCY, "recency"
+    year = _recent_year(text, today)
+    if year:
+        return True, _CONF_RECENCY, f"year:{year}"
+    return False, _CONF_NO_WEB_CUE, "no-web-cue"
+
+
+def _intent(text: str) -> Tuple[str, float, str]:
+    hits = [name for name, pat in (("task", _TASK), ("followup", _FOLLOWUP)) if _match(pat, text)]
+    if len(hits) > 1:
+        return hits[0], _CONF_CONFLICT, "conflict:" + "+".join(hits)
+    if hits:
+        return hits[0], _CONF_STRONG if hits[0] == "task" else _CONF_CUE, hits[0]
+    if len(re.sub(r"\W", "", text)) < 3:
+        return "ambiguous", _CONF_CUE, "too-short"
+    if _match(_QUESTION, text):
+        return "new_topic", _CONF_CUE, "question"
+    return "new_topic", _CONF_UNKNOWN, "default"
+
+
+def _match(pattern: Pattern[str], text: str) -> bool:
+    return pattern.search(text) is not None
+
+
+def local_route(text: str, *, today: Optional[date] = None) -> LocalRoute:
+    """Classify *text* without any network call.
+
+    Args:
+        text: 마지막 사용자 메시지.
+        today: 연도 판정 기준일 (테스트용). 기본값은 오늘.
+    """
+    text = (text or "").strip()
+    intent, intent_conf, intent_reason = _intent(text)
+    need_web, web_conf, web_reason = _need_web(text, today or date.today())
+    return LocalRoute(
+        intent=intent,
+        need_web=need_web,
+        confidence=min(intent_conf, web_conf) if need_web else intent_conf,
+        reason=f"{intent_reason},{web_reason}",
+        intent_confidence=intent_conf,
+        web_confidence=web_conf,
+    )
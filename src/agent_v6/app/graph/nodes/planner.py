@@ -0,0 +1,84 @@
+"""Fused router + rewrite node.
+
+``planner_router`` 와 ``query_rewrite`` 는 같은 사용자 문장을 두 번의 LLM 호출로 연달아 보낸다.
+``planner`` 는 intent, ``need_web``, 검색 쿼리를 한 번의 구조화 호출로 함께 받아
+요청 앞단과 faithfulness 재시도마다 LLM 왕복을 한 번씩 줄인다.
+``router_cfg.fused_planner`` 가 켜져 있으면 :func:`agent_v6.app.graph.build_graph.build_graph` 가 이 노드를 쓴다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Literal
+
+from pydantic import BaseModel, Field
+
+from agent_v6.app.config import flags
+from agent_v6.app.graph.nodes.rewrite import _query_updates, _sanitize_queries, _unfaithful_hint
+from agent_v6.app.graph.nodes.router import RouterResult, _fallback, _merge_user_pref
+from agent_v6.app.graph.state import GraphState
+from agent_v6.app.models import astructured_call, get_llm, structured_call
+from agent_v6.app.utils.messages import last_user_text as _last_user_text
+
+__all__ = ["PlannerResult", "aplanner", "planner"]
+
+PLANNER_SYS = (
+    "You plan retrieval for the user's last question. Return STRICT JSON with keys "
+    "intent (one of 'followup','new_topic','ambiguous','task'), need_web (true/false) and "
+    "queries (a JSON array of exactly 2 short search-friendly rewrites of the question). No explanations."
+)
+
+
+class PlannerResult(BaseModel):
+    """Validated schema for the fused router + rewrite output."""
+
+    intent: Literal["followup", "new_topic", "ambiguous", "task"] = Field(default="new_topic", description="intent")
+    need_web: bool = Field(default=False, description="need to search web")
+    queries: List[str] = Field(default_factory=list, description="2 short search-friendly queries")
+
+
+def _planner_messages(state: GraphState) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": PLANNER_SYS},
+        {"role": "user", "content": _last_user_text(state) + _unfaithful_hint(state)},
+    ]
+
+
+def _plan_updates(state: GraphState, result: PlannerResult | None) -> Dict[str, Any]:
+    """Merge *result* (or the fallback when *None*) into state updates."""
+    user_text = _last_user_text(state)
+    if result is None or not flags.use_llm_router:
+        route = _fallback(state)
+    else:
+        route = _merge_user_pref(state, RouterResult(intent=result.intent, need_web=result.need_web))
+    candidates = list(result.queries) if result is not None else []
+    return {
+        "intent": route.intent,
+        "need_web": route.need_web,
+        **_query_updates(state, _sanitize_queries(candidates, fallback=user_text, k=2, max_len=256)),
+        "step": int(state.get("step", 0)) + 1,
+    }
+
+
+def planner(state: GraphState) -> Dict[str, Any]:
+    """Return ``intent``, ``need_web``, ``queries`` and the incremented ``step`` in one LLM call.
+
+    LLM 호출이 실패하면 state 의 intent/need_web 과 사용자 원문 쿼리로 대신한다(fail-open).
+    ``flags.use_llm_router`` 가 꺼져 있으면 쿼리만 LLM 결과를 쓴다.
+    """
+    messages = _planner_messages(state)
+    try:
+        llm = get_llm().with_structured_output(PlannerResult)
+        result: PlannerResult | None = structured_call("planner", PlannerResult, messages, lambda: llm.invoke(messages))
+    except Exception:
+        result = None
+    return _plan_updates(state, result)
+
+
+async def aplanner(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`planner` (``ainvoke``)."""
+    messages = _planner_messages(state)
+    try:
+        llm = get_llm().with_structured_output(PlannerResult)
+        result: PlannerResult | None = await astructured_call("planner", PlannerResult, messages, lambda: llm.ainvoke(messages))
+    except Exception:
+        result = None
+    return _plan_updates(state, result)
@@ -0,0 +1,100 @@
+"""MMR diversity reranking between ``grade`` and ``generate``.
+
+채점을 통과한 evidence 는 검색 순서 그대로라 같은 ``ground_docs`` 파일의 비슷한 청크가
+앞자리를 차지하기 쉽다. 여기서는 관련도와 이미 고른 항목과의 최대 코사인 유사도를
+λ 로 섞은 MMR 점수로 ``rerank_cfg.top_n`` 개를 고른다.
+
+- 관련도: ``generate`` 와 같은 기준(:func:`agent_v6.app.utils.docs.evidence_relevance`, ``grade_score`` → ``relevance_score`` → ``unscored_score``).
+- 문서 벡터: 검색 시점에 기억해 둔 것(:data:`agent_v6.app.retrievers.doc_vectors.doc_vectors`)만 쓴다.
+  로컬 인덱스 행, 또는 ``RERANK_FETCH_VECTORS`` 일 때 Azure AI Search 의 ``content_vector`` 가 여기에 들어간다.
+  임베딩을 새로 호출하지 않으며, 벡터가 없는 항목은 다른 항목과의 유사도를 0 으로 본다.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from agent_v6.app.config import generate_cfg, rerank_cfg
+from agent_v6.app.graph.state import GraphState
+from agent_v6.app.retrievers.doc_vectors import doc_vectors
+from agent_v6.app.utils.docs import dedup_evidence, evidence_relevance
+
+__all__ = ["ammr_rerank", "mmr_order", "mmr_rerank"]
+
+logger = logging.getLogger(__name__)
+
+
+def mmr_order(relevance: np.ndarray, vectors: np.ndarray, top_n: int, mmr_lambda: float) -> List[int]:
+    """Return up to *top_n* indices in MMR order.
+
+    Args:
+        relevance: (n,) 관련도.
+        vectors: (n, dim) L2 정규화된 벡터. 벡터가 없는 행은 0 벡터.
+        top_n: 고를 개수.
+        mmr_lambda: 관련도 가중치 (1 - λ 가 중복 패널티 가중치).
+    """
+    n = len(relevance)
+    if n == 0 or top_n <= 0:
+        return []
+    sims = vectors @ vectors.T  # (n, n), 한 번만 계산
+    max_sim = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    order: List[int] = []
+    for _ in range(min(top_n, n)):
+        scores = mmr_lambda * relevance - (1.0 - mmr_lambda) * max_sim
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        order.append(best)
+        available[best] = False
+        max_sim = np.maximum(max_sim, sims[best])
+    return order
+
+
+def _vector_matrix(evidence: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+    vectors = [doc_vectors.get(e) for e in evidence]
+    known = [v for v in vectors if v is not None]
+    if not known:
+        return None
+    dim = known[0].shape[0]
+    mat = np.zeros((len(evidence), dim), dtype=np.float32)
+    for i, vec in enumerate(vectors):
+        if vec is not None and vec.shape[0] == dim:
+            mat[i] = vec
+    return mat
+
+
+def _rerank(evidence: List[Dict[str, Any]]) -> Dict[str, Any]:
+    items = dedup_evidence(evidence)
+    relevance = np.asarray([evidence_relevance(e, generate_cfg.unscored_score) for e in items], dtype=np.float32)
+    vectors = _vector_matrix(items)
+    if vectors is None:
+        # 벡터가 하나도 없으면 MMR 은 관련도 정렬과 같다.
+        vectors = np.zeros((len(items), 1), dtype=np.float32)
+    order = mmr_order(relevance, vectors, rerank_cfg.top_n, rerank_cfg.mmr_lambda)
+    with_vectors = int(np.count_nonzero(vectors.any(axis=1)))
+    logger.info("MMR rerank: kept %d/%d evidence items (%d with cached vectors)", len(order), len(items), with_vectors)
+    return {"ranked_evidence": [items[i] for i in order]}
+
+
+def mmr_rerank(state: GraphState) -> Dict[str, Any]:
+    """Select a relevant, non-redundant subset of ``evidence`` as ``ranked_evidence``.
+
+    ``evidence`` 는 병합 reducer 라 순서를 바꾸거나 줄일 수 없으므로, 결과는 별도 키에 담고
+    ``generate`` 가 이를 그대로(재정렬 없이) 사용한다.
+    """
+    evidence = state.get("evidence", []) or []
+    if not evidence:
+        return {"ranked_evidence": []}
+    try:
+        return _rerank(evidence)
+    except Exception:
+        # 재정렬은 최적화일 뿐이므로 실패하면 generate 가 전체 evidence 를 쓰게 한다.
+        logger.exception("MMR rerank failed")
+        return {"ranked_evidence": None}
+
+
+async def ammr_rerank(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`mmr_rerank` (CPU only; no awaits needed)."""
+    return mmr_rerank(state)
@@ -1,33 +1,209 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
 
 from langchain_core.documents import Document
 
+from agent_v6.app.config import retriever_cfg
 from agent_v6.app.graph.state import GraphState
-from agent_v6.app.retrievers.aisearch_store import search_similar
+from agent_v6.app.retrievers.kb import asearch_similar, asearch_similar_many, search_similar, search_similar_many
+from agent_v6.app.utils.messages import last_user_text as _last_user_text
 
+logger = logging.getLogger(__name__)
 
-def retrieve_kb(state: GraphState) -> Dict[str, Any]:
-    # Safely extract the list of user queries, if available.
-    queries: List[str] = state.get("queries", []) or []
-    if not queries:
-        # No queries yet – simply return the state with an empty ``kb_docs``.
-        return {**state, "kb_docs": []}
+# 추측(speculative) 검색으로 얻은 문서임을 표시하는 metadata 키
+SPECULATIVE_KEY = "speculative"
 
-    # Perform similarity search against the KB for **all** queries.
-    kb_docs: List[Document] = []
-    for query in queries:
-        kb_docs.extend(search_similar(query, k=5))
 
+def _dedup(hits: List[List[Document]]) -> List[Document]:
     # Optionally, remove duplicates while preserving order based on content.
     seen = set()
     deduped_docs: List[Document] = []
-    for doc in kb_docs:
+    for doc in (doc for per_query in hits for doc in per_query):
         content = doc.page_content
         if content not in seen:
             seen.add(content)
             deduped_docs.append(doc)
+    return deduped_docs
 
+
+def retrieve_kb(state: GraphState) -> Dict[str, Any]:
+    # Safely extract the list of user queries, if available.
+    queries: List[str] = state.get("queries", []) or []
+    if not queries:
+        # No queries yet – nothing to add to ``kb_docs``.
+        # (Returning ``{**state, ...}`` would re-append reducer keys such as ``evidence``.)
+        return {"kb_docs": []}
+
+    # Perform similarity search against the KB for **all** queries
+    # (one batched embedding call, concurrent vector searches).
     # Return a **new** state dict; avoid mutating the original state instance.
-    return {"kb_docs": deduped_docs}
+    return {"kb_docs": _dedup(search_similar_many(queries, k=5))}
+
+
+async def aretrieve_kb(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`retrieve_kb` (async embeddings + async vector search)."""
+    queries: List[str] = state.get("queries", []) or []
+    if not queries:
+        return {"kb_docs": []}
+
+    return {"kb_docs": _dedup(await asearch_similar_many(queries, k=5))}
+
+
+# ---------------------------------------------------------------------------
+# Speculative retrieval on the raw question ---------------------------------
+# ---------------------------------------------------------------------------
+#
+# LangGraph 는 superstep 단위로 실행되어 같은 단계의 노드가 모두 끝나야 다음 단계로 넘어간다.
+# 추측 검색을 노드 안에서 끝까지 기다리면 router 와 같은 단계를 붙잡아 rewrite 가 늦어지고,
+# rewrite 와는 전혀 겹치지 않는다. 그래서 ``kb_spec`` 노드는 검색을 백그라운드로 시작하고
+# 티켓(``spec_kb_ticket``)만 state 에 남긴 뒤 바로 끝난다. 검색은 router → rewrite → kb/ddg 동안
+# 계속되고, 합류 지점인 grade 가 :func:`collect_speculative` 로 결과를 받는다.
+
+
+@dataclass
+class SpeculativeResult:
+    """Raw-question KB hits handed to the grader, with how well the search overlapped the pipeline."""
+
+    docs: List[Document]
+    overlap_s: float  # grade 도착 전까지 다른 노드와 겹쳐 실행된 검색 시간
+    waited_s: float  # grade 가 결과를 기다린 시간 (완전히 겹쳤으면 0)
+
+
+@dataclass
+class _Prefetch:
+    future: Union["Future[List[Document]]", "asyncio.Future[List[Document]]"]
+    started: float
+    finished: Optional[float] = None
+
+
+# 진행 중인 추측 검색 (티켓 → 작업). grade 가 꺼내 가며, 오래된 것부터 최대 개수를 넘으면 버린다.
+_MAX_PENDING = 64
+_pending: "OrderedDict[str, _Prefetch]" = OrderedDict()
+_pending_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="kb-spec")
+
+
+def _mark_speculative(docs: List[Document]) -> List[Document]:
+    return [Document(page_content=d.page_content, metadata={**(d.metadata or {}), SPECULATIVE_KEY: True}) for d in docs]
+
+
+def _register(future: Union["Future[List[Document]]", "asyncio.Future[List[Document]]"]) -> str:
+    prefetch = _Prefetch(future, time.monotonic())
+
+    def _done(_: Any) -> None:
+        prefetch.finished = time.monotonic()
+
+    future.add_done_callback(_done)
+    ticket = uuid.uuid4().hex
+    with _pending_lock:
+        _pending[ticket] = prefetch
+        while len(_pending) > _MAX_PENDING:
+            _, stale = _pending.popitem(last=False)
+            stale.future.cancel()
+    return ticket
+
+
+def _take(state: GraphState) -> Optional[_Prefetch]:
+    ticket = state.get("spec_kb_ticket")
+    if not ticket:
+        return None
+    with _pending_lock:
+        return _pending.pop(ticket, None)
+
+
+def _result(prefetch: _Prefetch, arrived: float, docs: List[Document]) -> SpeculativeResult:
+    finished = prefetch.finished if prefetch.finished is not None else time.monotonic()
+    return SpeculativeResult(
+        docs=docs,
+        overlap_s=max(0.0, min(finished, arrived) - prefetch.started),
+        waited_s=max(0.0, finished - arrived),
+    )
+
+
+def _search_raw(user_text: str) -> List[Document]:
+    try:
+        return _mark_speculative(search_similar(user_text, k=retriever_cfg.speculative_k))
+    except Exception:
+        logger.exception("Speculative KB retrieval failed")
+        return []
+
+
+async def _asearch_raw(user_text: str) -> List[Document]:
+    try:
+        return _mark_speculative(await asearch_similar(user_text, k=retriever_cfg.speculative_k))
+    except Exception:
+        logger.exception("Speculative KB retrieval failed")
+        return []
+
+
+def speculative_kb(state: GraphState) -> Dict[str, Any]:
+    """Start a background KB search on the raw user text and return its ticket.
+
+    추측 검색은 최적화일 뿐이므로 실패하면 빈 결과가 된다(fail-open).
+    """
+    user_text = _last_user_text(state)
+    if not user_text:
+        return {"spec_kb_ticket": None}
+    return {"spec_kb_ticket": _register(_executor().submit(_search_raw, user_text))}
+
+
+async def aspeculative_kb(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`speculative_kb` (the search runs as a task on the running loop)."""
+    user_text = _last_user_text(state)
+    if not user_text:
+        return {"spec_kb_ticket": None}
+    return {"spec_kb_ticket": _register(asyncio.ensure_future(_asearch_raw(user_text)))}
+
+
+def collect_speculative(state: GraphState) -> Optional[SpeculativeResult]:
+    """Wait (up to ``retriever_cfg.speculative_wait_s``) for the search started by :func:`speculative_kb`.
+
+    티켓이 없으면 *None*, 시간 안에 끝나지 않거나 실패하면 빈 결과를 돌려준다.
+    """
+    prefetch = _take(state)
+    if prefetch is None:
+        return None
+    arrived = time.monotonic()
+    future = prefetch.future
+    docs: List[Document] = []
+    try:
+        if isinstance(future, Future):
+            docs = future.result(timeout=retriever_cfg.speculative_wait_s)
+        elif future.done():
+            # 비동기 그래프에서 시작된 작업은 동기 경로에서 기다릴 수 없다.
+            docs = future.result()
+    except Exception:
+        logger.warning("Speculative KB retrieval not ready after %.1fs; skipping it", retriever_cfg.speculative_wait_s)
+        future.cancel()
+    return _result(prefetch, arrived, docs)
+
+
+async def acollect_speculative(state: GraphState) -> Optional[SpeculativeResult]:
+    """Async :func:`collect_speculative`."""
+    prefetch = _take(state)
+    if prefetch is None:
+        return None
+    arrived = time.monotonic()
+    future = prefetch.future
+    docs: List[Document] = []
+    try:
+        waitable = asyncio.wrap_future(future) if isinstance(future, Future) else future
+        docs = await asyncio.wait_for(asyncio.shield(waitable), timeout=retriever_cfg.speculative_wait_s)
+    except Exception:
+        logger.warning("Speculative KB retrieval not ready after %.1fs; skipping it", retriever_cfg.speculative_wait_s)
+        future.cancel()
+    return _result(prefetch, arrived, docs)
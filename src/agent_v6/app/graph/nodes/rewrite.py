@@ -2,8 +2,9 @@ import json
 import re
 from typing import Any, Dict, List, Optional
 
+from agent_v6.app.config import retry_cfg
 from agent_v6.app.graph.state import GraphState
-from agent_v6.app.models import chat
+from agent_v6.app.models import achat, chat
 from agent_v6.app.utils.messages import last_user_text as _last_user_text
 
 SYS = (
@@ -60,38 +61,43 @@ def _sanitize_queries(candidates: List[str], fallback: str, k: int = 2, max_len:
     return cleaned[:k]
 
 
-# ---- node ------------------------------------------------------------------
-
+def _query_updates(state: GraphState, queries: List[str]) -> Dict[str, Any]:
+    """Return ``queries``/``searched_queries`` updates.
 
-def query_rewrite(state: GraphState) -> Dict[str, Any]:
-    """
-    - 마지막 사용자 입력을 찾아 2개의 검색친화 쿼리로 리라이트
-    - 이전 단계가 '불충실'이었다면, 부족했던 근거 이슈를 참고해 검색 쿼리를 강화
-    - JSON 강인 파싱 + 후처리
-    - 반환: {'queries': [...], 'step': <증분>}
+    ``retry_cfg.incremental`` 이면 이미 검색한 쿼리를 빼서, 재시도 때 새로 제안된 쿼리만 검색되게 한다.
     """
-    user_text = _last_user_text(state)
+    if retry_cfg.incremental:
+        searched = {q.lower() for q in state.get("searched_queries", []) or []}
+        queries = [q for q in queries if q.lower() not in searched]
+    return {"queries": queries, "searched_queries": queries}
+
+
+# ---- node ------------------------------------------------------------------
 
+
+def _unfaithful_hint(state: GraphState) -> str:
+    """Return the retry context for the previous unfaithful answer, or ``""``."""
     # Faithfulness 컨텍스트(있을 때만)
     faith = state.get("faithfulness") or {}
     prev_unfaithful = bool(faith and not faith.get("faithful", True))
     issues: List[str] = list(faith.get("issues", [])) if prev_unfaithful else []
 
-    # 사용자 프롬프트 구성
     if prev_unfaithful and issues:
-        hint = "\n\n[CONTEXT]\nThe previous answer was judged UNFAITHFUL for these reasons:\n- " + "\n- ".join(issues[:6]) + "\nPlease propose queries to retrieve evidence addressing these gaps explicitly."
-    else:
-        hint = ""
+        return "\n\n[CONTEXT]\nThe previous answer was judged UNFAITHFUL for these reasons:\n- " + "\n- ".join(issues[:6]) + "\nPlease propose queries to retrieve evidence addressing these gaps explicitly."
+    return ""
 
-    # 모델 호출
-    try:
-        out = chat([
-            {"role": "system", "content": SYS},
-            {"role": "user", "content": user_text + hint},
-        ])
-        raw = out if isinstance(out, str) else str(out)
-    except Exception:
-        raw = ""
+
+def _rewrite_messages(state: GraphState) -> List[Dict[str, str]]:
+    user_text = _last_user_text(state)
+
+    return [
+        {"role": "system", "content": SYS},
+        {"role": "user", "content": user_text + _unfaithful_hint(state)},
+    ]
+
+
+def _rewrite_updates(state: GraphState, raw: str) -> Dict[str, Any]:
+    user_text = _last_user_text(state)
 
     # 파싱 & 정리
     parsed = _coerce_queries_from_json_str(raw)
@@ -103,7 +109,35 @@ def query_rewrite(state: GraphState) -> Dict[str, Any]:
     queries = _sanitize_queries(parsed, fallback=user_text, k=2, max_len=256)
 
     updates: Dict[str, Any] = {
-        "queries": queries,
+        **_query_updates(state, queries),
         "step": int(state.get("step", 0)) + 1,
     }
     return updates
+
+
+def query_rewrite(state: GraphState) -> Dict[str, Any]:
+    """
+    - 마지막 사용자 입력을 찾아 2개의 검색친화 쿼리로 리라이트
+    - 이전 단계가 '불충실'이었다면, 부족했던 근거 이슈를 참고해 검색 쿼리를 강화
+    - JSON 강인 파싱 + 후처리
+    - 반환: {'queries': [...], 'step': <증분>}
+    """
+    # 모델 호출
+    try:
+        out = chat(_rewrite_messages(state), node="rewrite")
+        raw = out if isinstance(out, str) else str(out)
+    except Exception:
+        raw = ""
+
+    return _rewrite_updates(state, raw)
+
+
+async def aquery_rewrite(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`query_rewrite` (``ainvoke``)."""
+    try:
+        out = await achat(_rewrite_messages(state), node="rewrite")
+        raw = out if isinstance(out, str) else str(out)
+    except Exception:
+        raw = ""
+
+    return _rewrite_updates(state, raw)
@@ -1,18 +1,27 @@
-from typing import Literal
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Literal, Optional, get_args
 
 from pydantic import BaseModel, Field
 
 # Local imports --------------------------------------------------------------
-from agent_v6.app.config import flags
+from agent_v6.app.config import flags, router_cfg
+from agent_v6.app.graph.nodes.local_router import local_route
 from agent_v6.app.graph.state import GraphState
-from agent_v6.app.models import get_llm
+from agent_v6.app.models import astructured_call, get_llm, structured_call
 from agent_v6.app.utils.messages import last_user_text as _last_user_text
 
 __all__ = [
     "RouterResult",
+    "RouterStats",
+    "aplanner_router",
     "planner_router",
+    "router_stats",
 ]
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -25,58 +34,85 @@ ROUTER_SYS_PROMPT: str = "Return STRICT JSON with keys intent(one of 'followup',
 # ---------------------------------------------------------------------------
 
 
+Intent = Literal["followup", "new_topic", "ambiguous", "task"]
+
+
+def _as_intent(value: object) -> Intent:
+    """Return *value* as an :data:`Intent`, or ``"new_topic"`` if it is not one."""
+    for intent in get_args(Intent):
+        if value == intent:
+            return intent
+    return "new_topic"
+
+
 class RouterResult(BaseModel):
     """Validated schema for LLM router output."""
 
-    intent: Literal["followup", "new_topic", "ambiguous", "task"] = Field(default="new_topic", description="intent")
+    intent: Intent = Field(default="new_topic", description="intent")
     need_web: bool = Field(default=False, description="need to search web")
 
 
 # ---------------------------------------------------------------------------
-# Public API -----------------------------------------------------------------
+# Counters -------------------------------------------------------------------
 # ---------------------------------------------------------------------------
 
 
-def planner_router(state: GraphState) -> RouterResult:  # noqa: D401
-    """Return the user's *intent* and whether a **web** lookup is required.
+@dataclass
+class RouterStats:
+    """Cumulative counters for which routing path handled each turn."""
 
-    The function contains a fast-path that bypasses the LLM entirely when
-    ``flags.use_llm_router`` is *false* or when the user's last chat message
-    cannot be determined.
-    """
+    local: int = 0  # 로컬 규칙으로 결정 (LLM 호출 없음)
+    llm: int = 0  # 로컬 신뢰도가 낮아 LLM 호출
+    llm_errors: int = 0  # LLM 호출 실패 → 상태 기반 폴백
+    skipped: int = 0  # LLM 라우터 비활성 또는 사용자 메시지 없음
+
+
+_stats = RouterStats()
+_stats_lock = threading.Lock()
+
+
+def router_stats() -> RouterStats:
+    """Return a snapshot of the routing counters."""
+    with _stats_lock:
+        return RouterStats(**asdict(_stats))
 
-    def _fallback() -> RouterResult:
-        """Return a RouterResult using values already present in *state*."""
 
-        return RouterResult(
-            intent=state.get("intent", "new_topic"),
-            need_web=state.get("need_web", False),
-        )
+def _count(path: str) -> None:
+    with _stats_lock:
+        setattr(_stats, path, getattr(_stats, path) + 1)
 
+
+# ---------------------------------------------------------------------------
+# Public API -----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+
+def _fallback(state: GraphState) -> RouterResult:
+    """Return a RouterResult using values already present in *state*."""
+
+    return RouterResult(
+        intent=_as_intent(state.get("intent")),
+        need_web=bool(state.get("need_web", False)),
+    )
+
+
+def _router_messages(state: GraphState) -> Optional[List[Dict[str, str]]]:
+    """Return the LLM prompt, or *None* when the fast-path fallback applies."""
     # Fast-path – skip the LLM call entirely if disabled in config.
     if not flags.use_llm_router:
-        return _fallback()
+        return None
 
     user_text: str = _last_user_text(state)
     if not user_text:
-        return _fallback()
+        return None
 
-    try:
-        llm = get_llm().with_structured_output(RouterResult)
-        result = RouterResult.model_validate(
-            llm.invoke(
-                [
-                    {"role": "system", "content": ROUTER_SYS_PROMPT},
-                    {"role": "user", "content": user_text},
-                ]
-            )
-        )
+    return [
+        {"role": "system", "content": ROUTER_SYS_PROMPT},
+        {"role": "user", "content": user_text},
+    ]
 
-    except Exception:
-        # Gracefully degrade to the fallback result in case *anything* goes
-        # wrong – network issues, validation errors, etc.
-        return _fallback()
 
+def _merge_user_pref(state: GraphState, result: RouterResult) -> RouterResult:
     # ---------------------------------------------------------------------
     # Merge with user preference (state.need_web) if provided
     # - If user explicitly disabled web (`need_web=False`), honor it.
@@ -89,3 +125,70 @@ def planner_router(state: GraphState) -> RouterResult:  # noqa: D401
         final_need_web = result.need_web
 
     return RouterResult(intent=result.intent, need_web=final_need_web)
+
+
+def _local_result(state: GraphState, messages: List[Dict[str, str]]) -> Optional[RouterResult]:
+    """Return the local decision if it is confident enough, else *None* (→ LLM).
+
+    웹 단서가 없는 턴은 need_web=False 로 로컬에서 정하므로, 웹 검색 스위치가 켜진 기본 설정에서도
+    intent 가 확실하면 LLM 을 부르지 않는다 (:func:`local_route`).
+    """
+    route = local_route(messages[-1]["content"])
+    if route.confidence < router_cfg.local_min_confidence:
+        logger.debug("Local router unsure (%.2f, %s); asking LLM", route.confidence, route.reason)
+        return None
+    _count("local")
+    return _merge_user_pref(state, RouterResult(intent=_as_intent(route.intent), need_web=route.need_web))
+
+
+def planner_router(state: GraphState) -> RouterResult:  # noqa: D401
+    """Return the user's *intent* and whether a **web** lookup is required.
+
+    The function contains a fast-path that bypasses the LLM entirely when
+    ``flags.use_llm_router`` is *false* or when the user's last chat message
+    cannot be determined. Otherwise the local rule router decides, and the
+    LLM is called only when its confidence is below
+    ``router_cfg.local_min_confidence``.
+    """
+    messages = _router_messages(state)
+    if messages is None:
+        _count("skipped")
+        return _fallback(state)
+
+    local = _local_result(state, messages)
+    if local is not None:
+        return local
+
+    _count("llm")
+    try:
+        llm = get_llm().with_structured_output(RouterResult)
+        result = structured_call("router", RouterResult, messages, lambda: llm.invoke(messages))
+    except Exception:
+        # Gracefully degrade to the fallback result in case *anything* goes
+        # wrong – network issues, validation errors, etc.
+        _count("llm_errors")
+        return _fallback(state)
+
+    return _merge_user_pref(state, result)
+
+
+async def aplanner_router(state: GraphState) -> RouterResult:  # noqa: D401
+    """Async :func:`planner_router` (``ainvoke``)."""
+    messages = _router_messages(state)
+    if messages is None:
+        _count("skipped")
+        return _fallback(state)
+
+    local = _local_result(state, messages)
+    if local is not None:
+        return local
+
+    _count("llm")
+    try:
+        llm = get_llm().with_structured_output(RouterResult)
+        result = await astructured_call("router", RouterResult, messages, lambda: llm.ainvoke(messages))
+    except Exception:
+        _count("llm_errors")
+        return _fallback(state)
+
+    return _merge_user_pref(state, result)
@@ -2,6 +2,7 @@
 # Imports
 # ---------------------------------------------------------------------------
 
+import asyncio
 from typing import Any, Dict, List
 
 from langchain_community.tools import DuckDuckGoSearchResults
@@ -13,6 +14,26 @@ from agent_v6.app.graph.state import GraphState
 # Public interface ----------------------------------------------------------------
 
 
+def _to_documents(results: List[Dict[str, Any]], query: str) -> List[Document]:
+    """Transform raw results into langchain Document objects."""
+    docs: List[Document] = []
+    for item in results:
+        page_content: str = (
+            item.get("body")
+            or item.get("snippet")
+            or item.get("title", "")
+        )
+        metadata: Dict[str, Any] = {
+            "source": item.get("href") or item.get("link"),
+            "title": item.get("title"),
+            "query": query,
+        }
+        docs.append(
+            Document(page_content=page_content, metadata=metadata)
+        )
+    return docs
+
+
 def retrieve_ddg(state: GraphState) -> Dict[str, Any]:
     """Run DuckDuckGo search queries decided by the planner.
 
@@ -43,23 +64,35 @@ def retrieve_ddg(state: GraphState) -> Dict[str, Any]:
             results: List[Dict[str, Any]] = search_tool.invoke(
                 {"query": query, "max_results": 5}  # type: ignore[arg-type]
             )
-            # Transform raw results into langchain Document objects.
-            for item in results:
-                page_content: str = (
-                    item.get("body")
-                    or item.get("snippet")
-                    or item.get("title", "")
-                )
-                metadata: Dict[str, Any] = {
-                    "source": item.get("href") or item.get("link"),
-                    "title": item.get("title"),
-                    "query": query,
-                }
-                collected.append(
-                    Document(page_content=page_content, metadata=metadata)
-                )
+            collected.extend(_to_documents(results, query))
         except Exception:
             # Fail gracefully – continue with the next query.
             continue
 
     return {"web_docs": collected}
+
+
+async def aretrieve_ddg(state: GraphState) -> Dict[str, Any]:
+    """Async :func:`retrieve_ddg`; all queries are searched concurrently."""
+    if not state.get("need_web", False):
+        return {"web_docs": []}
+
+    queries: List[str] = state.get("queries", []) or []
+    if not queries:
+        return {"web_docs": []}
+
+    search_tool = DuckDuckGoSearchResults(output_format="list")
+
+    async def _one(query: str) -> List[Document]:
+        try:
+            results: List[Dict[str, Any]] = await search_tool.ainvoke(
+                {"query": query, "max_results": 5}  # type: ignore[arg-type]
+            )
+            return _to_documents(results, query)
+        except Exception:
+            # Fail gracefully – an empty result for this query.
+            return []
+
+    # gather() keeps the per-query order of the sequential version.
+    collected: List[Document] = [doc for docs in await asyncio.gather(*(_one(q) for q in queries)) for doc in docs]
+    return {"web_docs": collected}
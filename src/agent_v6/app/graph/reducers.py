@@ -0,0 +1,59 @@
+"""State reducers for document lists in :class:`agent_v6.app.graph.state.GraphState`.
+
+``operator.add`` 는 재시도 루프마다 같은 문서를 또 이어 붙여, ``max_steps`` 에 비례해 state
+(와 체크포인트, ``utils.docs.dedup_evidence`` 작업량)가 커진다. :func:`keyed_merge` 는
+출처 + 본문 해시를 키로 병합하고 목록 길이를 제한한다. 넘치는 항목은 관련도 점수가 낮은 것부터 버린다.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from agent_v6.app.utils.docs import RELEVANCE_SCORE_KEY, doc_key
+
+__all__ = ["doc_key", "keyed_merge"]
+
+# grader 의 listwise 점수가 검색 점수보다 우선한다.
+_SCORE_KEYS = ("grade_score", RELEVANCE_SCORE_KEY)
+
+
+def _relevance(item: Any) -> float:
+    """Return the item's relevance score, or ``-inf`` when it has none."""
+    if isinstance(item, Document):
+        fields: Dict[str, Any] = {}
+        metadata = item.metadata or {}
+    elif isinstance(item, dict):
+        fields, metadata = item, item.get("metadata") or {}
+    else:
+        return float("-inf")
+    for key in _SCORE_KEYS:
+        for source in (fields, metadata):
+            value = source.get(key)
+            if isinstance(value, (int, float)):
+                return float(value)
+    return float("-inf")
+
+
+def keyed_merge(max_items: int) -> Callable[[Optional[List[Any]], Optional[List[Any]]], List[Any]]:
+    """Build a reducer that merges two document lists by :func:`doc_key`.
+
+    - 같은 키의 새 항목은 기존 항목을 대체하되, 처음 나타난 위치를 유지한다.
+    - 결과가 *max_items* 를 넘으면 관련도(``grade_score``, 없으면 ``relevance_score``)가 낮은 항목부터
+      버리고, 점수가 같거나 없으면 먼저 들어온 항목부터 버린다 (0 이하이면 제한 없음).
+      ``evidence`` 는 관련도 순으로 쌓이므로 단순히 오래된 항목을 버리면 가장 관련 있는 근거가 사라진다.
+    - 남은 항목은 원래 순서를 유지한다.
+    """
+
+    def _merge(left: Optional[List[Any]], right: Optional[List[Any]]) -> List[Any]:
+        merged: Dict[str, Any] = {}
+        for item in list(left or []) + list(right or []):
+            merged[doc_key(item)] = item
+        items = list(merged.values())
+        if max_items > 0 and len(items) > max_items:
+            ranked = sorted(range(len(items)), key=lambda i: (_relevance(items[i]), i), reverse=True)
+            keep = set(ranked[:max_items])
+            items = [item for i, item in enumerate(items) if i in keep]
+        return items
+
+    return _merge
@@ -4,15 +4,28 @@ from typing import Annotated, Any, Dict, List, Optional
 from langchain_core.documents import Document
 from langgraph.graph.message import MessagesState
 
+from agent_v6.app.config import graph_state_cfg
+from agent_v6.app.graph.reducers import keyed_merge
+
+# 재시도 루프마다 같은 문서가 쌓이지 않도록 출처+본문 키로 병합하고 길이를 제한한다.
+merge_docs = keyed_merge(graph_state_cfg.max_docs)
+
 
 class GraphState(MessagesState, total=False):
     queries: List[str]
-    kb_docs: Annotated[List[Document], add]
-    web_docs: Annotated[List[Document], add]
-    evidence: Annotated[List[Dict[str, Any]], add]
+    searched_queries: Annotated[List[str], add]  # 지금까지 검색에 보낸 쿼리 (재시도 시 중복 검색 방지)
+    kb_docs: Annotated[List[Document], merge_docs]
+    spec_kb_ticket: Optional[str]  # 사용자 원문으로 백그라운드에서 시작한 KB 검색 (첫 grade 에서 결과를 받고 비움)
+    web_docs: Annotated[List[Document], merge_docs]
+    evidence: Annotated[List[Dict[str, Any]], merge_docs]
+    ranked_evidence: Optional[List[Dict[str, Any]]]  # MMR 재정렬로 고른 evidence (generate 가 이 순서대로 사용)
+    graded: Dict[str, bool]  # doc_key(출처#본문 해시) → 채점 판정 (증분 재시도에서 재사용)
     answer: Optional[str]
+    evidence_packing: Optional[Dict[str, Any]]  # generate 프롬프트에 담은/잘라낸 evidence 토큰 통계
+    packed_evidence: Optional[List[Dict[str, Any]]]  # generate 프롬프트에 실제로 담은 evidence (faithfulness 가 같은 집합으로 판정)
     faithfulness: Optional[Dict[str, Any]]
     step: int
     need_web: bool
     intent: str
     max_steps: Optional[int]  # 사용자 슬라이더 값(최대 스텝)
+    answer_cache: Optional[Dict[str, Any]]  # 의미 기반 답변 캐시 적중 정보(적중 시에만 설정)
@@ -0,0 +1,81 @@
+"""Stream the ``generate`` node's tokens while the rest of the graph runs.
+
+``stream_mode=["messages", "values"]`` 로 그래프를 실행해 ``generate`` 노드의 LLM 토큰은
+도착하는 즉시 내보내고, faithfulness 까지 끝난 최종 state 는 마지막에 한 번 돌려준다.
+
+이벤트 순서::
+
+    token* (reset token*)* final
+
+- ``token``: 답변 조각(delta).
+- ``reset``: 재시도 루프로 ``generate`` 가 다시 실행됨. 지금까지 받은 토큰은 버린다.
+- ``final``: 최종 state. faithfulness 가 답변을 고쳤다면 ``answer`` 가 스트리밍된 본문과 다르다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from agent_v6.app.graph.answer_cache import CachedGraph
+from agent_v6.app.graph.state import GraphState
+from agent_v6.app.utils.messages import content_to_text
+
+__all__ = ["AnswerEvent", "STREAM_NODES", "astream_answer"]
+
+# 토큰을 UI 로 흘려보낼 노드
+STREAM_NODES = ("generate",)
+
+
+@dataclass
+class AnswerEvent:
+    """One item yielded by :func:`astream_answer`."""
+
+    kind: str  # "token" | "reset" | "final"
+    text: str = ""
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+async def astream_answer(
+    graph: Any,
+    state: GraphState,
+    config: Any = None,
+    *,
+    nodes: Iterable[str] = STREAM_NODES,
+) -> AsyncIterator[AnswerEvent]:
+    """Run *graph* and yield :class:`AnswerEvent` items (see module docstring).
+
+    Args:
+        graph: ``build_async_graph()`` 결과. :class:`CachedGraph` 이면 캐시 적중 시 바로 ``final`` 만 낸다.
+        state: 초기 state.
+        config: LangGraph ``RunnableConfig`` (콜백 등).
+        nodes: 토큰을 내보낼 노드 이름.
+    """
+    stream_nodes = set(nodes)
+    cached: Optional[CachedGraph] = graph if isinstance(graph, CachedGraph) else None
+    if cached is not None:
+        hit = await cached.alookup(state)
+        if hit is not None:
+            yield AnswerEvent("final", state=hit)
+            return
+        graph = cached.graph
+
+    final: Dict[str, Any] = dict(state)
+    current_step: Optional[int] = None
+    async for mode, payload in graph.astream(state, config, stream_mode=["messages", "values"]):
+        if mode == "values":
+            final = payload
+            continue
+        chunk, metadata = payload
+        if metadata.get("langgraph_node") not in stream_nodes:
+            continue
+        step = metadata.get("langgraph_step")
+        if current_step is not None and step != current_step:
+            yield AnswerEvent("reset")
+        current_step = step
+        text = content_to_text(getattr(chunk, "content", ""))
+        if text:
+            yield AnswerEvent("token", text=text)
+
+    if cached is not None:
+        await cached.astore(state, final)
+    yield AnswerEvent("final", state=final)
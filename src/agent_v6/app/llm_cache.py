@@ -0,0 +1,89 @@
+"""Disk-backed exact-match cache for deterministic LLM calls.
+
+라우터·리라이터처럼 같은 시스템 프롬프트와 같은 사용자 입력에 항상 같은 JSON 을
+돌려주는 호출은 응답을 재사용할 수 있다. 키는 ``(deployment, 메시지 해시, 출력 스키마)``
+이므로 모델 배포나 프롬프트, 스키마가 바뀌면 자연히 다른 키가 된다.
+
+어느 노드의 호출을 캐시할지는 ``LLM_CACHE_NODES`` 로 노드별로 정한다 (예: ``router,rewrite:600``).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from agent_v6.app.utils.sqlite_lru import SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LLMCacheStats", "LLMResponseCache", "parse_node_ttls", "response_key"]
+
+
+def parse_node_ttls(spec: str, default_ttl_s: float) -> Dict[str, float]:
+    """Parse ``"router,rewrite:600"`` into ``{"router": default_ttl_s, "rewrite": 600.0}``."""
+    out: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        name, _, ttl = part.strip().partition(":")
+        if not name:
+            continue
+        try:
+            out[name.strip().lower()] = float(ttl) if ttl.strip() else default_ttl_s
+        except ValueError:
+            logger.warning("Ignoring invalid LLM cache TTL for node %r: %r", name, ttl)
+            out[name.strip().lower()] = default_ttl_s
+    return out
+
+
+def _schema_id(schema: Optional[Type[BaseModel]]) -> str:
+    if schema is None:
+        return "text"
+    body = json.dumps(schema.model_json_schema(), sort_keys=True)
+    return f"{schema.__name__}:{hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}"
+
+
+def response_key(deployment: str, messages: Any, schema: Optional[Type[BaseModel]] = None) -> str:
+    """Return the cache key for one LLM request."""
+    body = json.dumps(messages, ensure_ascii=False, sort_keys=True, default=str)
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{deployment}\x00{_schema_id(schema)}\x00{digest}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LLMCacheStats:
+    """Hit/miss counters for :class:`LLMResponseCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+
+class LLMResponseCache:
+    """Response store with per-entry TTL and size-based LRU eviction (:class:`SQLiteLRUStore`).
+
+    Args:
+        path: SQLite 파일 경로.
+        max_bytes: 최대 저장 크기(바이트). 0 이하이면 제한하지 않는다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0) -> None:
+        self._store = SQLiteLRUStore(path, max_bytes)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for *key*, or *None* on miss/expiry."""
+        value = self._store.get(key)
+        return None if value is None else value.decode("utf-8")
+
+    def put(self, key: str, value: str, *, node: str, ttl_s: float) -> None:
+        """Store *value* for *ttl_s* seconds (``ttl_s <= 0`` never expires)."""
+        self._store.put(key, value.encode("utf-8"), ttl_s=ttl_s, tag=node)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(LLMCacheStats(**asdict(self._store.stats()))), "bytes": self._store.total_bytes}
+
+    def close(self) -> None:
+        self._store.close()
@@ -1,10 +1,18 @@
+import logging
+import sqlite3
 from functools import lru_cache
-from typing import Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, TypeVar
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from pydantic import BaseModel
 
-from agent_v6.app.config import embedding_cfg, llm_cfg
+from agent_v6.app.config import embedding_cfg, llm_cache_cfg, llm_cfg
+from agent_v6.app.llm_cache import LLMResponseCache, parse_node_ttls, response_key
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
 
 
 def _to_lc_messages(messages: List[Dict[str, str]]):
@@ -21,15 +29,143 @@ def _to_lc_messages(messages: List[Dict[str, str]]):
     return out
 
 
-def chat(messages: List[Dict[str, str]]) -> str:
-    """Simple chat helper returning raw content."""
+def chat(messages: List[Dict[str, str]], *, node: Optional[str] = None) -> str:
+    """Simple chat helper returning raw content.
+
+    Args:
+        messages: ``{"role", "content"}`` 메시지 목록.
+        node: 호출한 노드 이름. ``LLM_CACHE_NODES`` 에 있으면 응답 캐시를 거친다.
+    """
+
+    def _call() -> str:
+        resp = get_llm().invoke(_to_lc_messages(messages))
+        content = resp.content
+        if isinstance(content, str):
+            return content
+        # LLM이 리스트나 기타 타입을 반환하는 엣지 케이스 대응
+        return str(content)
+
+    cache = _cache_for(node)
+    if cache is None:
+        return _call()
+    key = response_key(llm_cfg.deployment, messages)
+    hit = _cache_get(cache, key)
+    if hit is not None:
+        return hit
+    out = _call()
+    _cache_put(cache, key, out, node)
+    return out
+
+
+async def achat(messages: List[Dict[str, str]], *, node: Optional[str] = None) -> str:
+    """Async :func:`chat` using ``ainvoke`` (same response cache)."""
+
+    async def _call() -> str:
+        resp = await get_llm().ainvoke(_to_lc_messages(messages))
+        content = resp.content
+        return content if isinstance(content, str) else str(content)
+
+    cache = _cache_for(node)
+    if cache is None:
+        return await _call()
+    key = response_key(llm_cfg.deployment, messages)
+    hit = _cache_get(cache, key)
+    if hit is not None:
+        return hit
+    out = await _call()
+    _cache_put(cache, key, out, node)
+    return out
+
+
+def structured_call(node: str, schema: Type[M], messages: List[Dict[str, str]], invoke: Callable[[], Any]) -> M:
+    """Run a structured-output LLM call through the per-node response cache.
+
+    Args:
+        node: 호출한 노드 이름 (``LLM_CACHE_NODES`` 조회용).
+        schema: 출력 pydantic 스키마. 캐시 키에 포함된다.
+        messages: 모델에 보낼 메시지. 캐시 키에 포함된다.
+        invoke: 캐시 미스일 때 실제 호출을 수행하는 함수.
+
+    Returns:
+        ``schema`` 로 검증된 결과.
+    """
+    cache = _cache_for(node)
+    if cache is None:
+        return schema.model_validate(invoke())
+    key = response_key(llm_cfg.deployment, messages, schema)
+    hit = _cache_get(cache, key)
+    if hit is not None:
+        try:
+            return schema.model_validate_json(hit)
+        except ValueError:
+            logger.warning("Discarding unparsable cached %s response", schema.__name__)
+    result = schema.model_validate(invoke())
+    _cache_put(cache, key, result.model_dump_json(), node)
+    return result
+
+
+async def astructured_call(
+    node: str, schema: Type[M], messages: List[Dict[str, str]], ainvoke: Callable[[], Awaitable[Any]]
+) -> M:
+    """Async :func:`structured_call`; *ainvoke* is awaited only on a cache miss."""
+    cache = _cache_for(node)
+    if cache is None:
+        return schema.model_validate(await ainvoke())
+    key = response_key(llm_cfg.deployment, messages, schema)
+    hit = _cache_get(cache, key)
+    if hit is not None:
+        try:
+            return schema.model_validate_json(hit)
+        except ValueError:
+            logger.warning("Discarding unparsable cached %s response", schema.__name__)
+    result = schema.model_validate(await ainvoke())
+    _cache_put(cache, key, result.model_dump_json(), node)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# LLM response cache ---------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide LLM response cache, or *None* when disabled."""
+    if not llm_cache_cfg.enabled:
+        return None
+    try:
+        return LLMResponseCache(llm_cache_cfg.path, llm_cache_cfg.max_disk_mb * 1024 * 1024)
+    except sqlite3.Error as exc:
+        # 캐시는 최적화일 뿐이므로 열 수 없으면 캐시 없이 동작한다.
+        logger.warning("LLM response cache disabled (%s): %s", llm_cache_cfg.path, exc)
+        return None
+
+
+@lru_cache(maxsize=1)
+def _node_ttls() -> Dict[str, float]:
+    return parse_node_ttls(llm_cache_cfg.nodes, llm_cache_cfg.ttl_s)
+
+
+def _cache_for(node: Optional[str]) -> Optional[LLMResponseCache]:
+    if not node or node.lower() not in _node_ttls():
+        return None
+    return get_llm_cache()
+
+
+def _cache_get(cache: LLMResponseCache, key: str) -> Optional[str]:
+    try:
+        return cache.get(key)
+    except sqlite3.Error as exc:
+        logger.warning("LLM response cache read failed: %s", exc)
+        return None
+
 
-    resp = get_llm().invoke(_to_lc_messages(messages))
-    content = resp.content
-    if isinstance(content, str):
-        return content
-    # LLM이 리스트나 기타 타입을 반환하는 엣지 케이스 대응
-    return str(content)
+def _cache_put(cache: LLMResponseCache, key: str, value: str, node: Optional[str]) -> None:
+    node = (node or "").lower()
+    try:
+        cache.put(key, value, node=node, ttl_s=_node_ttls().get(node, llm_cache_cfg.ttl_s))
+    except sqlite3.Error as exc:
+        logger.warning("LLM response cache write failed: %s", exc)
 
 
 # ---------------------------------------------------------------------------
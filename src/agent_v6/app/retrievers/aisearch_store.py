@@ -1,48 +1,146 @@
+import asyncio
 import glob
+import itertools
+import json
 import os
-from typing import List
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from langchain_community.vectorstores.azuresearch import AzureSearch
+from azure.search.documents.models import VectorizedQuery
+from langchain_community.vectorstores.azuresearch import (
+    FIELDS_CONTENT,
+    FIELDS_CONTENT_VECTOR,
+    FIELDS_ID,
+    FIELDS_METADATA,
+    AzureSearch,
+)
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_text_splitters.character import CharacterTextSplitter
 
-from agent_v6.app.config import azure_search_cfg
+from agent_v6.app.config import azure_search_cfg, embedding_cache_cfg, embedding_cfg, rerank_cfg
 from agent_v6.app.models import get_embeddings
+from agent_v6.app.retrievers.doc_vectors import doc_vectors
+from agent_v6.app.retrievers.embedding_cache import CachedEmbeddings
+from agent_v6.app.retrievers.store_manager import StoreManager
+from agent_v6.app.utils.docs import RELEVANCE_SCORE_KEY
 
 # ---------------------------------------------------------------------------- #
 # Azure AI Search helpers
 # ---------------------------------------------------------------------------- #
 
 
-def load_vectorstore() -> AzureSearch:
+def load_vectorstore(embeddings: Optional[Embeddings] = None) -> AzureSearch:
     """Return an :class:`~langchain_community.vectorstores.azuresearch.AzureSearch` instance
     bound to the index configured in ``azure_search_cfg``.
 
     Vector-only search is preferred. If index-creation logic becomes necessary in
     the future it should be implemented explicitly (e.g. ``ensure_index_exists()``).
+
+    This always builds a *new* client. Query paths should go through
+    :data:`store_manager` so that HTTP sessions are reused across requests.
     """
 
     vector_store: AzureSearch = AzureSearch(
         azure_search_endpoint=azure_search_cfg.endpoint,
         azure_search_key=azure_search_cfg.key,
         index_name=azure_search_cfg.index,
-        embedding_function=get_embeddings().embed_query,
+        embedding_function=(embeddings or get_embeddings()).embed_query,
+        vector_search_dimensions=azure_search_cfg.vector_dimensions or None,
     )
     return vector_store
 
 
+def get_query_embeddings() -> Embeddings:
+    """Return the embeddings client used for *query* vectors.
+
+    ``embedding_cache_cfg.enabled`` 이면 메모리 LRU + SQLite 캐시로 감싼다. 문서
+    적재(ingest) 경로는 캐시를 오염시키지 않도록 :func:`get_embeddings` 를 직접 쓴다.
+    """
+    embeddings = get_embeddings()
+    if not embedding_cache_cfg.enabled:
+        return embeddings
+    return CachedEmbeddings(
+        embeddings,
+        deployment=embedding_cfg.deployment,
+        memory_items=embedding_cache_cfg.memory_items,
+        disk_path=embedding_cache_cfg.path,
+        max_disk_bytes=embedding_cache_cfg.max_disk_mb * 1024 * 1024,
+    )
+
+
+# Process-wide shared clients (vector store + embeddings, with their connection pools).
+store_manager: StoreManager[AzureSearch] = StoreManager(
+    vectorstore_factory=load_vectorstore,
+    embeddings_factory=get_query_embeddings,
+)
+
+
 # ---------------------------------------------------------------------------- #
 # Utility: ingest local markdown files into the vector store
 # ---------------------------------------------------------------------------- #
+# agent_vN 패키지는 서로 import 하지 않는 독립 스냅샷이라 agent_v3 에도 같은 폴더 스트리밍 구현이 있다.
+# 한쪽을 고치면 다른 쪽도 같이 고친다 (tests/test_agent_copies.py 가 두 사본이 같은지 확인한다).
 
 
-def make_docs_from_folder(
+def _read_file(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            return fp.read()
+    except Exception:
+        return None
+
+
+def _iter_file_texts(paths: List[str], workers: int) -> Iterator[Tuple[str, str]]:
+    """Yield ``(path, text)`` in *paths* order, reading up to *workers* files ahead in parallel."""
+    if workers <= 1:
+        for p in paths:
+            txt = _read_file(p)
+            if txt is not None:
+                yield p, txt
+        return
+
+    # 선행 읽기 창을 workers*2 로 제한해 메모리에 올라오는 파일 수를 고정한다.
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="doc-reader") as pool:
+        pending: Deque[Tuple[str, Future]] = deque()
+        it = iter(paths)
+        for p in itertools.islice(it, window):
+            pending.append((p, pool.submit(_read_file, p)))
+        while pending:
+            p, fut = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(_read_file, nxt)))
+            txt = fut.result()
+            if txt is not None:
+                yield p, txt
+
+
+def iter_docs_from_folder(
     folder: str = "ground_docs",
     mask: str = "*.md",
     *,
     chunk_size: int = 512,
     chunk_overlap: int = 50,
-) -> List[Document]:
+    workers: int = 1,
+) -> Iterator[Document]:
+    """Stream chunks file by file instead of materialising the whole corpus.
+
+    ``make_docs_from_folder`` 와 같은 청크를 같은 순서로 내보내지만, 한 번에 메모리에
+    올라오는 것은 선행 읽기 중인 파일들뿐이다.
+
+    Args:
+        folder: 저장소 루트 기준 문서 폴더.
+        mask: glob 패턴.
+        chunk_size: 청크 최대 길이.
+        chunk_overlap: 청크 간 겹침 길이.
+        workers: 병렬로 미리 읽을 파일 수. 1 이면 순차 읽기.
+
+    Yields:
+        ``metadata={"source": <파일명>}`` 을 가진 ``Document``.
+    """
     repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
     data_dir = os.path.join(repo_root, folder)
 
@@ -54,19 +152,28 @@ def make_docs_from_folder(
         is_separator_regex=False,
     )
 
-    docs: List[Document] = []
-    for p in paths:
-        try:
-            with open(p, "r", encoding="utf-8") as fp:
-                txt = fp.read()
-        except Exception:
-            continue
-
+    for p, txt in _iter_file_texts(paths, workers):
         # Split into single-line chunks and filter noise.
         chunks = [c.strip() for c in splitter.split_text(txt) if c.strip() and not c.strip().startswith("#")]
-        docs.extend(Document(page_content=chunk, metadata={"source": os.path.basename(p)}) for chunk in chunks)
+        for chunk in chunks:
+            yield Document(page_content=chunk, metadata={"source": os.path.basename(p)})
+
+
+def iter_doc_batches(docs: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+    """Group a document stream into lists of at most *batch_size*."""
+    it = iter(docs)
+    while batch := list(itertools.islice(it, batch_size)):
+        yield batch
 
-    return docs
+
+def make_docs_from_folder(
+    folder: str = "ground_docs",
+    mask: str = "*.md",
+    *,
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+) -> List[Document]:
+    return list(iter_docs_from_folder(folder, mask, chunk_size=chunk_size, chunk_overlap=chunk_overlap))
 
 
 # ---------------------------------------------------------------------------- #
@@ -80,12 +187,147 @@ def search_similar(
     *,
     score_threshold: float | None = 0.7,
 ) -> List[Document]:
-    """Return top-*k* chunks from the KB most similar to *q*."""
+    """Return top-*k* chunks from the KB most similar to *q*.
+
+    :func:`asearch_similar` 와 같이 :func:`search_similar_many` 경로를 타므로, 점수 척도가 같고
+    (``RERANK_FETCH_VECTORS`` 이면) 문서 벡터도 :data:`doc_vectors` 에 기록된다.
+    점수는 metadata 로 넘겨 grader 가 확실한 후보의 LLM 채점을 건너뛸 수 있게 한다.
+    """
+    return search_similar_many([q], k=k, score_threshold=score_threshold)[0]
+
+
+def with_relevance_score(doc: Document, score: float) -> Document:
+    """Record *score* on ``doc.metadata[RELEVANCE_SCORE_KEY]`` and return *doc*."""
+    doc.metadata = {**(doc.metadata or {}), RELEVANCE_SCORE_KEY: float(score)}
+    return doc
+
+
+def _result_to_document(result: Dict[str, Any]) -> Tuple[Document, float]:
+    """Convert a raw Azure AI Search hit into ``(Document, score)``.
+
+    ``AzureSearch`` 와 같이 문서 ``id`` 를 metadata 에 남긴다. 응답에 벡터 필드가 있으면
+    :data:`doc_vectors` 에 기억해 MMR 재정렬에 재사용한다.
+    """
+    raw_meta = result.get(FIELDS_METADATA) or {}
+    metadata: Dict[str, Any] = dict(raw_meta) if isinstance(raw_meta, dict) else json.loads(raw_meta)
+    if result.get(FIELDS_ID) is not None:
+        metadata = {FIELDS_ID: result[FIELDS_ID], **metadata}
+    doc = Document(page_content=result.get(FIELDS_CONTENT, ""), metadata=metadata)
+    vector = result.get(FIELDS_CONTENT_VECTOR)
+    if vector:
+        doc_vectors.put(doc, vector)
+    return doc, float(result["@search.score"])
 
-    vector_store: AzureSearch = load_vectorstore()
 
-    # res: list[Document] = vector_store.similarity_search(q, k=k, search_type="similarity")
-    res: list[tuple[Document, float]] = vector_store.similarity_search_with_relevance_scores(q, k=k, score_threshold=score_threshold)
+def _select_fields() -> List[str]:
+    # 벡터 필드는 명시적으로 켰을 때만 받는다 (결과마다 응답 페이로드가 커진다).
+    # 끄면 Azure 결과는 MMR 재정렬에서 벡터 없이(관련도로만) 다뤄진다.
+    fields = [FIELDS_ID, FIELDS_CONTENT, FIELDS_METADATA]
+    return fields + [FIELDS_CONTENT_VECTOR] if rerank_cfg.enabled and rerank_cfg.fetch_vectors else fields
 
-    # 반환 타입 일치: Document 객체만 추출
-    return [doc for doc, _ in res]
+
+def _search_by_vector(vector_store: AzureSearch, vector: List[float], k: int) -> List[Tuple[Document, float]]:
+    """Run a pure vector query with a precomputed embedding.
+
+    ``AzureSearch`` 의 공개 API는 항상 쿼리 텍스트를 다시 임베딩하므로, 이미 배치로
+    임베딩한 벡터는 SDK 클라이언트에 직접 전달한다. 벡터 필드는 ``RERANK_FETCH_VECTORS`` 일 때만
+    응답에 포함한다.
+    """
+    results = vector_store.client.search(
+        search_text="",
+        vector_queries=[VectorizedQuery(vector=vector, k_nearest_neighbors=k, fields=FIELDS_CONTENT_VECTOR)],
+        select=_select_fields(),
+        top=k,
+    )
+    return [_result_to_document(r) for r in results]
+
+
+def search_similar_many(
+    queries: Sequence[str],
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+    max_workers: int | None = None,
+) -> List[List[Document]]:
+    """Return top-*k* KB chunks for every query in *queries*.
+
+    모든 쿼리를 ``embed_documents`` 한 번으로 임베딩한 뒤, 벡터 검색은 최대
+    *max_workers* 개까지 동시에 보낸다.
+
+    Args:
+        queries: 검색 쿼리 목록.
+        k: 쿼리당 반환할 최대 청크 수.
+        score_threshold: 이 값 미만의 relevance score 는 제외한다. ``None`` 이면 필터링하지 않는다.
+        max_workers: 동시 검색 요청 수 상한. 기본값은 ``azure_search_cfg.max_concurrency``.
+
+    Returns:
+        *queries* 와 같은 순서로 정렬된 쿼리별 ``Document`` 리스트. 각 문서의
+        ``metadata[RELEVANCE_SCORE_KEY]`` 에 relevance score 가 기록된다.
+    """
+    if not queries:
+        return []
+
+    vector_store: AzureSearch = store_manager.get_vectorstore()
+    vectors: List[List[float]] = store_manager.get_embeddings().embed_documents(list(queries))
+
+    def _one(vector: List[float]) -> List[Document]:
+        res = _search_by_vector(vector_store, vector, k)
+        return [with_relevance_score(doc, score) for doc, score in res if score_threshold is None or score >= score_threshold]
+
+    workers = max(1, min(max_workers or azure_search_cfg.max_concurrency, len(vectors)))
+    if workers == 1:
+        return [_one(v) for v in vectors]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kb-search") as pool:
+        # map() preserves input order, so results line up with *queries*.
+        return list(pool.map(_one, vectors))
+
+
+# ---------------------------------------------------------------------------- #
+# Async API: same contract, non-blocking I/O
+# ---------------------------------------------------------------------------- #
+
+
+async def _asearch_by_vector(vector_store: AzureSearch, vector: List[float], k: int) -> List[Tuple[Document, float]]:
+    """Async :func:`_search_by_vector` using the store's ``async_client``."""
+    results = await vector_store.async_client.search(
+        search_text="",
+        vector_queries=[VectorizedQuery(vector=vector, k_nearest_neighbors=k, fields=FIELDS_CONTENT_VECTOR)],
+        select=_select_fields(),
+        top=k,
+    )
+    return [_result_to_document(r) async for r in results]
+
+
+async def asearch_similar_many(
+    queries: Sequence[str],
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+    max_workers: int | None = None,
+) -> List[List[Document]]:
+    """Async :func:`search_similar_many`: one ``aembed_documents`` call, then concurrent vector queries."""
+    if not queries:
+        return []
+
+    # 최초 1회는 인덱스 연결(및 차원 추정)이 동기 I/O 이므로 스레드에서 만든다.
+    vector_store: AzureSearch = await asyncio.to_thread(store_manager.get_vectorstore)
+    vectors: List[List[float]] = await store_manager.get_embeddings().aembed_documents(list(queries))
+    sem = asyncio.Semaphore(max(1, max_workers or azure_search_cfg.max_concurrency))
+
+    async def _one(vector: List[float]) -> List[Document]:
+        async with sem:
+            res = await _asearch_by_vector(vector_store, vector, k)
+        return [with_relevance_score(doc, score) for doc, score in res if score_threshold is None or score >= score_threshold]
+
+    # gather() preserves input order, so results line up with *queries*.
+    return list(await asyncio.gather(*(_one(v) for v in vectors)))
+
+
+async def asearch_similar(
+    q: str,
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+) -> List[Document]:
+    """Async :func:`search_similar`."""
+    return (await asearch_similar_many([q], k=k, score_threshold=score_threshold))[0]
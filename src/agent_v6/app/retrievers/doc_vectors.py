@@ -0,0 +1,61 @@
+"""Process-wide cache of document embeddings seen at retrieval time.
+
+검색 백엔드가 이미 가진 문서 벡터(로컬 인덱스 행, Azure AI Search ``content_vector`` 필드)를
+:func:`agent_v6.app.utils.docs.doc_key` 로 기억해 두어, MMR 재정렬 같은 후처리가
+임베딩 API 를 다시 부르지 않고 문서 간 유사도를 계산할 수 있게 한다.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from agent_v6.app.config import rerank_cfg
+from agent_v6.app.utils.docs import doc_key
+
+__all__ = ["DocVectorCache", "doc_vectors"]
+
+
+class DocVectorCache:
+    """Thread-safe LRU map of ``doc_key`` → L2-normalised float32 vector.
+
+    Args:
+        max_items: 최대 항목 수. 넘으면 가장 오래 쓰이지 않은 항목부터 버린다.
+    """
+
+    def __init__(self, max_items: int = 4096) -> None:
+        self._max_items = max(1, max_items)
+        self._items: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, doc: Any, vector: Sequence[float]) -> None:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        vec = vec / norm if norm else vec
+        key = doc_key(doc)
+        with self._lock:
+            self._items[key] = vec
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_items:
+                self._items.popitem(last=False)
+
+    def get(self, doc: Any) -> Optional[np.ndarray]:
+        key = doc_key(doc)
+        with self._lock:
+            vec = self._items.get(key)
+            if vec is not None:
+                self._items.move_to_end(key)
+        return vec
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+doc_vectors = DocVectorCache(rerank_cfg.cache_items)
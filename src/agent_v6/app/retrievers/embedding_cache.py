@@ -0,0 +1,220 @@
+"""Two-tier cache for query embeddings: in-process LRU in front of SQLite.
+
+같은 질문이나 리라이터가 만든 동일한 쿼리는 매번 임베딩 API 를 호출할 필요가 없다.
+키는 ``(deployment, 정규화된 텍스트)`` 의 해시이므로 배포(모델)가 바뀌면 자연히
+다른 키 공간을 쓴다.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from agent_v6.app.utils.sqlite_lru import SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CachedEmbeddings", "EmbeddingCacheStats", "normalize_text"]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFKC, trimmed, collapsed whitespace)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for :class:`CachedEmbeddings`."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / total if total else 0.0
+
+
+def _unpack(blob: Optional[bytes]) -> Optional[List[float]]:
+    return None if blob is None else array("f", blob).tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """``Embeddings`` wrapper that caches vectors in memory and on disk.
+
+    Args:
+        inner: 실제 임베딩 클라이언트.
+        deployment: 캐시 키 네임스페이스로 쓰는 배포 이름.
+        memory_items: 메모리 LRU 에 유지할 최대 벡터 수.
+        disk_path: SQLite 파일 경로. 빈 문자열이면 디스크 계층을 쓰지 않는다.
+        max_disk_bytes: 디스크 계층 최대 크기(바이트). 0 이하이면 제한하지 않는다.
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        *,
+        deployment: str,
+        memory_items: int = 2048,
+        disk_path: str = "",
+        max_disk_bytes: int = 0,
+    ) -> None:
+        self.inner = inner
+        self.deployment = deployment
+        self._memory_items = memory_items
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = EmbeddingCacheStats()
+        self._disk: Optional[SQLiteLRUStore] = None
+        if disk_path:
+            try:
+                self._disk = SQLiteLRUStore(disk_path, max_disk_bytes)
+            except sqlite3.Error as exc:
+                # 디스크 캐시는 최적화일 뿐이므로 실패해도 메모리 계층만으로 동작한다.
+                logger.warning("Embedding disk cache disabled (%s): %s", disk_path, exc)
+
+    # ------------------------------------------------------------------ #
+    # Cache primitives
+    # ------------------------------------------------------------------ #
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.deployment}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_items:
+                self._memory.popitem(last=False)
+                self._stats.memory_evictions += 1
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats.memory_hits += 1
+                return vector
+        if self._disk is not None:
+            try:
+                vector = _unpack(self._disk.get(key))
+            except sqlite3.Error as exc:
+                logger.warning("Embedding disk cache read failed: %s", exc)
+                vector = None
+            if vector is not None:
+                with self._lock:
+                    self._stats.disk_hits += 1
+                self._remember(key, vector)
+                return vector
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def _store(self, key: str, vector: List[float]) -> None:
+        self._remember(key, vector)
+        if self._disk is not None:
+            try:
+                evicted = self._disk.put(key, array("f", vector).tobytes())
+            except sqlite3.Error as exc:
+                logger.warning("Embedding disk cache write failed: %s", exc)
+                return
+            if evicted:
+                with self._lock:
+                    self._stats.disk_evictions += evicted
+
+    def peek(self, text: str) -> Optional[List[float]]:
+        """Return the cached vector for *text* without calling the API or touching counters."""
+        key = self._key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+        if vector is None and self._disk is not None:
+            try:
+                vector = _unpack(self._disk.get(key))
+            except sqlite3.Error:
+                vector = None
+        return vector
+
+    # ------------------------------------------------------------------ #
+    # Embeddings interface
+    # ------------------------------------------------------------------ #
+
+    def _partition(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], Dict[str, str]]:
+        """Split *texts* into cached vectors and de-duplicated misses."""
+        keys = [self._key(t) for t in texts]
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}  # key -> first text with that key (dedups within the batch)
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            vector = self._lookup(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                found[key] = vector
+        return keys, found, missing
+
+    def _fill(self, found: Dict[str, List[float]], missing: Dict[str, str], vectors: List[List[float]]) -> None:
+        for key, vector in zip(missing.keys(), vectors):
+            self._store(key, vector)
+            found[key] = vector
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = self.inner.embed_query(text)
+            self._store(key, vector)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._partition(texts)
+        if missing:
+            self._fill(found, missing, self.inner.embed_documents(list(missing.values())))
+        return [found[k] for k in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = await self.inner.aembed_query(text)
+            self._store(key, vector)
+        return vector
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._partition(texts)
+        if missing:
+            self._fill(found, missing, await self.inner.aembed_documents(list(missing.values())))
+        return [found[k] for k in keys]
+
+    # ------------------------------------------------------------------ #
+    # Metrics / maintenance
+    # ------------------------------------------------------------------ #
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, hit rate and current tier sizes."""
+        with self._lock:
+            snapshot = EmbeddingCacheStats(**asdict(self._stats))
+            memory_items = len(self._memory)
+        return {
+            **asdict(snapshot),
+            "hit_rate": snapshot.hit_rate,
+            "memory_items": memory_items,
+            "disk_bytes": self._disk.total_bytes if self._disk is not None else 0,
+        }
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the disk tier is kept)."""
+        with self._lock:
+            self._memory.clear()
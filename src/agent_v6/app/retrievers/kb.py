@@ -0,0 +1,153 @@
+"""KB search entry point that dispatches to the backend selected by ``retriever_cfg``.
+
+``retriever_cfg.hybrid`` 가 켜져 있으면 벡터 검색과 로컬 BM25 검색을 병렬로 실행하고
+Reciprocal Rank Fusion(RRF)으로 합친 결과를 돌려준다.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Dict, List, Sequence
+
+from langchain_core.documents import Document
+
+from agent_v6.app.config import azure_search_cfg, retriever_cfg
+from agent_v6.app.retrievers import aisearch_store, local_store
+from agent_v6.app.retrievers.lexical_index import get_lexical_index
+from agent_v6.app.utils.docs import doc_key
+
+__all__ = ["asearch_similar", "asearch_similar_many", "kb_version", "rrf_fuse", "search_similar", "search_similar_many"]
+
+_BACKENDS: dict[str, ModuleType] = {
+    "aisearch": aisearch_store,
+    "local": local_store,
+}
+
+
+def _backend() -> ModuleType:
+    try:
+        return _BACKENDS[retriever_cfg.backend]
+    except KeyError:
+        raise ValueError(f"Unknown KB_BACKEND {retriever_cfg.backend!r}; expected one of {sorted(_BACKENDS)}") from None
+
+
+def kb_version() -> str:
+    """Return an identifier that changes whenever the KB contents may have changed.
+
+    ``KB_INDEX_VERSION`` (재적재 후 운영자가 갱신), 백엔드 종류, 그리고 백엔드별 식별자를 합친다.
+    로컬 인덱스는 ``meta.json`` 의 mtime 을 쓰므로 ``build_local_index`` 를 다시 실행하면 자동으로 바뀐다.
+    """
+    parts = [retriever_cfg.backend, retriever_cfg.index_version, "hybrid" if retriever_cfg.hybrid else "dense"]
+    if retriever_cfg.backend == "local":
+        try:
+            parts.append(str(os.stat(os.path.join(retriever_cfg.local_index_dir, local_store.META_FILE)).st_mtime_ns))
+        except OSError:
+            parts.append("missing")
+    else:
+        parts.append(azure_search_cfg.index)
+    return ":".join(parts)
+
+
+def rrf_fuse(ranked_lists: Sequence[Sequence[Document]], k: int, *, rrf_k: int = 60) -> List[Document]:
+    """Fuse several ranked lists with Reciprocal Rank Fusion.
+
+    각 문서 점수는 ``Σ 1 / (rrf_k + rank)`` 이며, 같은 :func:`~agent_v6.app.utils.docs.doc_key`
+    (출처 + 본문 해시, state 병합과 같은 기준)는 하나로 합친다.
+    점수가 같으면 먼저 나온 목록(벡터 검색)의 순서를 따른다.
+
+    Args:
+        ranked_lists: 순위대로 정렬된 문서 목록들.
+        k: 반환할 최대 문서 수.
+        rrf_k: RRF 상수. 클수록 하위 순위의 영향이 커진다.
+
+    Returns:
+        결합 점수 순으로 정렬된 상위 *k* 문서. 각 문서 metadata 에 ``rrf_score`` 가 기록된다.
+    """
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, Document] = {}
+    for docs in ranked_lists:
+        for rank, doc in enumerate(docs, start=1):
+            key = doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            first_seen.setdefault(key, doc)
+
+    # dict 삽입 순서 + 안정 정렬 → 동점 시 먼저 등장한 문서가 앞선다.
+    ranked = sorted(scores, key=lambda key: scores[key], reverse=True)[:k]
+    out: List[Document] = []
+    for key in ranked:
+        doc = first_seen[key]
+        out.append(Document(page_content=doc.page_content, metadata={**(doc.metadata or {}), "rrf_score": scores[key]}))
+    return out
+
+
+def _dense_k(k: int) -> int:
+    return min(k, retriever_cfg.hybrid_dense_k) if retriever_cfg.hybrid_dense_k > 0 else k
+
+
+def _lexical_many(queries: Sequence[str]) -> List[List[Document]]:
+    index = get_lexical_index()
+    return [[doc for doc, _ in index.search(q, k=retriever_cfg.hybrid_lexical_k)] for q in queries]
+
+
+def _hybrid_many(queries: Sequence[str], k: int, score_threshold: float | None) -> List[List[Document]]:
+    dense_k = _dense_k(k)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="kb-dense") as pool:
+        # 벡터 검색(네트워크)은 백그라운드에서, BM25(로컬 CPU)는 현재 스레드에서 동시에 실행한다.
+        dense_future = pool.submit(_backend().search_similar_many, queries, k=dense_k, score_threshold=score_threshold)
+        lexical = _lexical_many(queries)
+        dense = dense_future.result()
+    return [rrf_fuse([d, lx], k, rrf_k=retriever_cfg.rrf_k) for d, lx in zip(dense, lexical)]
+
+
+def search_similar(q: str, k: int = 5, *, score_threshold: float | None = 0.7) -> List[Document]:
+    """Return top-*k* chunks from the configured KB backend most similar to *q*."""
+    if retriever_cfg.hybrid:
+        return _hybrid_many([q], k, score_threshold)[0]
+    return _backend().search_similar(q, k=k, score_threshold=score_threshold)
+
+
+def search_similar_many(
+    queries: Sequence[str],
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+) -> List[List[Document]]:
+    """Return top-*k* chunks per query from the configured KB backend.
+
+    ``score_threshold`` 는 벡터 검색 결과에만 적용된다(BM25 점수는 척도가 다르다).
+    """
+    if not queries:
+        return []
+    if retriever_cfg.hybrid:
+        return _hybrid_many(queries, k, score_threshold)
+    return _backend().search_similar_many(queries, k=k, score_threshold=score_threshold)
+
+
+async def _ahybrid_many(queries: Sequence[str], k: int, score_threshold: float | None) -> List[List[Document]]:
+    # 벡터 검색은 이벤트 루프에서, BM25(CPU)는 스레드에서 동시에 실행한다.
+    dense, lexical = await asyncio.gather(
+        _backend().asearch_similar_many(queries, k=_dense_k(k), score_threshold=score_threshold),
+        asyncio.to_thread(_lexical_many, queries),
+    )
+    return [rrf_fuse([d, lx], k, rrf_k=retriever_cfg.rrf_k) for d, lx in zip(dense, lexical)]
+
+
+async def asearch_similar(q: str, k: int = 5, *, score_threshold: float | None = 0.7) -> List[Document]:
+    """Async :func:`search_similar`."""
+    return (await asearch_similar_many([q], k=k, score_threshold=score_threshold))[0]
+
+
+async def asearch_similar_many(
+    queries: Sequence[str],
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+) -> List[List[Document]]:
+    """Async :func:`search_similar_many`."""
+    if not queries:
+        return []
+    if retriever_cfg.hybrid:
+        return await _ahybrid_many(queries, k, score_threshold)
+    return await _backend().asearch_similar_many(queries, k=k, score_threshold=score_threshold)
@@ -0,0 +1,85 @@
+"""In-process BM25 index over the local KB chunks.
+
+Azure AI Search 벡터 검색을 보완하는 어휘(lexical) 검색기. 한국어는 조사가 붙어
+공백 단위 토큰이 잘 일치하지 않으므로(예: ``파이썬은`` vs ``파이썬``), 한글 토큰은
+원형과 함께 글자 bigram 으로도 색인한다.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from agent_v6.app.retrievers.aisearch_store import make_docs_from_folder
+
+__all__ = ["BM25Index", "get_lexical_index", "tokenize"]
+
+_TOKEN_PAT = re.compile(r"\w+", re.UNICODE)
+_HANGUL_PAT = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens plus Hangul character bigrams."""
+    tokens: List[str] = []
+    for tok in _TOKEN_PAT.findall((text or "").lower()):
+        tokens.append(tok)
+        if len(tok) > 2 and _HANGUL_PAT.search(tok):
+            tokens.extend(tok[i : i + 2] for i in range(len(tok) - 1))
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents.
+
+    점수 계산은 쿼리 토큰의 posting 만 순회하므로 비용이 코퍼스 크기가 아니라
+    일치하는 posting 수에 비례한다.
+    """
+
+    def __init__(self, docs: Sequence[Document], *, k1: float = 1.5, b: float = 0.75) -> None:
+        self.docs: List[Document] = list(docs)
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._doc_len: List[int] = []
+        for idx, doc in enumerate(self.docs):
+            counts = Counter(tokenize(doc.page_content))
+            self._doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings[term].append((idx, tf))
+        n = len(self.docs)
+        self._avgdl = (sum(self._doc_len) / n) if n else 0.0
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:
+        """Return up to *k* ``(Document, bm25_score)`` pairs, best first."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for idx, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[idx] / (self._avgdl or 1.0))
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+        top = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+        return [(self.docs[idx], score) for idx, score in top]
+
+
+@lru_cache(maxsize=1)
+def get_lexical_index() -> BM25Index:
+    """Return the process-wide BM25 index over ``ground_docs`` (built on first use).
+
+    청크 단위는 Azure AI Search 적재 스크립트와 같은 줄 단위(``chunk_size=1``)를 써서
+    두 검색기의 결과를 같은 키로 합칠 수 있게 한다. 재색인이 필요하면
+    ``get_lexical_index.cache_clear()`` 를 호출한다.
+    """
+    return BM25Index(make_docs_from_folder(chunk_size=1, chunk_overlap=0))
@@ -0,0 +1,254 @@
+"""Offline KB backend: memory-mapped float32 embedding matrix + JSON sidecar.
+
+Index layout (``retriever_cfg.local_index_dir``)::
+
+    vectors.f32  – raw (N, dim) float32, L2-normalised rows, opened with ``np.memmap(mode="r")``
+    items.jsonl  – one {"content", "metadata"} object per row, same order as the vectors
+    meta.json    – {"version", "dim", "count", "deployment"}
+
+The builder consumes documents as a stream and appends each embedded batch to
+both files, so peak memory is one batch regardless of corpus size.
+
+``search_similar`` / ``search_similar_many`` follow the same contract as
+:mod:`agent_v6.app.retrievers.aisearch_store`, so ``retrieve_kb`` can switch
+backends by setting ``KB_BACKEND=local``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from agent_v6.app.config import embedding_cfg, retriever_cfg
+from agent_v6.app.models import get_embeddings
+from agent_v6.app.retrievers import aisearch_store
+from agent_v6.app.retrievers.doc_vectors import doc_vectors
+from agent_v6.app.retrievers.store_manager import StoreManager
+
+__all__ = [
+    "LocalVectorIndex",
+    "asearch_similar",
+    "asearch_similar_many",
+    "build_local_index",
+    "search_similar",
+    "search_similar_many",
+    "store_manager",
+]
+
+VECTORS_FILE = "vectors.f32"
+ITEMS_FILE = "items.jsonl"
+META_FILE = "meta.json"
+INDEX_VERSION = 2
+
+
+def _cosine_to_score(cos: np.ndarray) -> np.ndarray:
+    """Map cosine similarity to Azure AI Search's cosine relevance score.
+
+    Azure AI Search 는 ``1 / (1 + (1 - cos))`` 를 ``@search.score`` 로 돌려준다.
+    같은 식을 쓰면 ``score_threshold`` 값을 백엔드와 무관하게 그대로 쓸 수 있다.
+    """
+    return 1.0 / (2.0 - cos)
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class LocalVectorIndex:
+    """Read-only top-k cosine search over a memory-mapped embedding matrix."""
+
+    def __init__(self, vectors: np.ndarray, items: List[Dict[str, Any]], embeddings: Embeddings) -> None:
+        if vectors.shape[0] != len(items):
+            raise ValueError(f"Index is corrupt: {vectors.shape[0]} vectors but {len(items)} metadata items")
+        self.vectors = vectors
+        self.items = items
+        self.embeddings = embeddings
+
+    @classmethod
+    def load(cls, index_dir: str, embeddings: Embeddings) -> "LocalVectorIndex":
+        """Open an index written by :func:`build_local_index`."""
+        with open(os.path.join(index_dir, META_FILE), "r", encoding="utf-8") as fp:
+            meta = json.load(fp)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported local index version: {meta.get('version')}")
+        count, dim = int(meta["count"]), int(meta["dim"])
+        if count:
+            vectors = np.memmap(os.path.join(index_dir, VECTORS_FILE), dtype=np.float32, mode="r", shape=(count, dim))
+        else:  # np.memmap 은 빈 파일을 열 수 없다.
+            vectors = np.zeros((0, dim), dtype=np.float32)
+        with open(os.path.join(index_dir, ITEMS_FILE), "r", encoding="utf-8") as fp:
+            items = [json.loads(line) for line in fp if line.strip()]
+        return cls(vectors, items, embeddings)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search_by_vectors(self, query_vectors: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+        """Return top-*k* ``(Document, score)`` pairs for each row of *query_vectors*."""
+        n = len(self.items)
+        if n == 0 or k <= 0:
+            return [[] for _ in range(len(query_vectors))]
+        k = min(k, n)
+
+        q = _normalize(np.asarray(query_vectors, dtype=np.float32))
+        sims = q @ self.vectors.T  # (m, n)
+        # argpartition: O(n) top-k selection, then sort only the k survivors.
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(q), 1))
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        scores = _cosine_to_score(np.take_along_axis(top_sims, order, axis=1))
+
+        out: List[List[Tuple[Document, float]]] = []
+        for row_idx, row_scores in zip(top, scores):
+            hits: List[Tuple[Document, float]] = []
+            for i, s in zip(row_idx.tolist(), row_scores.tolist()):
+                doc = Document(page_content=self.items[i]["content"], metadata=dict(self.items[i]["metadata"]))
+                # 후처리(MMR)가 임베딩을 다시 부르지 않도록 인덱스 행 벡터를 기억해 둔다.
+                doc_vectors.put(doc, self.vectors[i])
+                hits.append((doc, float(s)))
+            out.append(hits)
+        return out
+
+
+# ---------------------------------------------------------------------------- #
+# Build
+# ---------------------------------------------------------------------------- #
+
+
+def build_local_index(
+    index_dir: Optional[str] = None,
+    docs: Optional[Iterable[Document]] = None,
+    *,
+    embeddings: Optional[Embeddings] = None,
+    batch_size: int = 256,
+) -> int:
+    """Embed *docs* batch by batch and write them as a local index under *index_dir*.
+
+    Args:
+        index_dir: 출력 디렉터리. 기본값은 ``retriever_cfg.local_index_dir``.
+        docs: 인덱싱할 문서(제너레이터 가능). 생략하면
+            ``iter_docs_from_folder(chunk_size=1, chunk_overlap=0)`` 로 파일 단위 스트리밍한다.
+        embeddings: 임베딩 클라이언트. 생략하면 캐시를 거치지 않는 새 클라이언트를 사용한다.
+        batch_size: ``embed_documents`` 한 번에 보낼 청크 수.
+
+    Returns:
+        인덱싱된 청크 수.
+    """
+    index_dir = index_dir or retriever_cfg.local_index_dir
+    if docs is None:
+        docs = aisearch_store.iter_docs_from_folder(chunk_size=1, chunk_overlap=0)
+    embeddings = embeddings or get_embeddings()
+    os.makedirs(index_dir, exist_ok=True)
+
+    vec_tmp = os.path.join(index_dir, VECTORS_FILE + ".tmp")
+    items_tmp = os.path.join(index_dir, ITEMS_FILE + ".tmp")
+    meta_tmp = os.path.join(index_dir, META_FILE + ".tmp")
+
+    count, dim = 0, 0
+    with open(vec_tmp, "wb") as vec_fp, open(items_tmp, "w", encoding="utf-8") as items_fp:
+        for batch in aisearch_store.iter_doc_batches(docs, batch_size):
+            vecs = _normalize(np.asarray(embeddings.embed_documents([d.page_content for d in batch]), dtype=np.float32))
+            if dim and vecs.shape[1] != dim:
+                raise ValueError(f"Embedding dimension changed mid-build: {dim} -> {vecs.shape[1]}")
+            dim = int(vecs.shape[1])
+            vec_fp.write(np.ascontiguousarray(vecs).tobytes())
+            for d in batch:
+                items_fp.write(json.dumps({"content": d.page_content, "metadata": dict(d.metadata)}, ensure_ascii=False))
+                items_fp.write("\n")
+            count += len(batch)
+
+    meta = {"version": INDEX_VERSION, "dim": dim, "count": count, "deployment": embedding_cfg.deployment}
+    with open(meta_tmp, "w", encoding="utf-8") as fp:
+        json.dump(meta, fp, ensure_ascii=False)
+
+    # Swap the files in only after they are fully written; meta.json goes last
+    # because it carries the row count the reader trusts.
+    os.replace(vec_tmp, os.path.join(index_dir, VECTORS_FILE))
+    os.replace(items_tmp, os.path.join(index_dir, ITEMS_FILE))
+    os.replace(meta_tmp, os.path.join(index_dir, META_FILE))
+    store_manager.reset()
+    return count
+
+
+# Process-wide index handle; shares the pooled embeddings client with aisearch_store.
+store_manager: StoreManager[LocalVectorIndex] = StoreManager(
+    vectorstore_factory=lambda embeddings: LocalVectorIndex.load(retriever_cfg.local_index_dir, embeddings),
+    embeddings_factory=lambda: aisearch_store.store_manager.get_embeddings(),
+)
+
+
+# ---------------------------------------------------------------------------- #
+# Public API: same contract as aisearch_store
+# ---------------------------------------------------------------------------- #
+
+
+def search_similar_many(
+    queries: Sequence[str],
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+    max_workers: int | None = None,  # noqa: ARG001 - kept for signature parity with aisearch_store
+) -> List[List[Document]]:
+    """Return top-*k* local KB chunks for every query in *queries*."""
+    if not queries:
+        return []
+
+    index = store_manager.get_vectorstore()
+    vectors = np.asarray(index.embeddings.embed_documents(list(queries)), dtype=np.float32)
+    return [
+        [aisearch_store.with_relevance_score(doc, score) for doc, score in hits if score_threshold is None or score >= score_threshold]
+        for hits in index.search_by_vectors(vectors, k)
+    ]
+
+
+def search_similar(
+    q: str,
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+) -> List[Document]:
+    """Return top-*k* chunks from the local KB index most similar to *q*."""
+    index = store_manager.get_vectorstore()
+    vector = np.asarray([index.embeddings.embed_query(q)], dtype=np.float32)
+    return [
+        aisearch_store.with_relevance_score(doc, score)
+        for doc, score in index.search_by_vectors(vector, k)[0]
+        if score_threshold is None or score >= score_threshold
+    ]
+
+
+async def asearch_similar_many(
+    queries: Sequence[str],
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+    max_workers: int | None = None,  # noqa: ARG001 - kept for signature parity with aisearch_store
+) -> List[List[Document]]:
+    """Async :func:`search_similar_many`; only the embedding call awaits I/O."""
+    if not queries:
+        return []
+
+    index = await asyncio.to_thread(store_manager.get_vectorstore)
+    vectors = np.asarray(await index.embeddings.aembed_documents(list(queries)), dtype=np.float32)
+    return [
+        [aisearch_store.with_relevance_score(doc, score) for doc, score in hits if score_threshold is None or score >= score_threshold]
+        for hits in index.search_by_vectors(vectors, k)
+    ]
+
+
+async def asearch_similar(
+    q: str,
+    k: int = 5,
+    *,
+    score_threshold: float | None = 0.7,
+) -> List[Document]:
+    """Async :func:`search_similar`."""
+    return (await asearch_similar_many([q], k=k, score_threshold=score_threshold))[0]
@@ -0,0 +1,86 @@
+"""MinHash near-duplicate detection for retrieved evidence.
+
+``retrieve_kb`` 는 본문이 완전히 같은 문서만 제거하므로, 겹치는 KB 청크나 같은 사실을
+되풀이하는 웹 스니펫은 그대로 채점기와 프롬프트로 간다. 여기서는 공백을 정규화한 글자
+shingle 집합의 MinHash 서명으로 Jaccard 유사도를 추정해, 임계값 이상인 문서끼리 한 군집으로
+보고 점수가 가장 높은 문서만 남긴다.
+
+서명은 본문별로 한 번만 계산해 캐시한다(:func:`signature`).
+"""
+from __future__ import annotations
+
+import re
+import zlib
+from functools import lru_cache
+from typing import Callable, List, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+__all__ = ["estimate_jaccard", "near_dup_filter", "signature"]
+
+T = TypeVar("T")
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SPACE_PAT = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    # 고정 시드: 프로세스가 달라도 같은 서명이 나온다.
+    rng = np.random.default_rng(1)
+    a = rng.integers(1, int(_MERSENNE), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE), size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def _shingles(text: str, size: int) -> List[int]:
+    norm = _SPACE_PAT.sub(" ", (text or "").lower()).strip()
+    if len(norm) <= size:
+        return [zlib.crc32(norm.encode("utf-8"))]
+    return list({zlib.crc32(norm[i : i + size].encode("utf-8")) for i in range(len(norm) - size + 1)})
+
+
+@lru_cache(maxsize=4096)
+def signature(text: str, num_perm: int = 64, shingle: int = 3) -> np.ndarray:
+    """Return the MinHash signature (``uint64[num_perm]``) of *text*'s character shingles."""
+    a, b = _permutations(num_perm)
+    hashes = np.asarray(_shingles(text, shingle), dtype=np.uint64)
+    # (a·x + b) mod p, 32비트로 자른 뒤 순열별 최솟값
+    with np.errstate(over="ignore"):
+        phv = ((np.outer(hashes, a) + b) % _MERSENNE) & _MAX_HASH
+    sig = phv.min(axis=0)
+    sig.setflags(write=False)
+    return sig
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(sig_a == sig_b))
+
+
+def near_dup_filter(
+    items: Sequence[T],
+    text: Callable[[T], str],
+    score: Callable[[T], float],
+    *,
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    shingle: int = 3,
+) -> Tuple[List[T], int]:
+    """Keep the best-scored item of each near-duplicate cluster.
+
+    점수 내림차순(동점이면 입력 순서)으로 보면서, 이미 남긴 항목과의 추정 Jaccard 가
+    *threshold* 이상이면 버린다. 결과는 입력 순서를 유지한다.
+
+    Returns:
+        (남은 항목, 제거한 개수)
+    """
+    sigs = [signature(text(item), num_perm, shingle) for item in items]
+    order = sorted(range(len(items)), key=lambda i: (-score(items[i]), i))
+    kept: List[int] = []
+    for i in order:
+        if all(estimate_jaccard(sigs[i], sigs[j]) < threshold for j in kept):
+            kept.append(i)
+    keep = set(kept)
+    return [item for i, item in enumerate(items) if i in keep], len(items) - len(keep)
@@ -0,0 +1,138 @@
+"""Process-wide holder for the KB vector store and its embeddings client.
+
+``AzureSearch`` 와 ``AzureOpenAIEmbeddings`` 는 생성될 때마다 각자의 HTTP
+세션(커넥션 풀)을 새로 만든다. 쿼리마다 새로 생성하면 TLS 핸드셰이크가 매번
+발생하므로, 한 번 만든 클라이언트를 프로세스 전체에서 공유한다.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["StoreManager", "StoreStats"]
+
+VS = TypeVar("VS")
+
+
+@dataclass
+class StoreStats:
+    """Connection reuse counters exposed by :class:`StoreManager`."""
+
+    vectorstore_builds: int = 0
+    vectorstore_reuses: int = 0
+    embeddings_builds: int = 0
+    embeddings_reuses: int = 0
+    resets: int = 0
+
+
+class StoreManager(Generic[VS]):
+    """Thread-safe lazy singleton for a vector store and its embeddings client.
+
+    Args:
+        vectorstore_factory: 공유 임베딩 클라이언트를 받아 벡터 스토어를 생성하는 함수.
+        embeddings_factory: 임베딩 클라이언트를 생성하는 함수.
+    """
+
+    def __init__(
+        self,
+        vectorstore_factory: Callable[[Embeddings], VS],
+        embeddings_factory: Callable[[], Embeddings],
+    ) -> None:
+        self._vectorstore_factory = vectorstore_factory
+        self._embeddings_factory = embeddings_factory
+        self._lock = threading.RLock()
+        self._vectorstore: Optional[VS] = None
+        self._embeddings: Optional[Embeddings] = None
+        self._stats = StoreStats()
+
+    # ------------------------------------------------------------------ #
+    # Accessors
+    # ------------------------------------------------------------------ #
+
+    def get_embeddings(self) -> Embeddings:
+        """Return the shared embeddings client, building it on first use."""
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = self._embeddings_factory()
+                self._stats.embeddings_builds += 1
+            else:
+                self._stats.embeddings_reuses += 1
+            return self._embeddings
+
+    def get_vectorstore(self) -> VS:
+        """Return the shared vector store, building it on first use."""
+        with self._lock:
+            if self._vectorstore is None:
+                self._vectorstore = self._vectorstore_factory(self.get_embeddings())
+                self._stats.vectorstore_builds += 1
+            else:
+                self._stats.vectorstore_reuses += 1
+            return self._vectorstore
+
+    # ------------------------------------------------------------------ #
+    # Health / reset hooks
+    # ------------------------------------------------------------------ #
+
+    def health(self, *, probe: bool = False) -> Dict[str, Any]:
+        """Return readiness information and reuse counters.
+
+        Args:
+            probe: *True* 이면 공유 클라이언트로 문서 수 조회를 한 번 수행해
+                실제 연결 상태까지 확인한다.
+
+        Returns:
+            ``{"ready": bool, "ok": bool, "stats": {...}}`` 형태의 dict.
+            probe 실패 시 ``error`` 키에 예외 메시지가 담긴다.
+        """
+        with self._lock:
+            report: Dict[str, Any] = {
+                "ready": self._vectorstore is not None,
+                "ok": True,
+                "stats": asdict(self._stats),
+            }
+            # CachedEmbeddings 등 자체 지표를 가진 임베딩 클라이언트면 함께 노출한다.
+            cache_stats = getattr(self._embeddings, "stats", None)
+            if callable(cache_stats):
+                report["embedding_cache"] = cache_stats()
+        if not probe:
+            return report
+
+        try:
+            client = getattr(self.get_vectorstore(), "client", None)
+            if client is not None and hasattr(client, "get_document_count"):
+                report["document_count"] = client.get_document_count()
+        except Exception as exc:
+            logger.warning("Vector store health probe failed: %s", exc)
+            report["ok"] = False
+            report["error"] = str(exc)
+        report["ready"] = self._vectorstore is not None
+        return report
+
+    def reset(self) -> None:
+        """Drop the cached clients so the next access rebuilds them.
+
+        설정 변경이나 연결 오류 이후 호출한다. 기존 검색 클라이언트는 가능한 경우 닫는다.
+        """
+        with self._lock:
+            old = self._vectorstore
+            self._vectorstore = None
+            self._embeddings = None
+            self._stats.resets += 1
+
+        client = getattr(old, "client", None)
+        if client is not None and hasattr(client, "close"):
+            try:
+                client.close()
+            except Exception as exc:
+                logger.debug("Ignoring error while closing search client: %s", exc)
+
+    def stats(self) -> StoreStats:
+        """Return a snapshot of the reuse counters."""
+        with self._lock:
+            return StoreStats(**asdict(self._stats))
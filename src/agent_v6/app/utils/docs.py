@@ -0,0 +1,48 @@
+"""Stable keys and shared helpers for retrieved documents and evidence dicts."""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+__all__ = ["RELEVANCE_SCORE_KEY", "dedup_evidence", "doc_key", "evidence_relevance", "evidence_source"]
+
+# 검색 relevance score 를 담는 Document.metadata 키 (evidence_grader 의 점수 구간 판정에 사용)
+RELEVANCE_SCORE_KEY = "relevance_score"
+
+
+def _source_and_text(item: Any) -> Tuple[str, str]:
+    if isinstance(item, Document):
+        return str((item.metadata or {}).get("source") or ""), item.page_content or ""
+    if isinstance(item, dict):
+        source = item.get("source") or (item.get("metadata") or {}).get("source") or ""
+        return str(source), str(item.get("content") or item.get("text") or "")
+    return "", str(item)
+
+
+def doc_key(item: Any) -> str:
+    """Return a stable key for a ``Document`` or evidence dict: ``<source>#<sha1(content)[:16]>``."""
+    source, text = _source_and_text(item)
+    return f"{source}#{hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]}"
+
+
+def evidence_source(e: Dict[str, Any]) -> str:
+    """Return the evidence ``source`` (top level first, then ``metadata``)."""
+    return e.get("source") or (e.get("metadata") or {}).get("source") or ""
+
+
+def dedup_evidence(ev: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """출처+본문 기준 중복 제거(후행 항목으로 갱신, 처음 위치 유지). ``source`` 는 최상위로 올린다."""
+    seen: Dict[str, Dict[str, Any]] = {}
+    for e in ev or []:
+        seen[doc_key(e)] = {**e, "source": evidence_source(e)}
+    return list(seen.values())
+
+
+def evidence_relevance(e: Dict[str, Any], unscored: float) -> float:
+    """정렬용 관련도: LLM ``grade_score`` → 검색 ``relevance_score`` → *unscored*."""
+    for score in (e.get("grade_score"), (e.get("metadata") or {}).get(RELEVANCE_SCORE_KEY)):
+        if isinstance(score, (int, float)):
+            return float(score)
+    return unscored
@@ -0,0 +1,153 @@
+"""SQLite key/value store with per-entry TTL and size-based LRU eviction.
+
+임베딩 디스크 캐시(:mod:`agent_v6.app.retrievers.embedding_cache`)와 LLM 응답 캐시
+(:mod:`agent_v6.app.llm_cache`)가 함께 쓰는 저장 계층이다. 값은 바이트열로 저장하고,
+직렬화는 호출자가 맡는다.
+
+- 읽기 적중 시 접근 시각은 메모리에 모았다가 ``touch_batch`` 개마다, 그리고 쓰기·제거·종료 때
+  한 번에 기록한다. 적중마다 ``UPDATE`` + ``commit`` 하지 않으므로 읽기 경로가 가볍다.
+- 전체 크기가 ``max_bytes`` 를 넘으면 만료된 항목을 먼저 지우고, 그래도 넘치면 90% 까지 LRU 로 줄인다.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+__all__ = ["SQLiteLRUStats", "SQLiteLRUStore"]
+
+
+@dataclass
+class SQLiteLRUStats:
+    """Counters for :class:`SQLiteLRUStore`."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+
+class SQLiteLRUStore:
+    """Thread-safe SQLite byte store.
+
+    Args:
+        path: SQLite 파일 경로.
+        max_bytes: 최대 저장 크기(바이트). 0 이하이면 제한하지 않는다.
+        touch_batch: 모아 두었다가 한 번에 기록할 접근 시각 갱신 수.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache ("
+        " key TEXT PRIMARY KEY, value BLOB NOT NULL, tag TEXT NOT NULL DEFAULT '', nbytes INTEGER NOT NULL,"
+        " expires REAL NOT NULL, accessed REAL NOT NULL)"
+    )
+
+    def __init__(self, path: str, max_bytes: int = 0, *, touch_batch: int = 64) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self._SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._touch_batch = max(1, touch_batch)
+        self._touched: Dict[str, float] = {}
+        self._stats = SQLiteLRUStats()
+        row = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM cache").fetchone()
+        self._total_bytes = int(row[0])
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value for *key*, or *None* on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, nbytes, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            value, nbytes, expires = row
+            if expires <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._touched.pop(key, None)
+                self._total_bytes -= int(nbytes)
+                self._stats.expired += 1
+                self._stats.misses += 1
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self._touch_batch:
+                self._flush_touches_locked()
+                self._conn.commit()
+            self._stats.hits += 1
+        return bytes(value)
+
+    def put(self, key: str, value: bytes, *, ttl_s: float = 0.0, tag: str = "") -> int:
+        """Store *value* for *ttl_s* seconds (``ttl_s <= 0`` never expires).
+
+        Returns:
+            크기 제한 때문에 LRU 로 제거된 항목 수.
+        """
+        now = time.time()
+        expires = now + ttl_s if ttl_s > 0 else float("inf")
+        with self._lock:
+            old = self._conn.execute("SELECT nbytes FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache(key, value, tag, nbytes, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, tag, len(value), expires, now),
+            )
+            self._touched.pop(key, None)
+            self._total_bytes += len(value) - (int(old[0]) if old else 0)
+            evicted = self._evict_locked(now)
+            self._conn.commit()
+        return evicted
+
+    def _flush_touches_locked(self) -> None:
+        if self._touched:
+            self._conn.executemany("UPDATE cache SET accessed = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    def _evict_locked(self, now: float) -> int:
+        if self._max_bytes <= 0 or self._total_bytes <= self._max_bytes:
+            return 0
+        # 최근 읽힌 항목이 먼저 지워지지 않도록 모아 둔 접근 시각부터 기록한다.
+        self._flush_touches_locked()
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM cache WHERE expires <= ?", (now,)).fetchone()
+        self._conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+        self._total_bytes -= int(row[1])
+        self._stats.expired += int(row[0])
+        # 한 번에 90% 까지 줄여서 경계 근처에서 매 put 마다 삭제가 일어나지 않게 한다.
+        target = int(self._max_bytes * 0.9)
+        evicted = 0
+        for key, nbytes in self._conn.execute("SELECT key, nbytes FROM cache ORDER BY accessed ASC").fetchall():
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._total_bytes -= int(nbytes)
+            evicted += 1
+        self._stats.evictions += evicted
+        return evicted
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> SQLiteLRUStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return SQLiteLRUStats(**asdict(self._stats))
+
+    def flush(self) -> None:
+        """Write pending access times."""
+        with self._lock:
+            self._flush_touches_locked()
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touches_locked()
+            self._conn.commit()
+            self._conn.close()
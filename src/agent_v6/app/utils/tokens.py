@@ -0,0 +1,72 @@
+"""Token counting with the chat deployment's tokenizer.
+
+``tiktoken`` 인코딩을 모델 이름으로 찾고, 모르는 배포 이름이면 ``o200k_base`` 를 쓴다.
+인코딩 파일을 받을 수 없는 환경(오프라인 등)에서는 UTF-8 바이트 수 기반 근사치로 대신한다.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Optional
+
+__all__ = ["Tokenizer", "get_tokenizer"]
+
+logger = logging.getLogger(__name__)
+
+_FALLBACK_ENCODING = "o200k_base"
+# 근사치: 토큰 하나당 UTF-8 바이트 수 (영문 ~4, 한글 ~3 → 보수적으로 3)
+_APPROX_BYTES_PER_TOKEN = 3
+
+
+class Tokenizer:
+    """Count and truncate text in tokens.
+
+    Args:
+        encoding: ``tiktoken.Encoding``. *None* 이면 바이트 수 기반 근사치를 쓴다.
+    """
+
+    def __init__(self, encoding: Optional[Any] = None) -> None:
+        self._encoding = encoding
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text.encode("utf-8")) / _APPROX_BYTES_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Return the longest prefix of *text* that fits in *max_tokens*."""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return text if len(tokens) <= max_tokens else self._encoding.decode(tokens[:max_tokens])
+        budget = max_tokens * _APPROX_BYTES_PER_TOKEN
+        return text.encode("utf-8")[:budget].decode("utf-8", errors="ignore")
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(model: str) -> Tokenizer:
+    """Return a (cached) tokenizer for *model* (e.g. the chat deployment name)."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed; using approximate token counts")
+        return Tokenizer()
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding(_FALLBACK_ENCODING)
+    except Exception as exc:
+        # 인코딩 파일 다운로드 실패 등
+        logger.warning("Tokenizer for %r unavailable (%s); using approximate token counts", model, exc)
+        return Tokenizer()
+    return Tokenizer(encoding)
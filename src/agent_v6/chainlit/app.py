@@ -2,10 +2,11 @@ import chainlit as cl
 from chainlit.input_widget import Slider, Switch
 from langchain_core.messages import HumanMessage
 
-from agent_v6.app.graph.build_graph import build_graph
+from agent_v6.app.graph.build_graph import build_async_graph
 from agent_v6.app.graph.state import GraphState
+from agent_v6.app.graph.streaming import astream_answer
 
-graph = build_graph()
+graph = build_async_graph()
 
 
 @cl.on_chat_start
@@ -37,5 +38,26 @@ async def on_msg(m: cl.Message):
         step=0,
         max_steps=max_steps,
     )
-    result = graph.invoke(state)
-    await cl.Message(content=result.get("answer", "(no answer)")).send()
+    # generate 토큰은 도착하는 대로 보여주고, faithfulness 결과는 끝난 뒤 반영한다.
+    reply = cl.Message(content="")
+    result: dict = {}
+    async for event in astream_answer(graph, state):
+        if event.kind == "token":
+            await reply.stream_token(event.text)
+        elif event.kind == "reset":
+            # 재시도 루프: 이전 초안을 지우고 새 답변을 다시 받는다.
+            reply.content = ""
+            await reply.update()
+        else:
+            result = event.state
+
+    answer = (result.get("answer") or "").strip() or "(no answer)"
+    streamed = reply.content.strip()
+    if not streamed:
+        # 캐시 적중 등으로 스트리밍된 토큰이 없으면 최종 답변을 그대로 보낸다.
+        reply.content = answer
+    await reply.send()
+    if streamed and answer != streamed:
+        # faithfulness 가 답변을 고친 경우 후속 편집으로 교체한다.
+        reply.content = answer
+        await reply.update()
@@ -0,0 +1,31 @@
+"""로컬 memory-mapped KB 인덱스를 생성하는 스크립트.
+
+Usage:
+  uv run python -m agent_v6.scripts.build_local_index [--out DIR]
+
+생성 후 ``KB_BACKEND=local`` 로 실행하면 ``retrieve_kb`` 가 Azure AI Search 없이 동작한다.
+"""
+import argparse
+import sys
+
+from agent_v6.app.config import retriever_cfg
+from agent_v6.app.retrievers.local_store import build_local_index
+
+
+def main(argv: list[str] | None = None) -> int:
+    """``ground_docs`` 를 임베딩해 로컬 인덱스로 저장한다."""
+    p = argparse.ArgumentParser(description="Build the local KB vector index")
+    p.add_argument("--out", default=retriever_cfg.local_index_dir, help="인덱스 출력 디렉터리")
+    p.add_argument("--batch-size", type=int, default=256, help="임베딩 배치 크기")
+    args = p.parse_args(argv)
+
+    count = build_local_index(args.out, batch_size=args.batch_size)
+    if not count:  # 엣지 케이스: 적재할 문서가 없는 경우
+        print("Index 대상 문서가 없습니다.")
+        return 0
+    print(f"Indexed {count} chunks into {args.out}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,120 @@
+"""토큰 예산 evidence 패킹(`agent_v6.app.graph.nodes.generate.pack_evidence`) 테스트."""
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from typing import List
+
+import pytest
+
+from agent_v6.app.graph.nodes import generate as gen_mod
+from agent_v6.app.utils.tokens import Tokenizer
+
+
+class _CharEncoding:
+    """글자 하나 = 토큰 하나인 테스트용 인코딩."""
+
+    def encode(self, text: str, disallowed_special=()) -> List[str]:
+        return list(text)
+
+    def decode(self, tokens: List[str]) -> str:
+        return "".join(tokens)
+
+
+_TOK = Tokenizer(_CharEncoding())
+
+
+@pytest.fixture(autouse=True)
+def _cfg(monkeypatch):
+    cfg = replace(gen_mod.generate_cfg, max_item_tokens=100, max_items_per_source=2, min_item_tokens=10, unscored_score=0.8)
+    monkeypatch.setattr(gen_mod, "generate_cfg", cfg)
+
+
+def _ev(source: str, content: str, **extra) -> dict:
+    return {"source": source, "content": content, **extra}
+
+
+def test_orders_by_relevance_and_records_usage():
+    ev = [
+        _ev("KB:low", "낮은 점수 문서", metadata={"relevance_score": 0.76}),
+        _ev("WEB:https://x", "점수 없는 웹 문서"),
+        _ev("KB:top", "가장 관련 있는 문서", grade_score=0.95),
+    ]
+
+    lines, stats = gen_mod.pack_evidence(ev, tokenizer=_TOK, budget=1000)
+
+    assert [ln.split(" :: ")[0] for ln in lines] == ["- KB:top", "- WEB:https://x", "- KB:low"]
+    assert stats.tokens == sum(len(ln) for ln in lines)
+    assert (stats.items, stats.dropped, stats.truncated, stats.cut_tokens) == (3, 0, 0, 0)
+
+
+def test_budget_truncates_then_drops_and_counts_cut_tokens():
+    ev = [_ev(f"KB:{i}", "가" * 60, grade_score=1 - i / 10) for i in range(3)]
+    full = len(gen_mod._line_parts({**ev[0], "source": "KB:0"})[0]) + 60
+
+    lines, stats = gen_mod.pack_evidence(ev, tokenizer=_TOK, budget=full + 30)
+
+    assert len(lines) == 2 and lines[1].endswith("…")
+    assert sum(len(ln) for ln in lines) <= full + 30
+    assert (stats.items, stats.truncated, stats.dropped) == (2, 1, 1)
+    assert stats.cut_tokens == 2 * full - (stats.tokens - full)
+
+
+def test_per_source_cap_and_duplicates():
+    ev = [_ev("KB:same", f"청크 {i}") for i in range(4)] + [_ev("KB:same", "청크 0"), _ev("KB:other", "다른 문서")]
+
+    lines, stats = gen_mod.pack_evidence(ev, tokenizer=_TOK, budget=1000)
+
+    assert stats.candidates == 5
+    assert [ln.split(" :: ")[0] for ln in lines] == ["- KB:same", "- KB:same", "- KB:other"]
+    assert stats.dropped == 2
+
+
+def test_generate_reports_packing_stats(monkeypatch):
+    monkeypatch.setattr(gen_mod, "get_tokenizer", lambda _model: _TOK)
+    monkeypatch.setattr(gen_mod, "chat", lambda messages, node=None: "답변 [KB:a]")
+
+    out = gen_mod.generate({"messages": [{"role": "user", "content": "질문"}], "evidence": [_ev("KB:a", "근거")]})
+
+    assert out["answer"] == "답변 [KB:a]"
+    assert out["evidence_packing"]["items"] == 1
+    assert out["evidence_packing"]["exact"] is True
+
+
+def test_approximate_tokenizer_without_encoding():
+    tok = Tokenizer()
+
+    assert not tok.exact
+    assert tok.count("abc") == 1
+    assert tok.truncate("가나다라", 2) == "가나"
+
+
+def test_presorted_keeps_input_order():
+    ev = [_ev("KB:low", "낮은 점수", grade_score=0.2), _ev("KB:high", "높은 점수", grade_score=0.9)]
+
+    lines, _ = gen_mod.pack_evidence(ev, tokenizer=_TOK, budget=1000, presorted=True)
+
+    assert [ln.split(" :: ")[0] for ln in lines] == ["- KB:low", "- KB:high"]
+
+
+def test_faithfulness_judges_the_packed_prompt_evidence(monkeypatch):
+    from agent_v6.app.graph.nodes import faithfulness as faith_mod
+
+    monkeypatch.setattr(gen_mod, "get_tokenizer", lambda _model: _TOK)
+    monkeypatch.setattr(gen_mod, "chat", lambda messages, node=None: "답변 [KB:kept]")
+    long_text = "가" * 300
+    state = {
+        "messages": [{"role": "user", "content": "질문"}],
+        "evidence": [_ev("KB:kept", long_text), _ev("KB:dropped", "재정렬에서 빠진 문서")],
+        "ranked_evidence": [_ev("KB:kept", long_text)],
+    }
+    state.update(gen_mod.generate(state))
+
+    evidence, packed = faith_mod._judged_evidence(state)
+    judged = json.loads(faith_mod._judge_messages(state["answer"], evidence, packed)[-1]["content"])["evidence"]
+
+    assert packed and [e["source"] for e in evidence] == ["KB:kept"]
+    assert "KB:dropped" not in judged
+    # 프롬프트에 잘려 들어간 본문과 같은 본문으로 판정한다.
+    assert judged == f"- KB:kept: {state['packed_evidence'][0]['content']}"
+    assert state["packed_evidence"][0]["content"].endswith("…")
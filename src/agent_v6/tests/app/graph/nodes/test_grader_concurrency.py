@@ -0,0 +1,77 @@
+"""동시 개별 채점(`agent_v6.app.graph.nodes.grader`) 테스트."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from agent_v6.app.graph.nodes import grader as gr_mod
+
+_DOCS = [{"content": f"문서 {i}", "source": f"KB:{i}"} for i in range(4)]
+
+
+class _SlowLLM:
+    """후보마다 *delays* 만큼 지연되는 structured-output LLM 스텁. 홀수 문서는 무관."""
+
+    def __init__(self, delays: Dict[str, float]) -> None:
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def with_structured_output(self, _schema: Any) -> "_SlowLLM":
+        return self
+
+    def invoke(self, messages: List[Dict[str, str]]) -> Any:
+        candidate = json.loads(messages[-1]["content"])["candidate"]
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delays.get(candidate, 0.2))
+        finally:
+            with self.lock:
+                self.active -= 1
+        return gr_mod._RelResult(relevant=int(candidate.split()[-1]) % 2 == 0)
+
+
+def _use(monkeypatch, llm: _SlowLLM, **overrides: Any) -> None:
+    cfg = replace(gr_mod.grader_cfg, mode="pointwise", **overrides)
+    monkeypatch.setattr(gr_mod, "get_llm", lambda: llm, raising=False)
+    monkeypatch.setattr(gr_mod, "grader_cfg", cfg, raising=False)
+
+
+def test_pointwise_calls_run_concurrently_and_keep_order(monkeypatch):
+    llm = _SlowLLM({"문서 0": 0.3})
+    _use(monkeypatch, llm, max_concurrency=4, timeout_s=0)
+
+    started = time.perf_counter()
+    res = gr_mod._llm_filter("q", _DOCS)
+    elapsed = time.perf_counter() - started
+
+    assert [e["source"] for e in res] == ["KB:0", "KB:2"]
+    assert llm.peak == 4
+    assert elapsed < 0.6  # 직렬이면 0.3 + 0.2 * 3 = 0.9s
+
+
+def test_max_concurrency_bounds_in_flight_calls(monkeypatch):
+    llm = _SlowLLM({})
+    _use(monkeypatch, llm, max_concurrency=2, timeout_s=0)
+
+    gr_mod._llm_filter("q", _DOCS)
+
+    assert llm.peak == 2
+
+
+def test_node_timeout_keeps_ungraded_candidates(monkeypatch):
+    llm = _SlowLLM({"문서 1": 2.0, "문서 3": 0.0})
+    _use(monkeypatch, llm, max_concurrency=4, timeout_s=0.5)
+
+    started = time.perf_counter()
+    res = gr_mod._llm_filter("q", _DOCS)
+
+    assert time.perf_counter() - started < 1.5
+    # 문서 1 은 시간 초과로 판정되지 않아 유지(fail-open), 문서 3 은 무관으로 제거된다.
+    assert [e["source"] for e in res] == ["KB:0", "KB:1", "KB:2"]
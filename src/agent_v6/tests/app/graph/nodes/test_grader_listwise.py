@@ -0,0 +1,143 @@
+"""Listwise 채점(`agent_v6.app.graph.nodes.grader`) 테스트."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from agent_v6.app.graph.nodes import grader as gr_mod
+
+_DOCS = [
+    {"content": "파이썬은 인터프리터 언어다", "source": "KB:1"},
+    {"content": "자바는 컴파일 언어다", "source": "KB:2"},
+    {"content": "고양이는 야행성 동물이다", "source": "KB:3"},
+]
+
+
+class _FakeStructuredLLM:
+    def __init__(self, schema: Any, owner: "_FakeLLM") -> None:
+        self.schema = schema
+        self.owner = owner
+
+    def invoke(self, messages: List[Dict[str, str]]) -> Any:
+        self.owner.calls.append(self.schema.__name__)
+        if self.schema is gr_mod._ListwiseResult:
+            if self.owner.listwise_error:
+                raise RuntimeError("boom")
+            return self.owner.listwise
+        # pointwise: "야행성" 이 들어간 후보만 무관하다고 판정
+        return gr_mod._RelResult(relevant="야행성" not in json.loads(messages[-1]["content"])["candidate"])
+
+
+class _FakeLLM:
+    def __init__(self, listwise: Any = None, listwise_error: bool = False) -> None:
+        self.listwise = listwise
+        self.listwise_error = listwise_error
+        self.calls: List[str] = []
+
+    def with_structured_output(self, schema: Any) -> _FakeStructuredLLM:
+        return _FakeStructuredLLM(schema, self)
+
+
+def _use(monkeypatch, llm: _FakeLLM, mode: str = "listwise") -> None:
+    monkeypatch.setattr(gr_mod, "get_llm", lambda: llm, raising=False)
+    monkeypatch.setattr(gr_mod, "grader_cfg", replace(gr_mod.grader_cfg, mode=mode), raising=False)
+
+
+def test_listwise_grades_all_candidates_in_one_call(monkeypatch):
+    verdicts = [
+        gr_mod._ListwiseVerdict(id=0, relevant=True, score=0.9),
+        gr_mod._ListwiseVerdict(id=1, relevant=False),
+        gr_mod._ListwiseVerdict(id=2, relevant=True),
+    ]
+    llm = _FakeLLM(gr_mod._ListwiseResult(verdicts=verdicts))
+    _use(monkeypatch, llm)
+
+    res = gr_mod._llm_filter("파이썬", _DOCS)
+
+    assert llm.calls == ["_ListwiseResult"]
+    assert [e["source"] for e in res] == ["KB:1", "KB:3"]
+    assert res[0]["grade_score"] == 0.9
+    assert "grade_score" not in _DOCS[0]
+
+
+def test_listwise_falls_back_to_pointwise_for_omitted_ids(monkeypatch):
+    llm = _FakeLLM(gr_mod._ListwiseResult(verdicts=[gr_mod._ListwiseVerdict(id=0, relevant=True), gr_mod._ListwiseVerdict(id=9)]))
+    _use(monkeypatch, llm)
+
+    res = gr_mod._llm_filter("파이썬", _DOCS)
+
+    assert llm.calls == ["_ListwiseResult", "_RelResult", "_RelResult"]
+    assert [e["source"] for e in res] == ["KB:1", "KB:2"]
+
+
+def test_listwise_failure_degrades_to_pointwise(monkeypatch):
+    llm = _FakeLLM(listwise_error=True)
+    _use(monkeypatch, llm)
+
+    res = gr_mod._llm_filter("파이썬", _DOCS)
+
+    assert llm.calls.count("_RelResult") == 3
+    assert [e["source"] for e in res] == ["KB:1", "KB:2"]
+
+
+def test_pointwise_mode_skips_listwise_call(monkeypatch):
+    llm = _FakeLLM()
+    _use(monkeypatch, llm, mode="pointwise")
+
+    res = gr_mod._llm_filter("파이썬", _DOCS)
+
+    assert llm.calls == ["_RelResult"] * 3
+    assert len(res) == 2
+
+
+class _SlowListwiseLLM(_FakeLLM):
+    """listwise 호출이 *delay* 초 걸리는 LLM (시간 초과 유도)."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+
+    def with_structured_output(self, schema: Any) -> Any:
+        owner = self
+
+        class _Slow(_FakeStructuredLLM):
+            def invoke(self, messages: List[Dict[str, str]]) -> Any:
+                if self.schema is gr_mod._ListwiseResult:
+                    owner.calls.append("_ListwiseResult")
+                    time.sleep(owner.delay)
+                    return gr_mod._ListwiseResult()
+                return super().invoke(messages)
+
+            async def ainvoke(self, messages: List[Dict[str, str]]) -> Any:
+                owner.calls.append(self.schema.__name__)
+                await asyncio.sleep(owner.delay)
+                return gr_mod._ListwiseResult()
+
+        return _Slow(schema, self)
+
+
+def test_listwise_timeout_skips_pointwise_fallback(monkeypatch):
+    llm = _SlowListwiseLLM(delay=0.5)
+    _use(monkeypatch, llm)
+    monkeypatch.setattr(gr_mod, "grader_cfg", replace(gr_mod.grader_cfg, timeout_s=0.05))
+
+    started = time.perf_counter()
+    res = gr_mod._llm_filter("파이썬", _DOCS)
+
+    assert time.perf_counter() - started < 0.4
+    assert llm.calls == ["_ListwiseResult"]
+    assert len(res) == 3  # fail-open
+
+
+def test_async_listwise_timeout_skips_pointwise_fallback(monkeypatch):
+    llm = _SlowListwiseLLM(delay=0.5)
+    _use(monkeypatch, llm)
+    monkeypatch.setattr(gr_mod, "grader_cfg", replace(gr_mod.grader_cfg, timeout_s=0.05))
+
+    res = asyncio.run(gr_mod._allm_filter("파이썬", _DOCS))
+
+    assert llm.calls == ["_ListwiseResult"]
+    assert len(res) == 3
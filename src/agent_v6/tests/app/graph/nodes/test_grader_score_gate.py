@@ -0,0 +1,88 @@
+"""검색 점수 구간 판정(`agent_v6.app.graph.nodes.grader`) 테스트."""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from langchain_core.documents import Document
+
+from agent_v6.app.config import GraderConfig
+from agent_v6.app.graph.nodes import grader as gr_mod
+from agent_v6.app.retrievers.aisearch_store import RELEVANCE_SCORE_KEY
+
+
+def _doc(text: str, score: float | None) -> Document:
+    meta: Dict[str, Any] = {"source": text}
+    if score is not None:
+        meta[RELEVANCE_SCORE_KEY] = score
+    return Document(page_content=text, metadata=meta)
+
+
+def _state(kb: List[Document], web: List[Document]) -> Dict[str, Any]:
+    return {"messages": [{"role": "user", "content": "질문"}], "kb_docs": kb, "web_docs": web}
+
+
+def test_gate_sends_only_ambiguous_band_to_llm(monkeypatch):
+    seen: List[List[str]] = []
+
+    def _fake_llm_filter(_q: str, evidences: List[Dict[str, Any]]):
+        seen.append([e["content"] for e in evidences])
+        return evidences[:1]
+
+    cfg = replace(gr_mod.grader_cfg, mode="pointwise", score_gate=True, accept_score=0.9, reject_score=0.75)
+    monkeypatch.setattr(gr_mod, "grader_cfg", cfg, raising=False)
+    monkeypatch.setattr(gr_mod, "flags", replace(gr_mod.flags, use_llm_grader=True), raising=False)
+    monkeypatch.setattr(gr_mod, "_llm_filter", _fake_llm_filter, raising=False)
+    before = gr_mod.gate_stats()
+
+    kb = [_doc("exact", 0.95), _doc("middle", 0.8), _doc("miss", 0.71)]
+    web = [_doc("web", None)]
+    res = gr_mod.evidence_grader(_state(kb, web))  # type: ignore[arg-type]
+
+    assert seen == [["middle", "web"]]
+    assert [e["content"] for e in res["evidence"]] == ["exact", "middle"]
+
+    after = gr_mod.gate_stats()
+    assert after.accepted - before.accepted == 1
+    assert after.rejected - before.rejected == 1
+    assert after.graded - before.graded == 2
+    assert after.llm_calls_saved - before.llm_calls_saved == 2
+
+
+def test_gate_saves_listwise_call_when_everything_is_clear_cut(monkeypatch):
+    calls: List[int] = []
+    cfg = replace(gr_mod.grader_cfg, mode="listwise", score_gate=True, accept_score=0.9, reject_score=0.75)
+    monkeypatch.setattr(gr_mod, "grader_cfg", cfg, raising=False)
+    monkeypatch.setattr(gr_mod, "get_llm", lambda: calls.append(1), raising=False)
+    before = gr_mod.gate_stats()
+
+    res = gr_mod._gated_filter("질문", [gr_mod._doc_to_dict(_doc("a", 0.97)), gr_mod._doc_to_dict(_doc("b", 0.5))])
+
+    assert [e["content"] for e in res] == ["a"]
+    assert calls == []
+    assert gr_mod.gate_stats().llm_calls_saved - before.llm_calls_saved == 1
+
+
+def test_gate_keeps_input_order_across_groups(monkeypatch):
+    cfg = replace(gr_mod.grader_cfg, score_gate=True, accept_score=0.9, reject_score=0.7)
+    monkeypatch.setattr(gr_mod, "grader_cfg", cfg, raising=False)
+    # listwise 처럼 grade_score 를 붙인 사본을 돌려주는 채점기
+    monkeypatch.setattr(gr_mod, "_llm_filter", lambda _q, evs: [{**e, "grade_score": 0.5} for e in evs], raising=False)
+
+    evs = [gr_mod._doc_to_dict(_doc(t, s)) for t, s in [("mid-1", 0.8), ("top", 0.95), ("low", 0.6), ("mid-2", 0.75)]]
+    res = gr_mod._gated_filter("질문", evs)
+
+    assert [e["content"] for e in res] == ["mid-1", "top", "mid-2"]
+    assert "grade_score" in res[0] and "grade_score" not in res[1]
+
+
+def test_gate_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(gr_mod, "grader_cfg", replace(gr_mod.grader_cfg, score_gate=False), raising=False)
+    seen: List[List[str]] = []
+    monkeypatch.setattr(gr_mod, "_llm_filter", lambda _q, evs: seen.append([e["content"] for e in evs]) or evs, raising=False)
+
+    evs = [gr_mod._doc_to_dict(_doc(t, s)) for t, s in [("a", 0.99), ("b", 0.71)]]
+
+    assert [e["content"] for e in gr_mod._gated_filter("질문", evs)] == ["a", "b"]
+    assert seen == [["a", "b"]]
+    assert GraderConfig().reject_score <= 0.7  # 검색 score_threshold(0.7) 보다 높지 않아야 한다
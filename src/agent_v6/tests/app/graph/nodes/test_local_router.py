@@ -0,0 +1,142 @@
+"""로컬 규칙 라우터와 `planner_router` 의 LLM 폴백 테스트."""
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+from typing import Any, List
+
+import pytest
+
+from agent_v6.app.graph.nodes import router as rt_mod
+from agent_v6.app.graph.nodes.local_router import local_route
+
+_TODAY = date(2026, 10, 18)
+
+
+@pytest.mark.parametrize(
+    "text, intent, need_web",
+    [
+        ("파이썬의 GIL 은 무엇인가요?", "new_topic", False),
+        ("오늘 서울 날씨 어때?", "new_topic", True),
+        ("2026년 노벨 물리학상 수상자는 누구야?", "new_topic", True),
+        ("이 문서를 세 줄로 요약해 줘", "task", False),
+        ("그럼 자바는 어떻게 달라?", "followup", False),
+        ("Summarize the latest news about GPUs", "task", True),
+        ("ㅇㅇ", "ambiguous", False),
+    ],
+)
+def test_local_route_decides_common_turns(text, intent, need_web):
+    route = local_route(text, today=_TODAY)
+
+    assert (route.intent, route.need_web) == (intent, need_web)
+    assert route.intent_confidence >= 0.7
+    assert route.confidence >= 0.7
+    # 웹 단서가 없다는 판정 자체는 약한 근거로 기록된다.
+    assert (route.web_confidence >= 0.7) is need_web
+
+
+def test_local_route_is_unsure_without_cues():
+    assert local_route("벡터 데이터베이스 인덱스 구조", today=_TODAY).confidence < 0.7
+    assert local_route("그럼 이 코드도 정리해 줘", today=_TODAY).confidence < 0.7  # task + followup 충돌
+    assert local_route("2019년 월드컵 우승국?", today=_TODAY).need_web is False
+
+
+class _FakeLLM:
+    def __init__(self, result: Any = None) -> None:
+        self.result = result
+        self.calls: List[Any] = []
+
+    def with_structured_output(self, _schema: Any) -> "_FakeLLM":
+        return self
+
+    def invoke(self, messages: Any) -> Any:
+        self.calls.append(messages)
+        if self.result is None:
+            raise RuntimeError("boom")
+        return self.result
+
+
+def _state(text: str, need_web: bool = True) -> dict:
+    return {"messages": [{"role": "user", "content": text}], "need_web": need_web}
+
+
+def _delta(before: rt_mod.RouterStats) -> dict:
+    after = rt_mod.router_stats()
+    return {k: getattr(after, k) - getattr(before, k) for k in ("local", "llm", "llm_errors", "skipped")}
+
+
+def test_confident_turn_skips_llm(monkeypatch):
+    llm = _FakeLLM(rt_mod.RouterResult(intent="task", need_web=False))
+    monkeypatch.setattr(rt_mod, "get_llm", lambda: llm)
+    before = rt_mod.router_stats()
+
+    res = rt_mod.planner_router(_state("최신 GPU 뉴스 알려줘"))
+
+    assert llm.calls == []
+    assert (res.intent, res.need_web) == ("new_topic", True)
+    assert _delta(before) == {"local": 1, "llm": 0, "llm_errors": 0, "skipped": 0}
+
+
+def test_user_web_preference_still_wins(monkeypatch):
+    monkeypatch.setattr(rt_mod, "get_llm", lambda: _FakeLLM())
+
+    assert rt_mod.planner_router(_state("최신 GPU 뉴스 알려줘", need_web=False)).need_web is False
+
+
+def test_low_confidence_falls_back_to_llm(monkeypatch):
+    llm = _FakeLLM(rt_mod.RouterResult(intent="task", need_web=True))
+    monkeypatch.setattr(rt_mod, "get_llm", lambda: llm)
+    before = rt_mod.router_stats()
+
+    res = rt_mod.planner_router(_state("벡터 데이터베이스 인덱스 구조"))
+
+    assert len(llm.calls) == 1
+    assert (res.intent, res.need_web) == ("task", True)
+    assert _delta(before) == {"local": 0, "llm": 1, "llm_errors": 0, "skipped": 0}
+
+
+def test_threshold_above_one_always_uses_llm(monkeypatch):
+    llm = _FakeLLM()
+    monkeypatch.setattr(rt_mod, "get_llm", lambda: llm)
+    monkeypatch.setattr(rt_mod, "router_cfg", replace(rt_mod.router_cfg, local_min_confidence=1.1))
+    before = rt_mod.router_stats()
+
+    rt_mod.planner_router(_state("오늘 서울 날씨 어때?"))
+
+    assert len(llm.calls) == 1
+    assert _delta(before) == {"local": 0, "llm": 1, "llm_errors": 1, "skipped": 0}
+
+
+def test_no_web_cue_turns_are_local_with_default_web_switch(monkeypatch):
+    # Chainlit 의 use_web 스위치 기본값(True) 그대로인 일반 질문들
+    questions = [
+        "파이썬의 GIL 은 무엇인가요?",
+        "쿠버네티스 파드와 디플로이먼트 차이를 설명해 줘",
+        "How does TCP congestion control work?",
+        "이 문서를 세 줄로 요약해 줘",
+        "그럼 자바는 어떻게 달라?",
+    ]
+    llm = _FakeLLM()
+    monkeypatch.setattr(rt_mod, "get_llm", lambda: llm)
+    before = rt_mod.router_stats()
+
+    results = [rt_mod.planner_router(_state(q, need_web=True)) for q in questions]
+
+    assert llm.calls == []
+    assert [r.need_web for r in results] == [False] * len(questions)
+    assert _delta(before) == {"local": len(questions), "llm": 0, "llm_errors": 0, "skipped": 0}
+
+
+def test_no_web_cue_is_decided_locally_when_web_is_off(monkeypatch):
+    llm = _FakeLLM()
+    monkeypatch.setattr(rt_mod, "get_llm", lambda: llm)
+
+    res = rt_mod.planner_router(_state("파이썬의 GIL 은 무엇인가요?", need_web=False))
+
+    assert llm.calls == []
+    assert (res.intent, res.need_web) == ("new_topic", False)
+
+
+def test_fallback_coerces_unknown_intent():
+    assert rt_mod._fallback({"intent": "chitchat", "need_web": True}).intent == "new_topic"  # type: ignore[typeddict-item]
+    assert rt_mod._fallback({"intent": "task"}).intent == "task"
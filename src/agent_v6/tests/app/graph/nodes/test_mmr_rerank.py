@@ -0,0 +1,74 @@
+"""MMR 재정렬(`agent_v6.app.graph.nodes.rerank`) 테스트."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from agent_v6.app.graph import build_graph as bg_mod
+from agent_v6.app.graph.nodes import rerank as rr_mod
+from agent_v6.app.retrievers.doc_vectors import DocVectorCache
+
+
+@pytest.fixture(autouse=True)
+def _cache(monkeypatch):
+    cache = DocVectorCache(16)
+    monkeypatch.setattr(rr_mod, "doc_vectors", cache)
+    monkeypatch.setattr(rr_mod, "rerank_cfg", replace(rr_mod.rerank_cfg, mmr_lambda=0.5, top_n=2))
+    return cache
+
+
+def _ev(source: str, content: str, score: float) -> dict:
+    return {"source": source, "content": content, "grade_score": score}
+
+
+def test_near_synonymous_chunks_are_diversified(_cache):
+    ev = [_ev("KB:a", "연차 신청 방법", 0.95), _ev("KB:a2", "연차를 신청하는 방법", 0.94), _ev("KB:b", "병가 규정", 0.8)]
+    _cache.put(ev[0], [1.0, 0.0])
+    _cache.put(ev[1], [0.99, 0.05])
+    _cache.put(ev[2], [0.0, 1.0])
+
+    out = rr_mod.mmr_rerank({"evidence": ev})
+
+    assert [e["source"] for e in out["ranked_evidence"]] == ["KB:a", "KB:b"]
+
+
+def test_vectorless_items_get_no_redundancy_penalty(_cache):
+    ev = [_ev("KB:a", "본문", 0.9), _ev("KB:a2", "거의 같은 본문", 0.85), _ev("WEB:https://x", "웹 결과", 0.8)]
+    _cache.put(ev[0], [1.0, 0.0])
+    _cache.put(ev[1], [1.0, 0.0])
+
+    out = rr_mod.mmr_rerank({"evidence": ev})
+
+    assert [e["source"] for e in out["ranked_evidence"]] == ["KB:a", "WEB:https://x"]
+
+
+def test_without_any_vectors_falls_back_to_relevance_order():
+    ev = [_ev("KB:low", "낮음", 0.3), _ev("KB:high", "높음", 0.9), _ev("KB:mid", "중간", 0.6)]
+
+    out = rr_mod.mmr_rerank({"evidence": ev})
+
+    assert [e["source"] for e in out["ranked_evidence"]] == ["KB:high", "KB:mid"]
+
+
+def test_async_rerank_matches_sync(_cache):
+    ev = [_ev("KB:a", "연차 신청 방법", 0.95), _ev("KB:a2", "연차를 신청하는 방법", 0.94), _ev("KB:b", "병가 규정", 0.8)]
+    _cache.put(ev[0], [1.0, 0.0])
+    _cache.put(ev[1], [0.99, 0.05])
+
+    assert asyncio.run(rr_mod.ammr_rerank({"evidence": ev})) == rr_mod.mmr_rerank({"evidence": ev})
+
+
+def test_mmr_order_is_pure_relevance_when_lambda_is_one():
+    vectors = np.eye(3, dtype=np.float32)
+    assert rr_mod.mmr_order(np.array([0.1, 0.9, 0.5]), vectors, 3, 1.0) == [1, 2, 0]
+
+
+def test_graph_inserts_rerank_between_grade_and_generate():
+    edges = {(e.source, e.target) for e in bg_mod.build_graph(mmr_rerank=True).get_graph().edges}
+    assert {("grade", "rerank"), ("rerank", "generate")} <= edges
+
+    edges = {(e.source, e.target) for e in bg_mod.build_graph(mmr_rerank=False).get_graph().edges}
+    assert ("grade", "generate") in edges
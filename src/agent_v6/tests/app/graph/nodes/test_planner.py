@@ -0,0 +1,71 @@
+"""router + rewrite 통합 `planner` 노드 테스트."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List
+
+from agent_v6.app.graph import build_graph as bg_mod
+from agent_v6.app.graph.nodes import planner as pl_mod
+
+
+class _FakeLLM:
+    def __init__(self, result: Any = None) -> None:
+        self.result = result
+        self.calls: List[Any] = []
+
+    def with_structured_output(self, schema: Any) -> "_FakeLLM":
+        assert schema is pl_mod.PlannerResult
+        return self
+
+    def invoke(self, messages: Any) -> Any:
+        self.calls.append(messages)
+        if self.result is None:
+            raise RuntimeError("boom")
+        return self.result
+
+    async def ainvoke(self, messages: Any) -> Any:
+        return self.invoke(messages)
+
+
+def _state(**extra: Any) -> dict:
+    return {"messages": [{"role": "user", "content": "파이썬 GIL"}], "need_web": True, "step": 0, **extra}
+
+
+def test_planner_returns_route_and_sanitized_queries_in_one_call(monkeypatch):
+    llm = _FakeLLM(pl_mod.PlannerResult(intent="task", need_web=True, queries=["  GIL   설명 ", "gil 설명", "파이썬 GIL 동작"]))
+    monkeypatch.setattr(pl_mod, "get_llm", lambda: llm)
+
+    out = pl_mod.planner(_state())
+
+    assert len(llm.calls) == 1
+    queries = ["GIL 설명", "파이썬 GIL 동작"]
+    assert out == {"intent": "task", "need_web": True, "queries": queries, "searched_queries": queries, "step": 1}
+
+
+def test_planner_honors_user_web_preference_and_retry_hint(monkeypatch):
+    llm = _FakeLLM(pl_mod.PlannerResult(intent="new_topic", need_web=True, queries=["q"]))
+    monkeypatch.setattr(pl_mod, "get_llm", lambda: llm)
+    faith = {"faithful": False, "issues": ["근거 없는 수치"]}
+
+    out = asyncio.run(pl_mod.aplanner(_state(need_web=False, faithfulness=faith, step=1)))
+
+    assert out["need_web"] is False
+    assert out["queries"] == ["q", "파이썬 GIL"]
+    assert out["step"] == 2
+    assert "근거 없는 수치" in llm.calls[0][-1]["content"]
+
+
+def test_planner_failure_falls_back_to_state_and_user_text(monkeypatch):
+    monkeypatch.setattr(pl_mod, "get_llm", lambda: _FakeLLM())
+
+    out = pl_mod.planner(_state(intent="followup"))
+
+    assert (out["intent"], out["need_web"], out["queries"], out["step"]) == ("followup", True, ["파이썬 GIL", "파이썬 GIL"], 1)
+
+
+def test_build_graph_selects_fused_planner():
+    fused = set(bg_mod.build_graph(answer_cache=False, fused_planner=True).get_graph().nodes)
+    split = set(bg_mod.build_async_graph(answer_cache=False, fused_planner=False).get_graph().nodes)
+
+    assert "plan" in fused and not {"router", "rewrite"} & fused
+    assert {"router", "rewrite"} <= split and "plan" not in split
@@ -0,0 +1,152 @@
+"""의미 기반 답변 캐시(`agent_v6.app.graph.answer_cache`) 테스트."""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from agent_v6.app.graph.answer_cache import CachedGraph, SemanticAnswerCache, conversation_key
+
+_VOCAB = ["파이썬", "자바", "특징", "장점"]
+
+
+def _embed(text: str) -> List[float]:
+    return [1.0 if w in text else 0.0 for w in _VOCAB]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result(answer: str, faithful: bool = True) -> Dict[str, Any]:
+    return {
+        "answer": answer,
+        "evidence": [{"content": "파이썬은 인터프리터 언어다", "source": "KB:tech.md"}],
+        "faithfulness": {"faithful": faithful, "issues": []},
+    }
+
+
+def _cache(version: List[str] | None = None, clock: _Clock | None = None, **kw: Any) -> SemanticAnswerCache:
+    version = version or ["v1"]
+    return SemanticAnswerCache(_embed, lambda: version[0], clock=clock or _Clock(), **kw)
+
+
+def test_hit_requires_similar_question_and_same_need_web():
+    cache = _cache(similarity=0.9)
+    assert cache.store("파이썬 특징", False, _result("A [KB:tech.md]"))
+
+    hit = cache.lookup("파이썬의 특징은?", False)
+    assert hit is not None
+    assert hit["answer"] == "A [KB:tech.md]"
+    assert hit["evidence"][0]["source"] == "KB:tech.md"
+    assert hit["answer_cache"]["hit"] is True
+
+    assert cache.lookup("파이썬 특징", True) is None  # need_web 가 다르면 다른 키
+    assert cache.lookup("자바 특징", False) is None  # 유사도 미달
+
+
+def test_unfaithful_answers_are_not_stored():
+    cache = _cache()
+    assert not cache.store("파이썬", False, _result("A", faithful=False))
+    assert len(cache) == 0
+    assert cache.stats()["skipped_unfaithful"] == 1
+
+
+def test_ttl_lru_and_kb_version_invalidation():
+    clock = _Clock()
+    version = ["v1"]
+    cache = _cache(version, clock, max_entries=2, ttl_s=10)
+    cache.store("파이썬", False, _result("py"))
+    cache.store("자바", False, _result("java"))
+    cache.lookup("파이썬", False)  # 파이썬을 최근 사용으로 갱신
+    cache.store("특징", False, _result("feat"))  # → 자바가 LRU 로 제거
+    assert cache.lookup("자바", False) is None
+    assert cache.lookup("파이썬", False) is not None
+
+    clock.now = 11
+    assert cache.lookup("파이썬", False) is None  # TTL 만료
+
+    cache.store("장점", False, _result("pros"))
+    version[0] = "v2"
+    assert cache.lookup("장점", False) is None  # KB 버전 변경 → 전체 무효화
+    assert cache.stats()["invalidations"] == 1
+
+
+class _CountingGraph:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def invoke(self, state: Dict[str, Any], config: Any = None, **_: Any) -> Dict[str, Any]:
+        self.calls += 1
+        return {**state, **_result("answer [KB:tech.md]")}
+
+
+def test_cached_graph_skips_graph_on_repeat_question():
+    inner = _CountingGraph()
+    graph = CachedGraph(inner, _cache())
+    state = {"messages": [{"role": "user", "content": "파이썬 특징"}], "need_web": False}
+
+    first = graph.invoke(state)
+    second = graph.invoke({"messages": [{"role": "user", "content": "파이썬 특징?"}], "need_web": False})
+
+    assert inner.calls == 1
+    assert second["answer"] == first["answer"]
+    assert second["messages"][0]["content"] == "파이썬 특징?"
+    assert second["answer_cache"]["similarity"] > 0.99
+
+
+def test_followup_ambiguous_and_task_turns_bypass_cache():
+    inner = _CountingGraph()
+    graph = CachedGraph(inner, _cache())
+
+    for text in ["그거 더 자세히 설명해줘", "뭐?", "파이썬 특징 요약해줘"]:
+        graph.invoke({"messages": [{"role": "user", "content": text}], "need_web": False})
+        graph.invoke({"messages": [{"role": "user", "content": text}], "need_web": False})
+
+    assert inner.calls == 6
+    assert len(graph.cache) == 0
+    assert graph.cache.stats()["skipped_intent"] >= 6
+
+
+def test_router_intent_of_result_blocks_store():
+    cache = _cache()
+
+    assert not cache.store("파이썬 특징", False, {**_result("A"), "intent": "followup"})
+    assert cache.store("파이썬 특징", False, {**_result("A"), "intent": "new_topic"})
+    assert cache.lookup("파이썬 특징", False, intent="new_topic") is not None
+
+
+def test_entry_is_stored_under_the_lookup_intent_when_the_router_disagrees():
+    class _RouterGraph(_CountingGraph):
+        def invoke(self, state: Dict[str, Any], config: Any = None, **_: Any) -> Dict[str, Any]:
+            # 로컬 라우터는 new_topic, LLM 라우터는 다른 intent 로 판정한 턴
+            return {**super().invoke(state, config), "intent": "comparison"}
+
+    inner = _RouterGraph()
+    graph = CachedGraph(inner, _cache())
+    state = {"messages": [{"role": "user", "content": "파이썬 특징은 뭐야?"}], "need_web": False}
+
+    graph.invoke(state)
+    hit = graph.invoke(state)
+
+    assert inner.calls == 1
+    assert hit["answer_cache"]["hit"] is True
+    assert graph.cache.lookup("파이썬 특징은 뭐야?", False, intent="new_topic") is not None
+    assert graph.cache.lookup("파이썬 특징은 뭐야?", False, intent="comparison") is None
+
+def test_conversation_context_is_part_of_the_key():
+    inner = _CountingGraph()
+    graph = CachedGraph(inner, _cache())
+    history_a = [{"role": "user", "content": "자바 알려줘"}, {"role": "assistant", "content": "자바는 ..."}]
+    history_b = [{"role": "user", "content": "장점 알려줘"}, {"role": "assistant", "content": "장점은 ..."}]
+    question = {"role": "user", "content": "파이썬 특징은 뭐야?"}
+
+    graph.invoke({"messages": [*history_a, question], "need_web": False})
+    graph.invoke({"messages": [*history_b, question], "need_web": False})
+    hit = graph.invoke({"messages": [*history_a, question], "need_web": False})
+
+    assert inner.calls == 2
+    assert hit["answer_cache"]["hit"] is True
+    assert conversation_key({"messages": [question]}) == ""
@@ -0,0 +1,116 @@
+"""비동기 실행 경로(`a*` 노드, `build_async_graph`, `CachedGraph.ainvoke`) 테스트."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from langchain_core.documents import Document
+
+from agent_v6.app.graph import build_graph as bg_mod
+from agent_v6.app.graph.answer_cache import CachedGraph, SemanticAnswerCache
+from agent_v6.app.graph.nodes import grader as gr_mod
+from agent_v6.app.graph.nodes import retrieve_kb as kb_node
+
+
+class _AsyncSlowLLM:
+    """후보마다 *delays* 만큼 비동기로 지연되는 structured-output LLM 스텁. 홀수 문서는 무관."""
+
+    def __init__(self, delays: Dict[str, float]) -> None:
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+
+    def with_structured_output(self, _schema: Any) -> "_AsyncSlowLLM":
+        return self
+
+    async def ainvoke(self, messages: List[Dict[str, str]]) -> Any:
+        candidate = json.loads(messages[-1]["content"])["candidate"]
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(candidate, 0.1))
+        finally:
+            self.active -= 1
+        return gr_mod._RelResult(relevant=int(candidate.split()[-1]) % 2 == 0)
+
+
+def _use(monkeypatch, llm: Any, **overrides: Any) -> None:
+    monkeypatch.setattr(gr_mod, "get_llm", lambda: llm, raising=False)
+    monkeypatch.setattr(gr_mod, "grader_cfg", replace(gr_mod.grader_cfg, mode="pointwise", **overrides), raising=False)
+
+
+def test_async_pointwise_grading_is_concurrent_and_ordered(monkeypatch):
+    llm = _AsyncSlowLLM({"문서 0": 0.2})
+    _use(monkeypatch, llm, max_concurrency=4, timeout_s=0)
+    docs = [{"content": f"문서 {i}", "source": f"KB:{i}"} for i in range(4)]
+
+    res = asyncio.run(gr_mod._allm_filter("질문", docs))
+
+    assert [e["source"] for e in res] == ["KB:0", "KB:2"]
+    assert llm.peak == 4
+
+
+def test_async_pointwise_timeout_keeps_ungraded_candidates(monkeypatch):
+    llm = _AsyncSlowLLM({"문서 1": 5.0, "문서 3": 5.0})
+    _use(monkeypatch, llm, max_concurrency=4, timeout_s=0.3)
+    docs = [{"content": f"문서 {i}", "source": f"KB:{i}"} for i in range(4)]
+
+    started = time.perf_counter()
+    res = asyncio.run(gr_mod._allm_filter("질문", docs))
+
+    assert time.perf_counter() - started < 2.0
+    # 시간 안에 끝난 문서 2개는 채점대로, 나머지는 fail-open 으로 유지
+    assert [e["source"] for e in res] == ["KB:0", "KB:1", "KB:2", "KB:3"]
+
+
+def test_aretrieve_kb_dedups_async_hits(monkeypatch):
+    async def _fake(queries: List[str], k: int = 5) -> List[List[Document]]:
+        return [[Document(page_content="a"), Document(page_content="b")], [Document(page_content="a")]]
+
+    monkeypatch.setattr(kb_node, "asearch_similar_many", _fake)
+
+    out = asyncio.run(kb_node.aretrieve_kb({"queries": ["q1", "q2"]}))
+
+    assert [d.page_content for d in out["kb_docs"]] == ["a", "b"]
+
+
+def test_async_graph_registers_coroutine_nodes():
+    assert set(bg_mod._ASYNC_NODES) == set(bg_mod._SYNC_NODES)
+    assert all(asyncio.iscoroutinefunction(fn) for fn in bg_mod._ASYNC_NODES.values())
+    graph = bg_mod.build_async_graph(answer_cache=False)
+    assert set(bg_mod._ASYNC_NODES) <= set(graph.get_graph().nodes)
+
+
+class _FakeAsyncGraph:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def ainvoke(self, state: Dict[str, Any], config: Any = None, **kwargs: Any) -> Dict[str, Any]:
+        self.calls += 1
+        return {**state, "answer": "답", "faithfulness": {"faithful": True}, "evidence": []}
+
+
+def test_cached_graph_ainvoke_uses_async_embed():
+    embedded: List[str] = []
+
+    async def _aembed(text: str) -> List[float]:
+        embedded.append(text)
+        return [1.0, 0.0]
+
+    def _embed(_text: str) -> List[float]:
+        raise AssertionError("sync embed must not be used on the async path")
+
+    inner = _FakeAsyncGraph()
+    graph = CachedGraph(inner, SemanticAnswerCache(_embed, lambda: "v1", aembed=_aembed))
+    state = {"messages": [{"role": "user", "content": "파이썬이 뭐야?"}], "need_web": False}
+
+    first = asyncio.run(graph.ainvoke(state))
+    second = asyncio.run(graph.ainvoke(state))
+
+    assert inner.calls == 1
+    assert first["answer"] == second["answer"] == "답"
+    assert second["answer_cache"]["hit"] is True
+    assert embedded == ["파이썬이 뭐야?"] * 3  # lookup, store, lookup
@@ -0,0 +1,109 @@
+"""증분 faithfulness 재시도(`retry_cfg.incremental`) 테스트."""
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from typing import Any, Dict, List
+
+import pytest
+from langchain_core.documents import Document
+
+from agent_v6.app.graph import build_graph as bg_mod
+from agent_v6.app.graph.nodes import grader as gr_mod
+from agent_v6.app.graph.nodes import rewrite as rw_mod
+from agent_v6.app.utils.docs import doc_key
+
+
+class _GraderLLM:
+    """Pointwise 채점 스텁: '무관' 이 들어간 후보만 무관으로 판정하고, 채점한 후보를 기록한다."""
+
+    def __init__(self) -> None:
+        self.graded: List[str] = []
+
+    def with_structured_output(self, _schema: Any) -> "_GraderLLM":
+        return self
+
+    def invoke(self, messages: List[Dict[str, str]]) -> Any:
+        candidate = json.loads(messages[-1]["content"])["candidate"]
+        self.graded.append(candidate)
+        return gr_mod._RelResult(relevant="무관" not in candidate)
+
+
+def _run(monkeypatch, incremental: bool, retry_queries: str = '["b", "c"]') -> Dict[str, Any]:
+    cfg = replace(rw_mod.retry_cfg, incremental=incremental)
+    monkeypatch.setattr(rw_mod, "retry_cfg", cfg)
+    monkeypatch.setattr(gr_mod, "retry_cfg", cfg)
+    monkeypatch.setattr(gr_mod, "grader_cfg", replace(gr_mod.grader_cfg, mode="pointwise", timeout_s=0))
+    llm = _GraderLLM()
+    monkeypatch.setattr(gr_mod, "get_llm", lambda: llm)
+
+    rewrites = iter(['["a", "b"]', retry_queries])
+    monkeypatch.setattr(rw_mod, "chat", lambda *_a, **_k: next(rewrites))
+    searched: List[List[str]] = []
+    calls: List[int] = []
+    corpus = {"a": ["A 문서", "공통 문서"], "b": ["B 무관 문서", "공통 문서"], "c": ["C 문서"]}
+
+    def kb(state: Dict[str, Any]) -> Dict[str, Any]:
+        searched.append(list(state["queries"]))
+        return {"kb_docs": [Document(page_content=t) for q in state["queries"] for t in corpus[q]]}
+
+    def faithfulness(state: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(state["step"])
+        return {"faithfulness": {"faithful": state["step"] >= 2, "issues": ["근거 부족"]}}
+
+    monkeypatch.setitem(bg_mod._SYNC_NODES, "router", lambda s: {"intent": "new_topic"})
+    monkeypatch.setitem(bg_mod._SYNC_NODES, "kb", kb)
+    monkeypatch.setitem(bg_mod._SYNC_NODES, "ddg", lambda s: {"web_docs": []})
+    monkeypatch.setitem(bg_mod._SYNC_NODES, "generate", lambda s: {"answer": "답"})
+    monkeypatch.setitem(bg_mod._SYNC_NODES, "faithfulness", faithfulness)
+    graph = bg_mod.build_graph(answer_cache=False, fused_planner=False, speculative_kb=False)
+
+    result = graph.invoke({"messages": [{"role": "user", "content": "질문"}], "step": 0, "max_steps": 3})
+    return {"result": result, "searched": searched, "graded": llm.graded, "faithfulness_steps": calls}
+
+
+@pytest.fixture(autouse=True)
+def _llm_grader_on(monkeypatch):
+    monkeypatch.setattr(gr_mod, "flags", replace(gr_mod.flags, use_llm_grader=True))
+
+
+def test_incremental_retry_searches_and_grades_only_new_items(monkeypatch):
+    out = _run(monkeypatch, incremental=True)
+
+    assert out["searched"] == [["a", "b"], ["c"]]
+    # 재시도에서는 새 후보 "C 문서" 만 채점한다.
+    assert out["graded"] == ["A 문서", "공통 문서", "B 무관 문서", "C 문서"]
+    assert [e["content"] for e in out["result"]["evidence"]] == ["A 문서", "공통 문서", "C 문서"]
+    assert out["result"]["graded"] == {
+        doc_key(Document(page_content=t)): verdict
+        for t, verdict in [("A 문서", True), ("공통 문서", True), ("B 무관 문서", False), ("C 문서", True)]
+    }
+
+
+def test_full_retry_mode_regrades_everything(monkeypatch):
+    out = _run(monkeypatch, incremental=False)
+
+    assert out["searched"] == [["a", "b"], ["b", "c"]]
+    assert len(out["graded"]) > 4
+
+
+def test_retry_without_new_queries_ends_with_previous_answer(monkeypatch):
+    out = _run(monkeypatch, incremental=True, retry_queries='["A", "b"]')
+
+    # 재작성 쿼리가 모두 이미 검색한 것이면 kb/ddg/grade/generate 를 다시 돌지 않고 끝낸다.
+    assert out["searched"] == [["a", "b"]]
+    assert out["faithfulness_steps"] == [1]
+    assert out["result"]["queries"] == []
+    assert out["result"]["answer"] == "답"
+    assert out["result"]["step"] == 2
+
+
+def test_verdicts_are_keyed_by_source_and_content_hash(monkeypatch):
+    monkeypatch.setattr(gr_mod, "retry_cfg", replace(gr_mod.retry_cfg, incremental=True))
+    same_text = [{"content": "본문", "source": "KB:a"}, {"content": "본문", "source": "KB:b"}]
+    state = {"graded": {doc_key(same_text[0]): True}}
+
+    assert gr_mod._ungraded(state, same_text) == [same_text[1]]
+    updates = gr_mod._grade_updates(state, same_text[1:], [], duplicates=0)
+    assert updates["graded"] == {doc_key(same_text[0]): True, doc_key(same_text[1]): False}
+    assert all(len(key) < 64 for key in updates["graded"])
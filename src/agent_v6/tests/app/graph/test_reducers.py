@@ -0,0 +1,64 @@
+"""`agent_v6.app.graph.reducers.keyed_merge` 테스트."""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from langchain_core.documents import Document
+from langgraph.graph import END, StateGraph
+
+from agent_v6.app.graph.reducers import doc_key, keyed_merge
+from agent_v6.app.graph.state import GraphState
+
+
+def test_doc_key_matches_documents_and_evidence_dicts():
+    doc = Document(page_content="본문", metadata={"source": "KB:a"})
+
+    assert doc_key(doc) == doc_key({"content": "본문", "metadata": {"source": "KB:a"}})
+    assert doc_key(doc) == doc_key({"content": "본문", "source": "KB:a"})
+    assert doc_key(doc) != doc_key(Document(page_content="본문", metadata={"source": "KB:b"}))
+
+
+def test_keyed_merge_replaces_in_place_and_caps_oldest_unscored():
+    merge = keyed_merge(3)
+    left = [{"content": c, "source": "KB:x"} for c in ("a", "b", "c")]
+    right = [{"content": "b", "source": "KB:x", "grade_score": 0.9}, {"content": "d", "source": "KB:x"}]
+
+    out = merge(left, right)
+
+    assert [e["content"] for e in out] == ["b", "c", "d"]
+    assert out[0]["grade_score"] == 0.9
+    assert merge(None, None) == []
+    assert len(keyed_merge(0)(left, right)) == 4
+
+
+def test_keyed_merge_caps_lowest_relevance_first():
+    merge = keyed_merge(3)
+    # 첫 패스 evidence 가 가장 관련 있고, 재시도에서 덜 관련된 근거가 뒤에 붙는 경우
+    left = [{"content": "a", "grade_score": 0.95}, {"content": "b", "grade_score": 0.9}]
+    right = [{"content": "c", "grade_score": 0.6}, {"content": "d", "metadata": {"relevance_score": 0.8}}]
+
+    assert [e["content"] for e in merge(left, right)] == ["a", "b", "d"]
+
+    docs = [Document(page_content=t, metadata={"relevance_score": s}) for t, s in (("x", 0.9), ("y", 0.1), ("z", 0.5))]
+    assert [d.page_content for d in keyed_merge(2)(docs, None)] == ["x", "z"]
+
+
+def test_graph_state_does_not_grow_across_loop_iterations():
+    def grade(state: Dict[str, Any]) -> Dict[str, Any]:
+        docs: List[Document] = [Document(page_content=f"문서 {i}", metadata={"source": f"KB:{i}"}) for i in range(3)]
+        return {
+            "kb_docs": docs,
+            "evidence": [{"content": d.page_content, "source": d.metadata["source"]} for d in docs],
+            "step": int(state.get("step", 0)) + 1,
+        }
+
+    g = StateGraph(GraphState)
+    g.add_node("grade", grade)
+    g.set_entry_point("grade")
+    g.add_conditional_edges("grade", lambda s: "end" if s["step"] >= 6 else "loop", {"loop": "grade", "end": END})
+
+    result = g.compile().invoke({"messages": [], "step": 0})
+
+    assert result["step"] == 6
+    assert len(result["kb_docs"]) == 3
+    assert len(result["evidence"]) == 3
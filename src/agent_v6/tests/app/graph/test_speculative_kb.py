@@ -0,0 +1,153 @@
+"""사용자 원문 KB 추측 검색(`kb_spec`) 과 grade 단계 병합 테스트."""
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from langchain_core.documents import Document
+
+from agent_v6.app.graph import build_graph as bg_mod
+from agent_v6.app.graph.nodes import grader as gr_mod
+from agent_v6.app.graph.nodes import retrieve_kb as kb_node
+
+
+def test_speculative_kb_searches_raw_question_and_marks_docs(monkeypatch):
+    seen: List[str] = []
+
+    def _search(q: str, k: int = 5, **_: Any) -> List[Document]:
+        seen.append(q)
+        return [Document(page_content="원문 결과", metadata={"source": "KB:a"})]
+
+    monkeypatch.setattr(kb_node, "search_similar", _search)
+
+    out = kb_node.speculative_kb({"messages": [{"role": "user", "content": "파이썬 GIL 이 뭐야?"}]})
+    spec = kb_node.collect_speculative(out)
+
+    assert seen == ["파이썬 GIL 이 뭐야?"]
+    assert spec is not None
+    assert spec.docs[0].metadata == {"source": "KB:a", kb_node.SPECULATIVE_KEY: True}
+    assert kb_node.collect_speculative(out) is None  # 티켓은 한 번만 소비된다.
+
+
+def test_speculative_kb_fails_open(monkeypatch):
+    def _boom(*_: Any, **__: Any) -> List[Document]:
+        raise RuntimeError("search down")
+
+    monkeypatch.setattr(kb_node, "search_similar", _boom)
+
+    spec = kb_node.collect_speculative(kb_node.speculative_kb({"messages": [{"role": "user", "content": "q"}]}))
+
+    assert spec is not None and spec.docs == []
+
+
+def test_collect_gives_up_after_wait_limit(monkeypatch):
+    monkeypatch.setattr(kb_node, "search_similar", lambda *_a, **_k: time.sleep(0.5) or [Document(page_content="늦음")])
+    monkeypatch.setattr(kb_node, "retriever_cfg", replace(kb_node.retriever_cfg, speculative_wait_s=0.05))
+
+    started = time.perf_counter()
+    spec = kb_node.collect_speculative(kb_node.speculative_kb({"messages": [{"role": "user", "content": "q"}]}))
+
+    assert time.perf_counter() - started < 0.3
+    assert spec is not None and spec.docs == []
+
+
+def _graph_with_fakes(monkeypatch, grade_inputs: List[List[str]]) -> Any:
+    """Replace I/O nodes with fakes; keep the real grader (LLM grading off)."""
+    monkeypatch.setattr(gr_mod, "flags", gr_mod.flags.__class__(use_llm_router=False, use_llm_grader=False))
+
+    def router(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"intent": "new_topic"}
+
+    def rewrite(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"queries": ["재작성"], "step": int(state.get("step", 0)) + 1}
+
+    def kb(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"kb_docs": [Document(page_content="공통"), Document(page_content=f"재작성 {state['step']}")]}
+
+    def kb_spec(state: Dict[str, Any]) -> Dict[str, Any]:
+        docs = [Document(page_content="공통"), Document(page_content="원문 전용")]
+        return {"spec_kb_ticket": kb_node._register(kb_node._executor().submit(kb_node._mark_speculative, docs))}
+
+    def ddg(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"web_docs": []}
+
+    def grade(state: Dict[str, Any]) -> Dict[str, Any]:
+        updates = gr_mod.evidence_grader(state)
+        grade_inputs.append([e["content"] for e in updates["evidence"]])
+        return updates
+
+    def generate(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"answer": "답"}
+
+    def faithfulness(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"faithfulness": {"faithful": state["step"] >= 2, "issues": []}}
+
+    fakes = dict(router=router, rewrite=rewrite, kb=kb, kb_spec=kb_spec, ddg=ddg, grade=grade, generate=generate, faithfulness=faithfulness)
+    for name, fn in fakes.items():
+        monkeypatch.setitem(bg_mod._SYNC_NODES, name, fn)
+    return bg_mod.build_graph(answer_cache=False, fused_planner=False, speculative_kb=True)
+
+
+def test_speculative_hits_merge_once_at_grade(monkeypatch):
+    grade_inputs: List[List[str]] = []
+    graph = _graph_with_fakes(monkeypatch, grade_inputs)
+    before = gr_mod.speculation_stats()
+
+    result = graph.invoke({"messages": [{"role": "user", "content": "질문"}], "step": 0, "max_steps": 3})
+
+    # 첫 grade: 재작성 결과 뒤에 원문 전용 문서만 추가, 재시도 grade: 다시 합치지 않음
+    assert grade_inputs[0] == ["공통", "재작성 1", "원문 전용"]
+    assert "원문 전용" not in grade_inputs[1]
+    assert result["spec_kb_ticket"] is None
+
+    after = gr_mod.speculation_stats()
+    assert (after.runs - before.runs, after.hits - before.hits) == (1, 2)
+    assert (after.duplicates - before.duplicates, after.added - before.added, after.survived - before.survived) == (1, 1, 1)
+
+
+def test_speculative_branch_is_optional():
+    with_spec = set(bg_mod.build_graph(answer_cache=False, speculative_kb=True).get_graph().nodes)
+    without = set(bg_mod.build_graph(answer_cache=False, speculative_kb=False).get_graph().nodes)
+
+    assert "kb_spec" in with_spec and "kb_spec" not in without
+
+
+def test_speculative_search_overlaps_router_and_rewrite(monkeypatch):
+    """The raw-question search must not hold the router superstep (0.3s search vs 0.2s + 0.2s routing)."""
+    monkeypatch.setattr(gr_mod, "flags", gr_mod.flags.__class__(use_llm_router=False, use_llm_grader=False))
+    monkeypatch.setattr(kb_node, "search_similar", lambda *_a, **_k: time.sleep(0.3) or [Document(page_content="원문")])
+    timeline: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def router(state: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(0.2)
+        timeline["router_done"] = time.perf_counter() - started
+        return {"intent": "new_topic"}
+
+    def rewrite(state: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(0.2)
+        return {"queries": ["q"], "step": 1}
+
+    fakes = dict(
+        router=router,
+        rewrite=rewrite,
+        kb=lambda s: {"kb_docs": []},
+        ddg=lambda s: {"web_docs": []},
+        generate=lambda s: {"answer": "답"},
+        faithfulness=lambda s: {"faithfulness": {"faithful": True, "issues": []}},
+    )
+    for name, fn in fakes.items():
+        monkeypatch.setitem(bg_mod._SYNC_NODES, name, fn)
+    graph = bg_mod.build_graph(answer_cache=False, fused_planner=False, speculative_kb=True, mmr_rerank=False)
+    before = gr_mod.speculation_stats()
+
+    result = graph.invoke({"messages": [{"role": "user", "content": "질문"}], "step": 0})
+    elapsed = time.perf_counter() - started
+
+    after = gr_mod.speculation_stats()
+    assert [e["content"] for e in result["evidence"]] == ["원문"]
+    assert timeline["router_done"] < 0.28  # 추측 검색(0.3s)이 router 단계를 붙잡지 않는다.
+    assert elapsed < 0.6  # 직렬이면 0.3 + 0.2 + 0.2
+    assert after.overlap_s - before.overlap_s >= 0.25
+    assert after.waited_s - before.waited_s < 0.1
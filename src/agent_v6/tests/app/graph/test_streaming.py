@@ -0,0 +1,98 @@
+"""`agent_v6.app.graph.streaming.astream_answer` 테스트."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, StateGraph
+
+from agent_v6.app.graph.answer_cache import CachedGraph, SemanticAnswerCache
+from agent_v6.app.graph.streaming import astream_answer
+
+
+class _State(TypedDict, total=False):
+    messages: List[Any]
+    need_web: bool
+    answer: str
+    step: int
+    faithfulness: Dict[str, Any]
+
+
+def _graph(replies: List[str], fixed: Optional[str] = None, retries: int = 0) -> Any:
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=r) for r in replies]))
+
+    async def generate(state: _State) -> Dict[str, Any]:
+        msg = await llm.ainvoke("q")
+        return {"answer": msg.content, "step": int(state.get("step", 0)) + 1}
+
+    async def faithfulness(state: _State) -> Dict[str, Any]:
+        if int(state["step"]) <= retries:
+            return {"faithfulness": {"faithful": False}}
+        out: Dict[str, Any] = {"faithfulness": {"faithful": True}}
+        if fixed:
+            out["answer"] = fixed
+        return out
+
+    g = StateGraph(_State)
+    g.add_node("generate", generate)
+    g.add_node("faithfulness", faithfulness)
+    g.set_entry_point("generate")
+    g.add_edge("generate", "faithfulness")
+    g.add_conditional_edges(
+        "faithfulness", lambda s: "end" if s["faithfulness"]["faithful"] else "retry", {"retry": "generate", "end": END}
+    )
+    return g.compile()
+
+
+def _collect(graph: Any, state: Dict[str, Any]) -> List[Any]:
+    async def _run() -> List[Any]:
+        return [event async for event in astream_answer(graph, state)]
+
+    return asyncio.run(_run())
+
+
+_STATE = {"messages": [{"role": "user", "content": "질문"}], "need_web": False, "step": 0}
+
+
+def test_generate_tokens_stream_before_final_state():
+    events = _collect(_graph(["안녕 하세요 여러분"]), _STATE)
+
+    kinds = [e.kind for e in events]
+    assert kinds[-1] == "final" and kinds.count("token") > 1
+    assert "".join(e.text for e in events if e.kind == "token") == "안녕 하세요 여러분"
+    assert events[-1].state["answer"] == "안녕 하세요 여러분"
+
+
+def test_faithfulness_fix_arrives_in_final_state():
+    events = _collect(_graph(["초안 답변"], fixed="고친 답변"), _STATE)
+
+    assert "".join(e.text for e in events if e.kind == "token") == "초안 답변"
+    assert events[-1].state["answer"] == "고친 답변"
+
+
+def test_retry_emits_reset_between_generations():
+    events = _collect(_graph(["첫 답", "둘째 답"], retries=1), _STATE)
+
+    kinds = [e.kind for e in events]
+    assert kinds.count("reset") == 1
+    after_reset = events[kinds.index("reset") + 1 :]
+    assert "".join(e.text for e in after_reset if e.kind == "token") == "둘째 답"
+
+
+def test_cached_graph_hit_yields_only_final():
+    async def _aembed(_text: str) -> List[float]:
+        return [1.0, 0.0]
+
+    cache = SemanticAnswerCache(lambda _t: [1.0, 0.0], lambda: "v1", aembed=_aembed)
+    graph = CachedGraph(_graph(["캐시 될 답변"]), cache)
+
+    state = {**_STATE, "messages": [{"role": "user", "content": "파이썬이 뭐야?"}]}  # 짧은 질문은 ambiguous 로 캐시 제외
+    first = _collect(graph, state)
+    second = _collect(graph, state)
+
+    assert any(e.kind == "token" for e in first)
+    assert [e.kind for e in second] == ["final"]
+    assert second[0].state["answer"] == "캐시 될 답변"
+    assert second[0].state["answer_cache"]["hit"] is True
@@ -0,0 +1,83 @@
+"""`agent_v6.app.retrievers.embedding_cache` 테스트."""
+from __future__ import annotations
+
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from agent_v6.app.retrievers.embedding_cache import CachedEmbeddings
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_memory_hit_uses_normalized_text():
+    inner = _CountingEmbeddings()
+    cache = CachedEmbeddings(inner, deployment="dep", memory_items=8)
+
+    first = cache.embed_query("파이썬  이란?")
+    second = cache.embed_query(" 파이썬 이란? ")
+
+    assert first == second
+    assert len(inner.calls) == 1
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    inner = _CountingEmbeddings()
+    CachedEmbeddings(inner, deployment="dep", disk_path=path).embed_query("hello")
+
+    reopened = CachedEmbeddings(inner, deployment="dep", disk_path=path)
+    assert reopened.embed_query("hello") == [5.0, 1.0]
+    assert len(inner.calls) == 1
+    assert reopened.stats()["disk_hits"] == 1
+
+    # 다른 배포는 다른 키 공간을 쓴다.
+    CachedEmbeddings(inner, deployment="other", disk_path=path).embed_query("hello")
+    assert len(inner.calls) == 2
+
+
+def test_embed_documents_only_sends_misses():
+    inner = _CountingEmbeddings()
+    cache = CachedEmbeddings(inner, deployment="dep")
+    cache.embed_query("a")
+
+    out = cache.embed_documents(["a", "bb", "bb", "ccc"])
+
+    assert out == [[1.0, 1.0], [2.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+    assert inner.calls[-1] == ["bb", "ccc"]
+
+
+def test_memory_lru_eviction():
+    inner = _CountingEmbeddings()
+    cache = CachedEmbeddings(inner, deployment="dep", memory_items=2)
+    for text in ["a", "b", "c"]:
+        cache.embed_query(text)
+
+    assert cache.stats()["memory_items"] == 2
+    assert cache.stats()["memory_evictions"] == 1
+    assert cache.peek("a") is None
+
+
+def test_disk_size_eviction(tmp_path):
+    inner = _CountingEmbeddings()
+    # 벡터 하나 = float32 2개 = 8 bytes → 최대 2개만 유지된다.
+    cache = CachedEmbeddings(inner, deployment="dep", memory_items=1, disk_path=str(tmp_path / "e.db"), max_disk_bytes=16)
+    for text in ["a", "b", "c"]:
+        cache.embed_query(text)
+
+    stats = cache.stats()
+    assert stats["disk_evictions"] >= 1
+    assert stats["disk_bytes"] <= 16
@@ -0,0 +1,62 @@
+"""Hybrid BM25 + dense 검색(`agent_v6.app.retrievers.kb`) 테스트."""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import List, Sequence
+
+from langchain_core.documents import Document
+
+from agent_v6.app.retrievers import kb as kb_mod
+from agent_v6.app.retrievers.lexical_index import BM25Index
+from agent_v6.app.utils.docs import doc_key
+
+_PY = Document(page_content="파이썬은 인터프리터 언어다", metadata={"source": "tech.md"})
+_JAVA = Document(page_content="자바는 컴파일 언어다", metadata={"source": "tech.md"})
+_CAT = Document(page_content="고양이는 야행성 동물이다", metadata={"source": "animal.md"})
+
+
+def test_bm25_matches_korean_term_with_particle():
+    index = BM25Index([_PY, _JAVA, _CAT])
+    hits = index.search("파이썬 특징", k=2)
+    assert hits[0][0] is _PY
+    assert all(doc is not _CAT for doc, _ in hits)
+
+
+def test_rrf_fuse_merges_duplicates_and_ranks_consensus_first():
+    fused = kb_mod.rrf_fuse([[_JAVA, _PY], [_PY, _CAT]], k=3)
+    assert [d.page_content for d in fused] == [_PY.page_content, _JAVA.page_content, _CAT.page_content]
+    assert fused[0].metadata["source"] == "tech.md"
+    assert fused[0].metadata["rrf_score"] > fused[1].metadata["rrf_score"]
+
+
+def test_rrf_fuse_uses_the_state_merge_identity():
+    dense_hit = Document(page_content=_PY.page_content, metadata={"source": "tech.md", "relevance_score": 0.9, "id": "x"})
+
+    fused = kb_mod.rrf_fuse([[dense_hit], [_PY, _CAT]], k=3)
+
+    assert len(fused) == 2
+    assert [doc_key(d) for d in fused] == [doc_key(_PY), doc_key(_CAT)]
+
+
+class _FakeDense:
+    def __init__(self) -> None:
+        self.k_seen: List[int] = []
+
+    def search_similar_many(self, queries: Sequence[str], k: int = 5, *, score_threshold=None):
+        self.k_seen.append(k)
+        return [[_JAVA] for _ in queries]
+
+
+def test_hybrid_search_fuses_dense_and_lexical(monkeypatch):
+    dense = _FakeDense()
+    cfg = replace(kb_mod.retriever_cfg, hybrid=True, hybrid_dense_k=2, hybrid_lexical_k=3)
+    monkeypatch.setattr(kb_mod, "retriever_cfg", cfg, raising=False)
+    monkeypatch.setattr(kb_mod, "_backend", lambda: dense, raising=False)
+    monkeypatch.setattr(kb_mod, "get_lexical_index", lambda: BM25Index([_PY, _JAVA, _CAT]), raising=False)
+
+    res = kb_mod.search_similar_many(["파이썬"], k=5)
+
+    # 벡터 쪽은 더 작은 k 로 호출된다.
+    assert dense.k_seen == [2]
+    contents = [d.page_content for d in res[0]]
+    assert _PY.page_content in contents and _JAVA.page_content in contents
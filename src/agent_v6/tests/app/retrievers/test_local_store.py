@@ -0,0 +1,85 @@
+"""`agent_v6.app.retrievers.local_store` 테스트."""
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from agent_v6.app.retrievers import local_store as ls_mod
+from agent_v6.app.retrievers.store_manager import StoreManager
+
+_VOCAB = ["파이썬", "자바", "고양이", "바다"]
+
+
+class _BagOfWordsEmbeddings(Embeddings):
+    """어휘 등장 여부로 벡터를 만드는 결정적 임베딩 스텁."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0 if w in text else 0.0 for w in _VOCAB]
+
+
+_DOCS = [
+    Document(page_content="파이썬은 인터프리터 언어다", metadata={"source": "tech.md"}),
+    Document(page_content="자바는 컴파일 언어다", metadata={"source": "tech.md"}),
+    Document(page_content="고양이는 바다를 싫어한다", metadata={"source": "animal.md"}),
+]
+
+
+@pytest.fixture
+def local_index(tmp_path, monkeypatch):
+    embeddings = _BagOfWordsEmbeddings()
+    count = ls_mod.build_local_index(str(tmp_path), _DOCS, embeddings=embeddings, batch_size=2)
+    assert count == 3
+
+    manager = StoreManager(
+        vectorstore_factory=lambda emb: ls_mod.LocalVectorIndex.load(str(tmp_path), emb),
+        embeddings_factory=lambda: embeddings,
+    )
+    monkeypatch.setattr(ls_mod, "store_manager", manager, raising=False)
+    return manager
+
+
+def test_index_is_memory_mapped(local_index):
+    index = local_index.get_vectorstore()
+    assert len(index) == 3
+    assert index.vectors.dtype.name == "float32"
+    assert getattr(index.vectors, "filename", None) is not None
+
+
+def test_search_similar_ranks_by_cosine(local_index):
+    res = ls_mod.search_similar("파이썬", k=2, score_threshold=None)
+    assert res[0].page_content == _DOCS[0].page_content
+    assert res[0].metadata["source"] == "tech.md"
+
+
+def test_search_similar_applies_score_threshold(local_index):
+    # 일치하는 문서(cos=1 → score=1.0)만 남고 직교 문서(cos=0 → score=0.5)는 걸러진다.
+    res = ls_mod.search_similar("고양이", k=3, score_threshold=0.7)
+    assert [d.page_content for d in res] == [_DOCS[2].page_content]
+    assert res[0].metadata["relevance_score"] > 0.7
+
+
+def test_search_similar_many_keeps_query_order(local_index):
+    res = ls_mod.search_similar_many(["자바", "바다"], k=1)
+    assert [hits[0].page_content for hits in res] == [_DOCS[1].page_content, _DOCS[2].page_content]
+
+
+def test_build_local_index_streams_generator_in_batches(tmp_path):
+    calls: List[int] = []
+
+    class _CountingEmbeddings(_BagOfWordsEmbeddings):
+        def embed_documents(self, texts: List[str]) -> List[List[float]]:
+            calls.append(len(texts))
+            return super().embed_documents(texts)
+
+    count = ls_mod.build_local_index(str(tmp_path), (d for d in _DOCS), embeddings=_CountingEmbeddings(), batch_size=2)
+    assert count == 3
+    assert calls == [2, 1]
+
+    index = ls_mod.LocalVectorIndex.load(str(tmp_path), _BagOfWordsEmbeddings())
+    assert [item["content"] for item in index.items] == [d.page_content for d in _DOCS]
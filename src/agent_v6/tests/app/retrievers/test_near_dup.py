@@ -0,0 +1,53 @@
+"""MinHash 근사 중복 제거(`agent_v6.app.retrievers.near_dup`) 와 grade 전 적용 테스트."""
+from __future__ import annotations
+
+from dataclasses import replace
+
+from langchain_core.documents import Document
+
+from agent_v6.app.graph.nodes import grader as gr_mod
+from agent_v6.app.retrievers.near_dup import estimate_jaccard, near_dup_filter, signature
+
+_PY_A = "파이썬은 1991년 귀도 반 로섬이 발표한 인터프리터 언어이다. 간결한 문법이 특징이다."
+_PY_B = "파이썬은 1991년 귀도 반 로섬이 발표한 인터프리터 언어다.  간결한 문법이 특징이다."
+_JAVA = "자바는 1995년 썬 마이크로시스템즈가 발표한 객체 지향 언어이다."
+
+
+def test_signature_is_cached_and_estimates_similarity():
+    assert signature(_PY_A) is signature(_PY_A)
+    assert estimate_jaccard(signature(_PY_A), signature(_PY_B)) >= 0.8
+    assert estimate_jaccard(signature(_PY_A), signature(_JAVA)) < 0.3
+
+
+def test_filter_keeps_best_scored_member_in_input_order():
+    items = [("a", _PY_A, 0.7), ("j", _JAVA, 0.5), ("b", _PY_B, 0.9)]
+
+    kept, removed = near_dup_filter(items, lambda it: it[1], lambda it: it[2])
+
+    assert [it[0] for it in kept] == ["j", "b"]
+    assert removed == 1
+
+
+def test_grader_drops_near_duplicates_before_grading(monkeypatch):
+    monkeypatch.setattr(gr_mod, "flags", replace(gr_mod.flags, use_llm_grader=False))
+    state = {
+        "kb_docs": [Document(page_content=_PY_A, metadata={"source": "KB:py", "relevance_score": 0.82})],
+        "web_docs": [
+            Document(page_content=_PY_B, metadata={"source": "https://wiki"}),
+            Document(page_content=_JAVA, metadata={"source": "https://java"}),
+        ],
+    }
+    before = gr_mod.near_dup_stats()
+
+    out = gr_mod.evidence_grader(state)
+
+    assert [e["metadata"]["source"] for e in out["evidence"]] == ["KB:py", "https://java"]
+    after = gr_mod.near_dup_stats()
+    assert (after.candidates - before.candidates, after.removed - before.removed) == (3, 1)
+
+
+def test_near_dup_filter_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(gr_mod, "near_dup_cfg", replace(gr_mod.near_dup_cfg, enabled=False))
+    docs = [{"content": _PY_A}, {"content": _PY_B}]
+
+    assert gr_mod._drop_near_duplicates(docs) == docs
@@ -0,0 +1,102 @@
+"""`agent_v6.app.retrievers.aisearch_store.search_similar_many` 테스트."""
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from agent_v6.app.retrievers import aisearch_store as ai_mod
+from agent_v6.app.retrievers.doc_vectors import DocVectorCache
+from agent_v6.app.retrievers.store_manager import StoreManager
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self) -> None:
+        self.batch_calls = 0
+        self.query_calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.batch_calls += 1
+        return [[float(i)] for i, _ in enumerate(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_calls += 1
+        return [0.0]
+
+
+class _FakeClient:
+    """벡터 값(=쿼리 인덱스)에 따라 서로 다른 결과를 돌려주는 SearchClient 스텁."""
+
+    def __init__(self) -> None:
+        self.selects: List[List[str]] = []
+
+    def search(self, *, vector_queries: List[Any], top: int, select: List[str], **_kw: Any) -> List[Dict[str, Any]]:
+        self.selects.append(select)
+        idx = int(vector_queries[0].vector[0])
+        hits = [
+            {"id": f"id{idx}", "content": f"q{idx}-hit", "metadata": json.dumps({"source": f"doc{idx}.md"}), "@search.score": 0.9},
+            {"id": "id-shared", "content": "shared", "metadata": json.dumps({"source": "shared.md"}), "@search.score": 0.8},
+            {"id": "id-weak", "content": "weak", "metadata": "{}", "@search.score": 0.1},
+        ][:top]
+        if "content_vector" in select:
+            hits = [{**h, "content_vector": [1.0, float(idx)]} for h in hits]
+        return hits
+
+
+class _FakeStore:
+    def __init__(self, _embeddings: Embeddings) -> None:
+        self.client = _FakeClient()
+
+
+def test_search_similar_many_batches_embeddings(monkeypatch):
+    embeddings = _CountingEmbeddings()
+    manager = StoreManager(vectorstore_factory=_FakeStore, embeddings_factory=lambda: embeddings)
+    monkeypatch.setattr(ai_mod, "store_manager", manager, raising=False)
+
+    res = ai_mod.search_similar_many(["a", "b", "c"], k=3, score_threshold=0.5, max_workers=2)
+
+    # 임베딩은 한 번의 배치 호출로만 계산되어야 한다.
+    assert embeddings.batch_calls == 1
+    assert embeddings.query_calls == 0
+    # 결과는 입력 쿼리 순서를 유지하고 score_threshold 를 적용한다.
+    assert [[d.page_content for d in hits] for hits in res] == [
+        ["q0-hit", "shared"],
+        ["q1-hit", "shared"],
+        ["q2-hit", "shared"],
+    ]
+    assert res[1][0].metadata["source"] == "doc1.md"
+    assert res[1][0].metadata["id"] == "id1"
+
+
+def test_search_similar_many_empty():
+    assert ai_mod.search_similar_many([]) == []
+
+
+def _manager(monkeypatch) -> StoreManager:
+    manager = StoreManager(vectorstore_factory=_FakeStore, embeddings_factory=_CountingEmbeddings)
+    monkeypatch.setattr(ai_mod, "store_manager", manager, raising=False)
+    return manager
+
+
+def test_vectors_are_not_downloaded_by_default(monkeypatch):
+    manager = _manager(monkeypatch)
+    monkeypatch.setattr(ai_mod, "rerank_cfg", replace(ai_mod.rerank_cfg, enabled=True, fetch_vectors=False))
+
+    ai_mod.search_similar("a", k=1)
+
+    assert manager.get_vectorstore().client.selects == [["id", "content", "metadata"]]
+
+
+def test_search_similar_records_vectors_when_opted_in(monkeypatch):
+    manager = _manager(monkeypatch)
+    cache = DocVectorCache(8)
+    monkeypatch.setattr(ai_mod, "doc_vectors", cache)
+    monkeypatch.setattr(ai_mod, "rerank_cfg", replace(ai_mod.rerank_cfg, enabled=True, fetch_vectors=True))
+
+    docs = ai_mod.search_similar("a", k=2, score_threshold=0.5)
+
+    assert "content_vector" in manager.get_vectorstore().client.selects[0]
+    assert [d.metadata["id"] for d in docs] == ["id0", "id-shared"]
+    assert all(cache.get(d) is not None for d in docs)
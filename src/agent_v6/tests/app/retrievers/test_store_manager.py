@@ -0,0 +1,97 @@
+"""`agent_v6.app.retrievers.store_manager` 테스트."""
+from __future__ import annotations
+
+import threading
+from typing import Any, List
+
+from langchain_core.embeddings import Embeddings
+
+from agent_v6.app.retrievers.store_manager import StoreManager
+
+
+class _FakeEmbeddings(Embeddings):
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0, 0.0]
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def get_document_count(self) -> int:
+        return 42
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeStore:
+    def __init__(self, embeddings: Embeddings) -> None:
+        self.embeddings = embeddings
+        self.client = _FakeClient()
+
+
+def _make_manager(builds: List[Any]) -> StoreManager[_FakeStore]:
+    def _factory(embeddings: Embeddings) -> _FakeStore:
+        store = _FakeStore(embeddings)
+        builds.append(store)
+        return store
+
+    return StoreManager(vectorstore_factory=_factory, embeddings_factory=_FakeEmbeddings)
+
+
+def test_vectorstore_is_built_once_and_reused():
+    builds: List[Any] = []
+    manager = _make_manager(builds)
+
+    first = manager.get_vectorstore()
+    second = manager.get_vectorstore()
+
+    assert first is second
+    assert len(builds) == 1
+    # 벡터 스토어는 매니저가 보유한 임베딩 클라이언트를 공유해야 한다.
+    assert first.embeddings is manager.get_embeddings()
+    stats = manager.stats()
+    assert stats.vectorstore_builds == 1
+    assert stats.vectorstore_reuses == 1
+    assert stats.embeddings_builds == 1
+
+
+def test_concurrent_access_builds_single_instance():
+    builds: List[Any] = []
+    manager = _make_manager(builds)
+
+    threads = [threading.Thread(target=manager.get_vectorstore) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(builds) == 1
+    assert manager.stats().vectorstore_reuses == 15
+
+
+def test_reset_closes_client_and_rebuilds():
+    builds: List[Any] = []
+    manager = _make_manager(builds)
+
+    first = manager.get_vectorstore()
+    manager.reset()
+    second = manager.get_vectorstore()
+
+    assert first.client.closed is True
+    assert first is not second
+    assert manager.stats().resets == 1
+
+
+def test_health_probe_reports_document_count():
+    manager = _make_manager([])
+
+    assert manager.health()["ready"] is False
+    report = manager.health(probe=True)
+    assert report["ok"] is True
+    assert report["ready"] is True
+    assert report["document_count"] == 42
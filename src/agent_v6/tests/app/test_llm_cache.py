@@ -0,0 +1,84 @@
+"""LLM 응답 캐시(`agent_v6.app.llm_cache`, `models.structured_call`) 테스트."""
+from __future__ import annotations
+
+import time
+from typing import List
+
+from pydantic import BaseModel
+
+from agent_v6.app import models as models_mod
+from agent_v6.app.llm_cache import LLMResponseCache, parse_node_ttls, response_key
+from agent_v6.app.utils.sqlite_lru import SQLiteLRUStore
+
+
+class _Verdict(BaseModel):
+    ok: bool = True
+
+
+class _Other(BaseModel):
+    ok: bool = True
+
+
+_MSGS = [{"role": "system", "content": "judge"}, {"role": "user", "content": "질문"}]
+
+
+def test_parse_node_ttls_uses_default_and_overrides():
+    assert parse_node_ttls("router, rewrite:600,,", 30) == {"router": 30.0, "rewrite": 600.0}
+
+
+def test_key_depends_on_deployment_messages_and_schema():
+    base = response_key("gpt-4.1", _MSGS, _Verdict)
+    assert base == response_key("gpt-4.1", list(_MSGS), _Verdict)
+    assert base != response_key("gpt-4o", _MSGS, _Verdict)
+    assert base != response_key("gpt-4.1", _MSGS[:1], _Verdict)
+    assert base != response_key("gpt-4.1", _MSGS, _Other)
+    assert base != response_key("gpt-4.1", _MSGS)
+
+
+def test_ttl_expiry_and_size_cap(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), max_bytes=100)
+    cache.put("a", "x" * 10, node="router", ttl_s=0.05)
+    assert cache.get("a") == "x" * 10
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+    for i in range(5):
+        cache.put(f"k{i}", "y" * 40, node="router", ttl_s=0)
+    stats = cache.stats()
+    assert stats["bytes"] <= 100
+    assert stats["evictions"] >= 3
+    assert cache.get("k4") == "y" * 40  # 가장 최근 항목은 남는다.
+
+
+def test_structured_call_reuses_cached_response_per_node(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(models_mod, "get_llm_cache", lambda: cache, raising=False)
+    monkeypatch.setattr(models_mod, "_node_ttls", lambda: {"router": 60.0}, raising=False)
+    calls: List[int] = []
+
+    def _invoke() -> _Verdict:
+        calls.append(1)
+        return _Verdict(ok=False)
+
+    first = models_mod.structured_call("router", _Verdict, _MSGS, _invoke)
+    second = models_mod.structured_call("router", _Verdict, _MSGS, _invoke)
+    models_mod.structured_call("grader", _Verdict, _MSGS, _invoke)  # 캐시 대상이 아닌 노드
+
+    assert first == second == _Verdict(ok=False)
+    assert len(calls) == 2
+
+
+def test_sqlite_store_batches_access_time_updates(tmp_path):
+    store = SQLiteLRUStore(str(tmp_path / "lru.sqlite3"), max_bytes=25, touch_batch=100)
+    store.put("old", b"a" * 10)
+    time.sleep(0.01)
+    store.put("new", b"b" * 10)
+    assert store.get("old") == b"a" * 10  # 접근 시각은 아직 메모리에만 있다.
+
+    store.put("third", b"c" * 10)  # 크기 초과 → 모아 둔 접근 시각을 먼저 기록하고 LRU 제거
+
+    assert store.get("new") is None
+    assert store.get("old") == b"a" * 10
+    stats = store.stats()
+    assert (stats.evictions, stats.hits, stats.misses) == (1, 2, 1)
+    store.close()
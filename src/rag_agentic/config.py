@@ -23,6 +23,8 @@ class Settings(BaseSettings):
         Deployment name for the `text-embedding-ada-002` model.
     temperature: float
         Sampling temperature for generation.
+    vectorstore_cache_dir: str
+        Directory holding the persisted vector store snapshot.
     """
 
     azure_openai_api_key: str = Field("", validation_alias="AZURE_OPENAI_API_KEY")
@@ -32,6 +34,7 @@ class Settings(BaseSettings):
         "text-embedding-3-large", validation_alias="AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT"
     )
     temperature: float = Field(0.0, validation_alias="AZURE_OPENAI_TEMPERATURE")
+    vectorstore_cache_dir: str = Field(".cache/rag_agentic", validation_alias="RAG_VECTORSTORE_CACHE_DIR")
 
     class Config:
         env_file = ".env"
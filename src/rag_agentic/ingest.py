@@ -1,43 +1,173 @@
-"""Utilities to preprocess documents and build a vector store."""
+"""Utilities to preprocess documents and build a vector store.
+
+벡터 스토어는 import 시점이 아니라 처음 검색할 때 만들어진다(:func:`get_vectorstore`).
+만든 결과(임베딩 행렬, 본문/메타데이터, 소스 해시)는 디스크에 스냅샷으로 저장되어,
+이후 프로세스는 URL 을 다시 받거나 임베딩하지 않고 스냅샷을 바로 읽는다.
+소스 목록·분할 설정·임베딩 배포가 바뀌면 해시가 달라져 자동으로 다시 만든다.
+
+Snapshot layout (``Settings.vectorstore_cache_dir``)::
+
+    vectors.npy  – (N, dim) float32 embedding matrix
+    docs.json    – {"source_hash", "docs": [{"id", "text", "metadata"}, ...]}
+"""
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.tools.retriever import create_retriever_tool
 from langchain_community.document_loaders import WebBaseLoader
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
 from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_openai import AzureOpenAIEmbeddings
 
 from rag_agentic.config import get_settings
 
-print('start ingest')
-
 urls = [
     "https://lilianweng.github.io/posts/2024-11-28-reward-hacking/",
     "https://lilianweng.github.io/posts/2024-07-07-hallucination/",
     "https://lilianweng.github.io/posts/2024-04-12-diffusion-video/",
 ]
 
-docs = [WebBaseLoader(url).load() for url in urls]
+CHUNK_SIZE = 100
+CHUNK_OVERLAP = 50
 
-docs_list = [item for sublist in docs for item in sublist]
+VECTORS_FILE = "vectors.npy"
+DOCS_FILE = "docs.json"
 
-text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-    chunk_size=100, chunk_overlap=50
-)
-doc_splits = text_splitter.split_documents(docs_list)
+_lock = threading.Lock()
+_vectorstore: InMemoryVectorStore | None = None
+
+
+def get_embeddings() -> AzureOpenAIEmbeddings:
+    settings = get_settings()
+    return AzureOpenAIEmbeddings(
+        azure_endpoint=settings.azure_openai_endpoint,
+        azure_deployment=settings.azure_openai_embeddings_deployment,
+        api_key=settings.azure_openai_api_key,
+    )
+
+
+def source_hash() -> str:
+    """Hash of everything that determines the snapshot contents."""
+    key = {
+        "urls": urls,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "embeddings": get_settings().azure_openai_embeddings_deployment,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_doc_splits() -> list[Document]:
+    """Download ``urls`` and split them into ~100-token chunks."""
+    docs = [WebBaseLoader(url).load() for url in urls]
+    docs_list = [item for sublist in docs for item in sublist]
+
+    text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+    return text_splitter.split_documents(docs_list)
+
+
+# ---------------------------------------------------------------------------- #
+# Snapshot
+# ---------------------------------------------------------------------------- #
+
+
+def save_snapshot(store: InMemoryVectorStore, directory: str, digest: str) -> None:
+    """Write *store* to *directory* atomically (vectors first, ``docs.json`` last)."""
+    os.makedirs(directory, exist_ok=True)
+    entries = list(store.store.values())
+    dim = len(entries[0]["vector"]) if entries else 0
+    matrix = np.asarray([e["vector"] for e in entries], dtype=np.float32).reshape(len(entries), dim)
 
-vectorstore = InMemoryVectorStore.from_documents(
-documents=doc_splits, embedding=AzureOpenAIEmbeddings(
-    azure_endpoint=get_settings().azure_openai_endpoint,
-    azure_deployment=get_settings().azure_openai_embeddings_deployment,
-    api_key=get_settings().azure_openai_api_key,
-))
-retriever = vectorstore.as_retriever()
+    vec_tmp = os.path.join(directory, VECTORS_FILE + ".tmp")
+    docs_tmp = os.path.join(directory, DOCS_FILE + ".tmp")
+    with open(vec_tmp, "wb") as fp:
+        np.save(fp, matrix)
+    with open(docs_tmp, "w", encoding="utf-8") as fp:
+        json.dump(
+            {"source_hash": digest, "docs": [{"id": e["id"], "text": e["text"], "metadata": e["metadata"]} for e in entries]},
+            fp,
+            ensure_ascii=False,
+        )
+    os.replace(vec_tmp, os.path.join(directory, VECTORS_FILE))
+    # docs.json 이 마지막으로 교체되므로, 해시가 일치하면 벡터 파일도 완전하다.
+    os.replace(docs_tmp, os.path.join(directory, DOCS_FILE))
+
+
+def load_snapshot(directory: str, digest: str, embedding: Embeddings) -> InMemoryVectorStore | None:
+    """Return the snapshot in *directory*, or *None* if missing, stale or unreadable."""
+    try:
+        with open(os.path.join(directory, DOCS_FILE), "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        if data.get("source_hash") != digest:
+            return None
+        matrix = np.load(os.path.join(directory, VECTORS_FILE))
+    except (OSError, ValueError):
+        return None
+    docs = data.get("docs") or []
+    if matrix.shape[0] != len(docs):
+        return None
+
+    store = InMemoryVectorStore(embedding=embedding)
+    for doc, vector in zip(docs, matrix):
+        store.store[doc["id"]] = {"id": doc["id"], "vector": vector, "text": doc["text"], "metadata": doc["metadata"]}
+    return store
+
+
+# ---------------------------------------------------------------------------- #
+# Lazy store
+# ---------------------------------------------------------------------------- #
+
+
+def build_vectorstore(embedding: Embeddings | None = None) -> InMemoryVectorStore:
+    """Fetch, split and embed ``urls`` into a fresh in-memory vector store."""
+    print("start ingest")
+    store = InMemoryVectorStore.from_documents(documents=load_doc_splits(), embedding=embedding or get_embeddings())
+    print("end ingest")
+    return store
+
+
+def get_vectorstore() -> InMemoryVectorStore:
+    """Return the process-wide vector store, loading the snapshot or building it on first use."""
+    global _vectorstore
+    if _vectorstore is not None:
+        return _vectorstore
+    with _lock:
+        if _vectorstore is None:
+            directory = get_settings().vectorstore_cache_dir
+            digest = source_hash()
+            embedding = get_embeddings()
+            store = load_snapshot(directory, digest, embedding)
+            if store is None:
+                store = build_vectorstore(embedding)
+                save_snapshot(store, directory, digest)
+            _vectorstore = store
+    return _vectorstore
+
+
+class _LazyRetriever(BaseRetriever):
+    """Retriever that defers building the vector store until the first query."""
+
+    k: int = 4
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        return get_vectorstore().similarity_search(query, k=self.k)
+
+
+retriever = _LazyRetriever()
 
 retriever_tool = create_retriever_tool(
     retriever,
     "retrieve_blog_posts",
     "Search and return information about Lilian Weng blog posts.",
 )
-
-print('end ingest')
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""Guard the helpers that are intentionally duplicated across the self-contained ``agent_vN`` packages."""
+import inspect
+
+import pytest
+
+from agent_v3.app.retrievers import aisearch_store as v3_store
+from agent_v6.app.retrievers import aisearch_store as v6_store
+
+
+@pytest.mark.parametrize("name", ["_read_file", "_iter_file_texts", "iter_docs_from_folder", "iter_doc_batches", "make_docs_from_folder"])
+def test_folder_streaming_copies_match(name: str) -> None:
+    assert inspect.getsource(getattr(v3_store, name)) == inspect.getsource(getattr(v6_store, name))
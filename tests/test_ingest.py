@@ -0,0 +1,55 @@
+"""Tests for the lazy, persisted vector store in `rag_agentic.ingest`."""
+from typing import Any
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from rag_agentic import ingest
+
+
+@pytest.fixture
+def embedding() -> DeterministicFakeEmbedding:
+    return DeterministicFakeEmbedding(size=8)
+
+
+def test_snapshot_round_trip(tmp_path: Any, embedding: DeterministicFakeEmbedding) -> None:
+    docs = [Document(page_content=t, metadata={"source": "blog"}) for t in ("reward hacking", "hallucination", "video")]
+    store = InMemoryVectorStore.from_documents(docs, embedding)
+
+    ingest.save_snapshot(store, str(tmp_path), "hash-1")
+    loaded = ingest.load_snapshot(str(tmp_path), "hash-1", embedding)
+
+    assert loaded is not None
+    hit = loaded.similarity_search("hallucination", k=1)[0]
+    assert hit.page_content == "hallucination"
+    assert hit.metadata == {"source": "blog"}
+
+
+def test_snapshot_is_ignored_when_source_hash_changes(tmp_path: Any, embedding: DeterministicFakeEmbedding) -> None:
+    store = InMemoryVectorStore.from_documents([Document(page_content="a")], embedding)
+    ingest.save_snapshot(store, str(tmp_path), "hash-1")
+
+    assert ingest.load_snapshot(str(tmp_path), "hash-2", embedding) is None
+    assert ingest.load_snapshot(str(tmp_path / "missing"), "hash-1", embedding) is None
+
+
+def test_get_vectorstore_builds_once_then_loads_snapshot(tmp_path: Any, monkeypatch: pytest.MonkeyPatch, embedding: Any) -> None:
+    builds = []
+
+    def _build(emb: Any = None) -> InMemoryVectorStore:
+        builds.append(1)
+        return InMemoryVectorStore.from_documents([Document(page_content="diffusion video")], embedding)
+
+    monkeypatch.setattr(ingest, "get_embeddings", lambda: embedding)
+    monkeypatch.setattr(ingest, "build_vectorstore", _build)
+    monkeypatch.setattr(ingest.get_settings(), "vectorstore_cache_dir", str(tmp_path))
+
+    monkeypatch.setattr(ingest, "_vectorstore", None)
+    ingest.get_vectorstore()
+    monkeypatch.setattr(ingest, "_vectorstore", None)  # simulate a fresh process
+    store = ingest.get_vectorstore()
+
+    assert builds == [1]
+    assert store.similarity_search("video", k=1)[0].page_content == "diffusion video"